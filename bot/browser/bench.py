@@ -0,0 +1,298 @@
+"""Benchmark harness for the browser runtime.
+
+Serves a small local site (one static page, one page that builds its DOM from
+JavaScript) and drives *N* simulated channels through
+:meth:`BrowserRuntime.enqueue` with a configurable action mix.  The report is a
+single JSON object on stdout::
+
+    python -m bot.browser.bench --channels 4 --commands 50 \\
+        --mix goto=2,click=3,fill=3,screenshot=1 --headless
+
+Numbers cover the whole command path (queue, scheduler, engine, Playwright),
+so regressions anywhere in it show up here.  ``liveness_ms`` compares clicks
+with the engine's event-tracked page liveness against forcing the
+``evaluate()`` probe the engine used to run before every action.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import statistics
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiohttp import web
+
+from bot.core import metrics
+from bot.core.settings import settings
+
+from .runtime import BrowserRuntime
+
+__all__ = ["BenchConfig", "parse_mix", "run_bench"]
+
+_STATIC_PAGE = """<!doctype html>
+<html><head><title>bench static</title>
+<style>body{font-family:sans-serif} .row{padding:4px;border-bottom:1px solid #ddd}</style>
+</head><body>
+<h1>Static page</h1>
+<input id="name" placeholder="name">
+<button id="btn" onclick="document.getElementById('out').textContent='clicked'">Go</button>
+<div id="out"></div>
+%s
+</body></html>
+"""
+
+_DYNAMIC_PAGE = """<!doctype html>
+<html><head><title>bench dynamic</title></head><body>
+<h1>Dynamic page</h1>
+<input id="name" placeholder="name">
+<button id="btn">Go</button>
+<div id="list"></div>
+<script>
+  const list = document.getElementById('list');
+  for (let i = 0; i < %d; i++) {
+    const row = document.createElement('div');
+    row.className = 'row';
+    row.textContent = 'item ' + i + ' ' + Math.random().toString(36).slice(2);
+    list.appendChild(row);
+  }
+  document.getElementById('btn').onclick = () => list.prepend('clicked');
+</script>
+</body></html>
+"""
+
+
+@dataclass
+class BenchConfig:
+    channels: int = 4
+    commands: int = 25  # per channel, after the cold-start command
+    mix: dict[str, int] = field(
+        default_factory=lambda: {"goto": 2, "click": 3, "fill": 3, "screenshot": 1}
+    )
+    rows: int = 200  # DOM rows on the dynamic page
+    seed: int = 0
+    liveness: int = 20  # clicks per mode for the liveness comparison (0 = skip)
+
+
+def parse_mix(spec: str) -> dict[str, int]:
+    """Parse ``"goto=2,click=3"`` into a weight mapping."""
+    mix: dict[str, int] = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        action, _, weight = part.partition("=")
+        if action not in ("goto", "click", "fill", "screenshot"):
+            raise ValueError(f"Unknown bench action {action!r}")
+        mix[action] = int(weight or 1)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("Action mix must have a positive total weight")
+    return mix
+
+
+def _percentiles(samples: list[float]) -> dict[str, float]:
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    ordered = sorted(samples)
+
+    def pick(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 2)
+
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": round(ordered[-1], 2)}
+
+
+# ---------------------------------------------------------------------------+
+#  Local stand-in site                                                       +
+# ---------------------------------------------------------------------------+
+async def _start_site(rows: int) -> tuple[web.AppRunner, str]:
+    static_rows = "".join(f'<div class="row">row {i}</div>' for i in range(rows))
+
+    async def static(_req: web.Request) -> web.Response:
+        return web.Response(text=_STATIC_PAGE % static_rows, content_type="text/html")
+
+    async def dynamic(_req: web.Request) -> web.Response:
+        return web.Response(text=_DYNAMIC_PAGE % rows, content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/", static)
+    app.router.add_get("/dynamic", dynamic)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))  # any free port
+    await web.SockSite(runner, sock).start()
+    return runner, f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+# ---------------------------------------------------------------------------+
+#  Driver                                                                    +
+# ---------------------------------------------------------------------------+
+def _command(action: str, base: str, rng: random.Random) -> tuple[Any, ...]:
+    if action == "goto":
+        return (rng.choice((f"{base}/", f"{base}/dynamic")),)
+    if action == "click":
+        return ("#btn",)
+    if action == "fill":
+        return ("#name", f"user{rng.randrange(1000)}")
+    return ()  # screenshot
+
+
+async def _drive_channel(
+    rt: BrowserRuntime,
+    channel_id: int,
+    cfg: BenchConfig,
+    base: str,
+    latencies: dict[str, list[float]],
+    errors: dict[str, int],
+) -> float:
+    """Run one channel's workload; return its cold-start time in ms."""
+    rng = random.Random(cfg.seed * 1_000_003 + channel_id)
+    actions, weights = zip(*cfg.mix.items(), strict=True)
+
+    t0 = time.perf_counter()
+    await (await rt.enqueue(channel_id, "goto", f"{base}/"))
+    cold_ms = (time.perf_counter() - t0) * 1000
+
+    for _ in range(cfg.commands):
+        action = rng.choices(actions, weights)[0]
+        start = time.perf_counter()
+        try:
+            await (await rt.enqueue(channel_id, action, *_command(action, base, rng)))
+        except Exception:  # noqa: BLE001 – counted, the run goes on
+            errors[action] += 1
+            continue
+        latencies[action].append((time.perf_counter() - start) * 1000)
+    return cold_ms
+
+
+async def _liveness(rt: BrowserRuntime, channel_id: int, actions: int) -> dict[str, Any]:
+    """Click latency with cached page liveness vs. a probe before every action."""
+    ctx = rt._ch.get(channel_id)
+    engine = ctx.engine if ctx is not None else None
+    if engine is None or actions <= 0:
+        return {}
+    report: dict[str, Any] = {}
+    for mode in ("cached", "probe"):
+        samples: list[float] = []
+        for _ in range(actions):
+            if mode == "probe":
+                engine._page_alive = None  # liveness unknown → evaluate() round-trip
+            start = time.perf_counter()
+            await (await rt.enqueue(channel_id, "click", "#btn"))
+            samples.append((time.perf_counter() - start) * 1000)
+        report[mode] = _percentiles(samples)
+    return report
+
+
+async def _sample_rss(peak: list[int], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        rss = metrics.get_children_rss()
+        if rss is not None:
+            peak[0] = max(peak[0], rss)
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=0.25)
+        except TimeoutError:
+            pass
+
+
+async def run_bench(cfg: BenchConfig) -> dict[str, Any]:
+    """Run the benchmark described by *cfg* and return the JSON-ready report."""
+    runner, base = await _start_site(cfg.rows)
+    rt = BrowserRuntime()
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    peak_rss = [0]
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(_sample_rss(peak_rss, stop))
+    try:
+        started = time.perf_counter()
+        cold = await asyncio.gather(
+            *(
+                _drive_channel(rt, cid, cfg, base, latencies, errors)
+                for cid in range(1, cfg.channels + 1)
+            )
+        )
+        elapsed = time.perf_counter() - started
+        liveness = await _liveness(rt, 1, cfg.liveness)
+    finally:
+        stop.set()
+        await sampler
+        await rt.shutdown()
+        await runner.cleanup()
+
+    every = [ms for samples in latencies.values() for ms in samples]
+    return {
+        "config": {
+            "channels": cfg.channels,
+            "commands_per_channel": cfg.commands,
+            "mix": cfg.mix,
+            "shared_browser": settings.browser.shared_browser,
+            "batch_max": settings.browser.batch_max,
+            "max_active_engines": settings.browser.max_active_engines,
+        },
+        "elapsed_s": round(elapsed, 3),
+        "commands_per_s": round(len(every) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {"all": _percentiles(every)}
+        | {action: _percentiles(samples) for action, samples in sorted(latencies.items())},
+        "errors": dict(errors),
+        "cold_start_ms": {
+            "mean": round(statistics.fmean(cold), 2) if cold else 0.0,
+            **_percentiles(list(cold)),
+        },
+        "chromium_peak_rss_mb": round(peak_rss[0] / (1024 * 1024), 1),
+        "liveness_ms": liveness,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Entry-point for ``python -m bot.browser.bench``."""
+    parser = argparse.ArgumentParser(description="Benchmark the browser runtime")
+    parser.add_argument("--channels", type=int, default=BenchConfig.channels)
+    parser.add_argument("--commands", type=int, default=BenchConfig.commands)
+    parser.add_argument("--mix", default="goto=2,click=3,fill=3,screenshot=1")
+    parser.add_argument("--rows", type=int, default=BenchConfig.rows)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--liveness", type=int, default=BenchConfig.liveness, help="clicks per liveness mode"
+    )
+    parser.add_argument("--headless", action="store_true", help="run Chromium headless")
+    parser.add_argument("--shared-browser", action="store_true", help="use the context pool")
+    parser.add_argument("--batch-max", type=int, default=settings.browser.batch_max)
+    parser.add_argument("--max-active", type=int, default=settings.browser.max_active_engines)
+    args = parser.parse_args(argv)
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    cfg = settings.browser
+    if args.headless:
+        cfg.headless, cfg.visible = True, False
+    cfg.shared_browser = args.shared_browser or cfg.shared_browser
+    cfg.batch_max = args.batch_max
+    cfg.max_active_engines = args.max_active
+    cfg.worker_idle_timeout_sec = 0  # the reaper must not skew the run
+
+    report = asyncio.run(
+        run_bench(
+            BenchConfig(
+                channels=args.channels,
+                commands=args.commands,
+                mix=mix,
+                rows=args.rows,
+                seed=args.seed,
+                liveness=args.liveness,
+            )
+        )
+    )
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
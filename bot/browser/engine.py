@@ -1,50 +1,110 @@
 from __future__ import annotations
 
+import base64
+import contextlib
+import time
+from collections.abc import AsyncIterator
+from contextvars import ContextVar
 from pathlib import Path
-from typing import Literal
+from typing import TYPE_CHECKING, Any, Literal
 
 from playwright.async_api import (
     Browser,
     BrowserContext,
+    FloatRect,
     Page,
     Playwright,
     async_playwright,
 )
 
+from bot.core import metrics
 from bot.core.service_base import ServiceABC
+from bot.utils.urls import canonical
+
+from .exceptions import BrowserError
+from .tracing import span
+
+if TYPE_CHECKING:
+    from .pool import BrowserPool
+    from .routing import RequestRouter
+
+# Absolute ``time.monotonic()`` deadline of the command being executed.  Set by
+# the runtime around each command; caps every Playwright ``timeout=`` below.
+command_deadline: ContextVar[float | None] = ContextVar("command_deadline", default=None)
+
+# JPEG qualities tried, in order, when a screenshot exceeds its byte budget.
+_JPEG_FALLBACK_QUALITY = (80, 60, 40, 25)
+# Pixel scales tried, at the lowest quality, once quality alone is not enough.
+# Unlike ``scale="css"`` these shrink 1x-DPR captures too.
+_DOWNSCALE_STEPS = (0.5, 0.25)
 
 
 class BrowserEngine(ServiceABC):
     """Thin async wrapper around Playwright so the rest of the bot sees *one* surface."""
 
-    def __init__(self, *, headless: bool, proxy: str | None, timeout_ms: int) -> None:
+    def __init__(
+        self,
+        *,
+        headless: bool,
+        proxy: str | None,
+        timeout_ms: int,
+        pool: BrowserPool | None = None,
+        lease_key: int | None = None,
+        router: RequestRouter | None = None,
+        nav_cache_ttl: float = 0.0,
+    ) -> None:
         self._headless = headless
         self._proxy = proxy
         self._timeout_ms = timeout_ms
+        # Shared-browser mode: contexts are leased from *pool* under *lease_key*
+        # instead of this engine owning a Chromium process of its own.
+        self._pool = pool
+        self._lease_key = lease_key
+        self._router = router  # request blocking / shared resource cache
+        self._nav_cache_ttl = nav_cache_ttl  # 0 = always navigate
+        self._nav_at: float | None = None  # monotonic time of the last real goto()
+        # Cookies/localStorage every new context starts from – see apply_state()
+        self._seed_state: dict[str, Any] | None = None
         self._playwright: Playwright | None = None
         self._browser: Browser | None = None
         self._page: Page | None = None
         self._context: BrowserContext | None = None  # Track the browser context to avoid leaks
         self._last_url: str | None = None  # ← track last navigation
+        self._page_checked = False  # True inside batch(): page already validated
+        # Cached liveness fed by Playwright close/crash/disconnected events;
+        # None means unknown and falls back to an evaluate() probe.
+        self._page_alive: bool | None = None
 
     # ------------------------------------------------------------------+
     # Lifecycle                                                        #
     # ------------------------------------------------------------------+
     async def start(self) -> None:
+        if self._pool is not None:
+            if self._context is None:
+                self._context = await self._new_context()
+                self._page = await self._adopt_page(await self._context.new_page())
+            return
+
         # Already initialised by WebRunner? → bail out early.
         if self._browser is not None:  # idempotent start()
             if self._page is None:  # but ensure we have a page
-                self._page = await self._browser.new_page()
+                self._page = await self._adopt_page(await self._browser.new_page())
             return
 
         self._playwright = await async_playwright().start()
         assert self._playwright is not None  # mypy: narrows to Playwright
-        self._browser = await self._playwright.chromium.launch(
-            headless=self._headless,
-            timeout=self._timeout_ms,
-            proxy={"server": self._proxy} if self._proxy else None,
+        self._browser = self._track_browser(
+            await self._playwright.chromium.launch(
+                headless=self._headless,
+                timeout=self._timeout_ms,
+                proxy={"server": self._proxy} if self._proxy else None,
+            )
         )
-        self._page = await self._browser.new_page()
+        if self._seed_state is not None:
+            self._context = await self._new_context()
+            self._page = await self._adopt_page(await self._context.new_page())
+        else:
+            self._page = await self._adopt_page(await self._browser.new_page())
 
     # ------------------------------------------------------------------+
     # Self-healing helpers                                            #
@@ -61,12 +121,46 @@ class BrowserEngine(ServiceABC):
             except Exception:
                 pass  # Ignore any errors when closing
 
-        self._browser = await self._playwright.chromium.launch(
-            headless=self._headless,  # Use the original setting
-            timeout=self._timeout_ms,
-            proxy={"server": self._proxy} if self._proxy else None,
+        self._browser = self._track_browser(
+            await self._playwright.chromium.launch(
+                headless=self._headless,  # Use the original setting
+                timeout=self._timeout_ms,
+                proxy={"server": self._proxy} if self._proxy else None,
+            )
         )
 
+    # ------------------------------------------------------------------+
+    # Liveness tracking – Playwright events instead of JS probes        #
+    # ------------------------------------------------------------------+
+    async def _adopt_page(self, page: Page) -> Page:
+        """Install request routing on a new *page* and start tracking it."""
+        if self._router is not None:
+            await self._router.install(page)
+        return self._track_page(page)
+
+    def _track_page(self, page: Page) -> Page:
+        """Mark *page* live and flip the cached state when it closes or crashes."""
+
+        def _gone(*_: object) -> None:
+            if self._page is page:
+                self._page_alive = False
+
+        page.on("close", _gone)
+        page.on("crash", _gone)
+        self._page_alive = True
+        return page
+
+    def _track_browser(self, browser: Browser) -> Browser:
+        """Forget *browser* once it disconnects so the next call relaunches."""
+
+        def _gone(*_: object) -> None:
+            if self._browser is browser:
+                self._browser = None
+                self._page_alive = False
+
+        browser.on("disconnected", _gone)
+        return browser
+
     # ------------------------------------------------------------+
     # internal – ensure we have an open page                      |
     # ------------------------------------------------------------+
@@ -75,59 +169,113 @@ class BrowserEngine(ServiceABC):
         Re‑open a page (and context if needed) when the user closed the tab.
         Restores the last visited URL if we know it.
         """
-        # Check if browser needs to be recreated
-        if self._browser is None:
-            await self._restart_browser()
-
-        # Check if page is None or has been closed
-        page_closed = self._page is None
-        if not page_closed and self._page is not None:
-            try:
-                # Using evaluate() to safely check page status without type errors
-                # If this fails, page is likely closed
-                await self._page.evaluate("1")
-            except Exception:
-                page_closed = True
+        if self._page_checked:
+            return
 
-        # At this point we know browser exists because we either had one or created one above
-        assert self._browser is not None  # type narrowing for mypy
+        with span("ensure_page"):
+            # Check if browser needs to be recreated
+            if self._browser is None and self._pool is None:
+                await self._restart_browser()
 
-        if page_closed:
-            # Close the previous context if it exists to prevent leaking resources
-            if self._context is not None:
+            # Check if page is None or has been closed.  The cached state comes from
+            # Playwright events; only probe with a JS round-trip when it is unknown.
+            page_closed = self._page is None or self._page_alive is False
+            if not page_closed and self._page_alive is None and self._page is not None:
                 try:
-                    await self._context.close()
+                    # Using evaluate() to safely check page status without type errors
+                    # If this fails, page is likely closed
+                    await self._page.evaluate("1")
+                    self._page_alive = True
                 except Exception:
-                    # Ignore errors when closing, just ensure we don't leak
-                    pass
+                    page_closed = True
 
-            # Create a new context
-            ctx = await self._browser.new_context()
-            assert ctx is not None  # type narrowing for mypy
-            self._context = ctx  # Save the context reference to close it later
+            if page_closed:
+                # When only the page died its context still holds the logins –
+                # carry them over instead of starting from the last snapshot.
+                old_ctx = self._context or (self._page.context if self._page else None)
+                if old_ctx is not None:
+                    try:
+                        self._seed_state = dict(await old_ctx.storage_state())
+                    except Exception:
+                        pass
 
-            # Create a new page in the context
-            self._page = await ctx.new_page()
-            if self._last_url:
-                try:
-                    await self._page.goto(
-                        self._last_url, wait_until="load", timeout=self._timeout_ms
-                    )
-                except Exception:
-                    # quietly ignore – the caller will surface an error if needed
-                    pass
+                # Close the previous context if it exists to prevent leaking resources
+                if self._context is not None:
+                    try:
+                        await self._context.close()
+                    except Exception:
+                        # Ignore errors when closing, just ensure we don't leak
+                        pass
+
+                # Create a new context
+                ctx = await self._new_context()
+                self._context = ctx  # Save the context reference to close it later
+
+                # Create a new page in the context
+                self._page = await self._adopt_page(await ctx.new_page())
+                self._nav_at = None
+                if self._last_url:
+                    try:
+                        await self._page.goto(
+                            self._last_url, wait_until="load", timeout=self._timeout()
+                        )
+                    except Exception:
+                        # quietly ignore – the caller will surface an error if needed
+                        pass
+
+    def _timeout(self) -> float:
+        """Return the Playwright ``timeout=`` (ms), capped by the command deadline."""
+        deadline = command_deadline.get()
+        if deadline is None:
+            return self._timeout_ms
+        remaining_ms = (deadline - time.monotonic()) * 1000
+        return max(1.0, min(self._timeout_ms, remaining_ms))  # 0 would mean "no timeout"
+
+    async def _new_context(self, **kwargs: Any) -> BrowserContext:
+        """Return a fresh context – leased from the pool in shared mode."""
+        if self._seed_state is not None:
+            kwargs.setdefault("storage_state", self._seed_state)
+        if self._pool is not None:
+            assert self._lease_key is not None  # set together with pool
+            return await self._pool.lease(self._lease_key, **kwargs)
+        # At this point we know browser exists because we either had one or created one above
+        assert self._browser is not None  # type narrowing for mypy
+        return await self._browser.new_context(**kwargs)
+
+    @contextlib.asynccontextmanager
+    async def batch(self) -> AsyncIterator[None]:
+        """Validate the page once for a burst of primitives.
+
+        Inside the block ``_ensure_page`` trusts the check made on entry, so
+        queued actions skip their per-call liveness round-trip.
+        """
+        await self._ensure_page()
+        self._page_checked = True
+        try:
+            yield
+        finally:
+            self._page_checked = False
 
     async def stop(self, *, graceful: bool = True) -> None:
         """Gracefully close all Playwright resources."""
         await self.close()
 
     def is_running(self) -> bool:
+        if self._pool is not None:
+            return self._context is not None
         return self._browser is not None
 
     def describe(self) -> str:
         return "running" if self.is_running() else "stopped"
 
     async def close(self) -> None:
+        if self._pool is not None:
+            # Shared browser stays up – only hand our context back.
+            assert self._lease_key is not None
+            self._page = None
+            self._context = None
+            await self._pool.release(self._lease_key)
+            return
         if self._page:
             await self._page.close()  # Ensure page is closed before context
         if self._context:
@@ -143,23 +291,38 @@ class BrowserEngine(ServiceABC):
     async def goto(self, url: str) -> None:
         await self._ensure_page()
         assert self._page  # type narrowing
-        await self._page.goto(url, wait_until="load", timeout=self._timeout_ms)
+        if self._nav_cached(url):
+            return
+        self._nav_at = None
+        await self._page.goto(url, wait_until="load", timeout=self._timeout())
         self._last_url = url
+        self._nav_at = time.monotonic()
+
+    def _nav_cached(self, url: str) -> bool:
+        """Return True when the page loaded *url* within the TTL and is still there."""
+        if not self._nav_cache_ttl or self._nav_at is None or self._page is None:
+            return False
+        if time.monotonic() - self._nav_at >= self._nav_cache_ttl:
+            return False
+        return canonical(self._page.url) == canonical(url)
 
     async def click(self, selector: str) -> None:
         await self._ensure_page()
         assert self._page is not None  # type narrowing
-        await self._page.locator(selector).click(timeout=self._timeout_ms)
+        self._nav_at = None  # page state may diverge from a fresh load
+        await self._page.locator(selector).click(timeout=self._timeout())
 
     async def fill(self, selector: str, text: str) -> None:
         await self._ensure_page()
         assert self._page is not None  # type narrowing
-        await self._page.locator(selector).fill(text, timeout=self._timeout_ms)
+        self._nav_at = None
+        await self._page.locator(selector).fill(text, timeout=self._timeout())
 
     async def upload(self, selector: str, file_path: Path) -> None:
         await self._ensure_page()
         assert self._page is not None  # type narrowing
-        await self._page.locator(selector).set_input_files(str(file_path))
+        self._nav_at = None
+        await self._page.locator(selector).set_input_files(str(file_path), timeout=self._timeout())
 
     async def wait_for(
         self,
@@ -168,14 +331,182 @@ class BrowserEngine(ServiceABC):
     ) -> None:
         await self._ensure_page()
         assert self._page is not None  # type narrowing
-        await self._page.locator(selector).wait_for(state=state, timeout=self._timeout_ms)
+        await self._page.locator(selector).wait_for(state=state, timeout=self._timeout())
+
+    async def screenshot(
+        self,
+        *,
+        type: Literal["png", "jpeg"] = "png",
+        quality: int | None = None,
+        clip: FloatRect | None = None,
+        full_page: bool = False,
+        max_bytes: int | None = None,
+    ) -> bytes:
+        """Capture the current page and return the encoded image in memory.
 
-    async def screenshot(self, path: str) -> str:
-        """Take a screenshot of the current page and save to the specified path."""
+        *quality* only applies to JPEG.  When the capture exceeds *max_bytes*
+        (e.g. Discord's upload limit) it is re-encoded as JPEG at CSS-pixel
+        scale – which downsamples HiDPI viewports – with falling quality, then
+        at a fraction of its CSS size (see :meth:`_downscaled`) until it fits.
+        """
         await self._ensure_page()
         assert self._page is not None  # for mypy
-        await self._page.screenshot(path=path)
-        return path
+        data = await self._page.screenshot(
+            type=type,
+            quality=quality if type == "jpeg" else None,
+            clip=clip,
+            full_page=full_page,
+            timeout=self._timeout(),
+        )
+        if max_bytes is None or len(data) <= max_bytes:
+            return data
+
+        for step in _JPEG_FALLBACK_QUALITY:
+            if quality is not None and step >= quality:
+                continue  # never raise quality above what was asked for
+            data = await self._page.screenshot(
+                type="jpeg",
+                quality=step,
+                clip=clip,
+                full_page=full_page,
+                scale="css",
+                timeout=self._timeout(),
+            )
+            if len(data) <= max_bytes:
+                return data
+        lowest = min(quality or _JPEG_FALLBACK_QUALITY[-1], _JPEG_FALLBACK_QUALITY[-1])
+        for scale in _DOWNSCALE_STEPS:
+            data = await self._downscaled(scale, lowest, clip=clip, full_page=full_page)
+            if len(data) <= max_bytes:
+                return data
+        raise BrowserError(
+            f"Screenshot is {len(data)} bytes even at lowest quality (limit {max_bytes})."
+        )
+
+    async def _downscaled(
+        self, scale: float, quality: int, *, clip: FloatRect | None, full_page: bool
+    ) -> bytes:
+        """JPEG of *clip* (default: viewport or full page) at *scale* × its CSS size.
+
+        Playwright's ``screenshot`` cannot go below one image pixel per CSS
+        pixel, so this asks CDP ``Page.captureScreenshot`` for a scaled clip.
+        """
+        assert self._page is not None
+        session = await self._page.context.new_cdp_session(self._page)
+        try:
+            if clip is None:
+                layout = await session.send("Page.getLayoutMetrics")
+                if full_page:
+                    size = layout["cssContentSize"]
+                    area = {"x": 0, "y": 0, "width": size["width"], "height": size["height"]}
+                else:
+                    view = layout["cssLayoutViewport"]
+                    area = {
+                        "x": view["pageX"],
+                        "y": view["pageY"],
+                        "width": view["clientWidth"],
+                        "height": view["clientHeight"],
+                    }
+            else:
+                area = dict(clip)
+            shot = await session.send(
+                "Page.captureScreenshot",
+                {
+                    "format": "jpeg",
+                    "quality": quality,
+                    "clip": {**area, "scale": scale},
+                    "captureBeyondViewport": full_page,
+                },
+            )
+        finally:
+            await session.detach()
+        return base64.b64decode(shot["data"])
+
+    # ------------------------------------------------------------------+
+    # Memory governance                                                 #
+    # ------------------------------------------------------------------+
+    async def memory_usage(self) -> tuple[int | None, int | None]:
+        """Return ``(js_heap_bytes, renderer_rss_bytes)``; ``None`` where unknown.
+
+        The JS heap comes from CDP ``Performance.getMetrics`` on the page.
+        Renderer RSS needs the renderer PIDs from ``SystemInfo.getProcessInfo``
+        and is only attributable when this engine owns its browser.
+        """
+        js_heap: int | None = None
+        if self._page is not None and self._page_alive is not False:
+            try:
+                session = await self._page.context.new_cdp_session(self._page)
+                try:
+                    await session.send("Performance.enable")
+                    perf = await session.send("Performance.getMetrics")
+                finally:
+                    await session.detach()
+                js_heap = next(
+                    (int(m["value"]) for m in perf["metrics"] if m["name"] == "JSHeapUsedSize"),
+                    None,
+                )
+            except Exception:
+                pass  # page went away mid-sample
+
+        rss: int | None = None
+        if self._browser is not None and self._pool is None:
+            try:
+                session = await self._browser.new_browser_cdp_session()
+                try:
+                    info = await session.send("SystemInfo.getProcessInfo")
+                finally:
+                    await session.detach()
+                pids = [p["id"] for p in info["processInfo"] if p["type"] == "renderer"]
+                rss = metrics.get_rss(pids)
+            except Exception:
+                pass
+        return js_heap, rss
+
+    async def recycle(self) -> None:
+        """Swap the context for a fresh one with the same cookies, storage and URL.
+
+        Dropping the old context frees everything its renderer accumulated;
+        only what ``storage_state()`` captures survives.
+        """
+        await self._ensure_page()
+        assert self._page is not None
+        state = await (self._context or self._page.context).storage_state()
+        self._seed_state = dict(state)
+        await self._swap_context()
+
+    async def snapshot_state(self) -> dict[str, Any] | None:
+        """Return the live context's cookies and localStorage.
+
+        Falls back to the last known snapshot when the page is gone, and
+        remembers the result so a recreated context starts from it.
+        """
+        if self._page is None or self._page_alive is False:
+            return self._seed_state
+        state = await (self._context or self._page.context).storage_state()
+        self._seed_state = dict(state)
+        return self._seed_state
+
+    async def apply_state(self, state: dict[str, Any] | None) -> None:
+        """Start every future context from *state*; swap it in if already running."""
+        self._seed_state = state
+        if state is not None and self._page is not None:
+            await self._swap_context()
+
+    async def _swap_context(self) -> None:
+        """Replace the context with one built from ``_seed_state`` and reload the URL."""
+        assert self._page is not None
+        old_ctx = self._context or self._page.context
+        url = self._last_url
+
+        self._page = None
+        self._page_alive = False
+        self._nav_at = None
+        if self._pool is None:
+            await old_ctx.close()  # the pool closes a replaced lease itself
+        self._context = await self._new_context()
+        self._page = await self._adopt_page(await self._context.new_page())
+        if url:
+            await self._page.goto(url, wait_until="load", timeout=self._timeout())
 
     async def health_check(self) -> bool:
         """Perform a minimal health check to ensure browser is alive.
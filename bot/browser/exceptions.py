@@ -16,3 +16,9 @@ class InvalidURLError(BrowserError, ValueError):
     """Raised when a user‑supplied URL does not pass validation."""
 
     pass
+
+
+class CommandExpiredError(BrowserError):
+    """Raised when a queued command's deadline passed before or while it ran."""
+
+    pass
@@ -0,0 +1,126 @@
+"""Browser memory governor.
+
+Long-lived pages – single-page apps in particular – leak JS heap for hours.
+:class:`MemoryGovernor` wakes every ``governor_interval_sec`` and:
+
+1. samples each idle channel's JS heap and renderer RSS and *recycles* the
+   context of any engine over ``context_budget_mb`` – cookies, storage and the
+   last URL carry over to a fresh context, the leaked heap does not;
+2. when all browser child processes together exceed
+   ``host_memory_ceiling_mb``, closes idle channels least recently used first
+   until the total is back under the ceiling.
+
+Samples and both decisions are exported to Prometheus.  Maintenance goes
+through the channel's own command queue, so it never races a user command.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING
+
+from bot.core import metrics
+from bot.core.telemetry import record_engine_memory, record_governor_action
+
+if TYPE_CHECKING:
+    from .runtime import BrowserRuntime
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["MemoryGovernor"]
+
+_MIB = 1024 * 1024
+
+
+class MemoryGovernor:
+    """Periodically recycle bloated contexts and shed channels under memory pressure."""
+
+    def __init__(
+        self,
+        runtime: BrowserRuntime,
+        *,
+        interval_s: float,
+        budget_mb: int,
+        ceiling_mb: int = 0,
+    ) -> None:
+        self._runtime = runtime
+        self._interval_s = interval_s
+        self._budget = budget_mb * _MIB
+        self._ceiling = ceiling_mb * _MIB  # 0 = no host ceiling
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Start the sampling loop (idempotent; needs a running loop)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def run_once(self) -> None:
+        """One governor pass: recycle over-budget contexts, then enforce the ceiling."""
+        await self._recycle_bloated()
+        await self._enforce_ceiling()
+
+    # ------------------------------------------------------------------+
+    # Internals                                                         |
+    # ------------------------------------------------------------------+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval_s)
+            try:
+                await self.run_once()
+            except Exception as exc:  # noqa: BLE001 – keep the governor alive
+                logger.warning("MemoryGovernor: pass failed: %s", exc)
+
+    async def _recycle_bloated(self) -> None:
+        for cid in self._runtime.idle_channels():
+            fut = self._runtime.run_maintenance(cid, "memory_usage")
+            if fut is None:
+                continue
+            try:
+                js_heap, rss = await fut
+            except Exception:  # noqa: BLE001 – channel closed or page gone
+                continue
+            record_engine_memory(js_heap, rss)
+            worst = max(js_heap or 0, rss or 0)
+            if worst <= self._budget:
+                continue
+
+            logger.info(
+                "MemoryGovernor: recycling channel %s (%.0f MiB > %.0f MiB budget)",
+                cid,
+                worst / _MIB,
+                self._budget / _MIB,
+            )
+            fut = self._runtime.run_maintenance(cid, "recycle")
+            if fut is None:
+                continue
+            try:
+                await fut
+                record_governor_action("recycle")
+            except Exception as exc:  # noqa: BLE001 – next command self-heals
+                logger.warning("MemoryGovernor: recycling channel %s failed: %s", cid, exc)
+
+    async def _enforce_ceiling(self) -> None:
+        if not self._ceiling:
+            return
+        for cid in self._runtime.idle_channels():
+            rss = metrics.get_children_rss()
+            if rss is None or rss <= self._ceiling:
+                return
+            logger.info(
+                "MemoryGovernor: browser RSS %.0f MiB over %.0f MiB ceiling – closing channel %s",
+                rss / _MIB,
+                self._ceiling / _MIB,
+                cid,
+            )
+            await self._runtime.close_channel(cid)
+            record_governor_action("evict")
@@ -0,0 +1,221 @@
+"""Shared-browser context pool.
+
+Instead of launching one Chromium process per Discord channel, the pool keeps
+one (or a few) shared :class:`~playwright.async_api.Browser` instances alive and
+leases each channel its own isolated :class:`BrowserContext`.  Creating a
+context is a cheap IPC call, so a new channel's first command no longer pays
+for a cold ``chromium.launch``.
+
+Leases are kept in LRU order.  When the pool is full the least recently used
+lease whose owner reports itself idle is evicted to make room; the owner gets
+a last look at the still-open context first (``before_evict``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from playwright.async_api import (
+    Browser,
+    BrowserContext,
+    Playwright,
+    async_playwright,
+)
+
+from bot.core.service_base import ServiceABC
+
+from .exceptions import BrowserError
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["BrowserPool", "PoolExhaustedError"]
+
+
+class PoolExhaustedError(BrowserError):
+    """Raised when every pooled context is busy and none can be evicted."""
+
+    pass
+
+
+class _Lease:
+    """Book-keeping for one context handed out by the pool."""
+
+    __slots__ = ("context", "browser_idx")
+
+    def __init__(self, context: BrowserContext, browser_idx: int) -> None:
+        self.context = context
+        self.browser_idx = browser_idx
+
+
+class BrowserPool(ServiceABC):
+    """Lease isolated browser contexts backed by a few shared Chromium processes."""
+
+    def __init__(
+        self,
+        *,
+        headless: bool,
+        proxy: str | None,
+        timeout_ms: int,
+        max_contexts: int,
+        browsers: int = 1,
+    ) -> None:
+        self._headless = headless
+        self._proxy = proxy
+        self._timeout_ms = timeout_ms
+        self._max_contexts = max(1, max_contexts)
+        self._n_browsers = max(1, browsers)
+        self._playwright: Playwright | None = None
+        self._browsers: list[Browser | None] = [None] * self._n_browsers
+        self._leases: OrderedDict[int, _Lease] = OrderedDict()
+        self._lock = asyncio.Lock()
+
+        # Hooks wired by the owner (BrowserRuntime) – an evictable lease must
+        # belong to an idle channel, the owner may snapshot it while it is
+        # still open, and is told once it is taken.
+        self.can_evict: Callable[[int], bool] = lambda _key: True
+        self.before_evict: Callable[[int], Awaitable[None]] | None = None
+        self.on_evict: Callable[[int], Awaitable[None]] | None = None
+
+    # ------------------------------------------------------------------+
+    # Lifecycle                                                        #
+    # ------------------------------------------------------------------+
+    async def start(self) -> None:
+        """Launch every shared browser up-front (idempotent)."""
+        async with self._lock:
+            for idx in range(self._n_browsers):
+                await self._browser(idx)
+
+    async def stop(self, *, graceful: bool = True) -> None:
+        """Close every lease, then the shared browsers and Playwright."""
+        async with self._lock:
+            leases = list(self._leases.values())
+            self._leases.clear()
+            browsers = [b for b in self._browsers if b is not None]
+            self._browsers = [None] * self._n_browsers
+            pw, self._playwright = self._playwright, None
+
+        for lease in leases:
+            try:
+                await lease.context.close()
+            except Exception:
+                pass  # browser may already be gone
+        for browser in browsers:
+            try:
+                await browser.close()
+            except Exception:
+                pass
+        if pw is not None:
+            await pw.stop()
+
+    def is_running(self) -> bool:
+        return any(b is not None for b in self._browsers)
+
+    def describe(self) -> str:
+        if not self.is_running():
+            return "stopped"
+        return f"running – {len(self._leases)}/{self._max_contexts} contexts leased"
+
+    # ------------------------------------------------------------------+
+    # Leasing                                                           #
+    # ------------------------------------------------------------------+
+    async def lease(self, key: int, **context_kwargs: Any) -> BrowserContext:
+        """Return a fresh isolated context for *key*.
+
+        Any context previously leased to *key* is closed first.  When the pool
+        is at capacity the least recently used idle lease is evicted.
+        """
+        evicted: list[int] = []
+        async with self._lock:
+            old = self._leases.pop(key, None)
+            if old is not None:
+                await self._close_quietly(old)
+
+            while len(self._leases) >= self._max_contexts:
+                victim = next((k for k in self._leases if self.can_evict(k)), None)
+                if victim is None:
+                    raise PoolExhaustedError(
+                        f"All {self._max_contexts} browser contexts are busy; try again later."
+                    )
+                if self.before_evict is not None:
+                    try:
+                        await self.before_evict(victim)
+                    except Exception as exc:  # noqa: BLE001 – eviction is best-effort
+                        logger.warning("BrowserPool: before_evict(%s) failed: %s", victim, exc)
+                    if victim not in self._leases or not self.can_evict(victim):
+                        continue  # released or picked up work meanwhile – look again
+                await self._close_quietly(self._leases.pop(victim))
+                evicted.append(victim)
+
+            idx = self._least_loaded()
+            browser = await self._browser(idx)
+            context = await browser.new_context(**context_kwargs)
+            self._leases[key] = _Lease(context, idx)
+
+        for victim in evicted:
+            logger.info("BrowserPool: evicted idle context for channel %s", victim)
+            if self.on_evict is not None:
+                try:
+                    await self.on_evict(victim)
+                except Exception as exc:  # noqa: BLE001 – eviction is best-effort
+                    logger.warning("BrowserPool: on_evict(%s) failed: %s", victim, exc)
+        return context
+
+    def touch(self, key: int) -> None:
+        """Mark *key* as most recently used."""
+        if key in self._leases:
+            self._leases.move_to_end(key)
+
+    async def release(self, key: int) -> None:
+        """Close the context leased to *key* (no-op when unknown)."""
+        lease = self._leases.pop(key, None)
+        if lease is not None:
+            await self._close_quietly(lease)
+
+    def stats(self) -> dict[str, int]:
+        """Return lease counts for status output."""
+        return {
+            "browsers": sum(1 for b in self._browsers if b is not None),
+            "contexts": len(self._leases),
+            "max_contexts": self._max_contexts,
+        }
+
+    # ------------------------------------------------------------------+
+    # Internals                                                         #
+    # ------------------------------------------------------------------+
+    async def _browser(self, idx: int) -> Browser:
+        """Return shared browser *idx*, (re)launching it if needed."""
+        browser = self._browsers[idx]
+        if browser is not None and browser.is_connected():
+            return browser
+
+        if browser is not None:
+            # Crashed or disconnected – forget every lease it was backing.
+            for k in [k for k, lease in self._leases.items() if lease.browser_idx == idx]:
+                del self._leases[k]
+
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        browser = await self._playwright.chromium.launch(
+            headless=self._headless,
+            timeout=self._timeout_ms,
+            proxy={"server": self._proxy} if self._proxy else None,
+        )
+        self._browsers[idx] = browser
+        return browser
+
+    def _least_loaded(self) -> int:
+        load = [0] * self._n_browsers
+        for lease in self._leases.values():
+            load[lease.browser_idx] += 1
+        return load.index(min(load))
+
+    @staticmethod
+    async def _close_quietly(lease: _Lease) -> None:
+        try:
+            await lease.context.close()
+        except Exception:
+            pass  # context already closed with its browser
@@ -0,0 +1,192 @@
+"""Request routing shared by every browser context.
+
+Installing a Playwright route disables Chromium's own HTTP cache for the page,
+and each context starts with an empty cache anyway.  :class:`RequestRouter`
+therefore keeps a small in-process cache of static subresources (scripts,
+stylesheets, images, fonts) that *all* contexts share, and aborts requests for
+configured resource types or hosts before they touch the network.
+
+Contexts belong to different channels and must not see each other's data, so
+the cache behaves like a shared HTTP cache and only keeps what is safe to
+hand to anyone: requests without cookies or ``Authorization``, responses
+without ``Set-Cookie`` that explicitly allow reuse (``max-age``, or
+``public`` with ``Expires``).  Nothing is cached on a heuristic lifetime.
+Bodies are stored decoded, so ``Vary: Accept-Encoding`` – sent with nearly
+every CDN asset – does not split the cache; any other ``Vary`` does and is
+not cached.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+from playwright.async_api import Error as PlaywrightError, Page, Route
+
+from bot.core.telemetry import record_browser_request
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["RequestRouter", "ResourceCache"]
+
+_CACHEABLE_TYPES = frozenset({"script", "stylesheet", "image", "font"})
+_MAX_AGE = re.compile(r"(?:^|[\s,])(?:s-maxage|max-age)=(\d+)")
+_CREDENTIALS = ("cookie", "authorization")  # request headers that make a response personal
+_HARMLESS_VARY = frozenset({"accept-encoding"})  # route.fetch() decodes the body
+_DECODED = ("content-encoding", "content-length")  # describe the wire body, not the stored one
+
+
+class _Entry:
+    __slots__ = ("status", "headers", "body", "expires")
+
+    def __init__(self, status: int, headers: dict[str, str], body: bytes, expires: float) -> None:
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.expires = expires
+
+
+class ResourceCache:
+    """Byte-bounded LRU of fetched subresources keyed by URL."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+
+    def get(self, url: str) -> _Entry | None:
+        entry = self._entries.get(url)
+        if entry is None:
+            return None
+        if entry.expires <= time.monotonic():
+            self._drop(url)
+            return None
+        self._entries.move_to_end(url)
+        return entry
+
+    def put(self, url: str, status: int, headers: dict[str, str], body: bytes) -> None:
+        max_age = _max_age(headers)
+        # A single entry may take at most 1/8 of the budget so one large bundle
+        # cannot flush everything else.
+        if max_age is None or len(body) > self._max_bytes // 8:
+            return
+        self._drop(url)
+        headers = {k: v for k, v in headers.items() if k not in _DECODED}
+        self._entries[url] = _Entry(status, headers, body, time.monotonic() + max_age)
+        self._bytes += len(body)
+        while self._bytes > self._max_bytes:
+            self._drop(next(iter(self._entries)))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def _drop(self, url: str) -> None:
+        entry = self._entries.pop(url, None)
+        if entry is not None:
+            self._bytes -= len(entry.body)
+
+
+def _max_age(headers: Mapping[str, str]) -> float | None:
+    """Seconds *headers* explicitly allow any client to reuse the response, else ``None``."""
+    if "set-cookie" in headers or not _vary_ok(headers.get("vary")):
+        return None
+    cc = headers.get("cache-control", "").lower()
+    if any(d in cc for d in ("no-store", "no-cache", "private")):
+        return None
+    m = _MAX_AGE.search(cc)
+    if m is not None:
+        return float(m.group(1)) or None
+    if "public" in cc:
+        return _expires_in(headers)
+    return None
+
+
+def _vary_ok(vary: str | None) -> bool:
+    if vary is None:
+        return True
+    return {v.strip().lower() for v in vary.split(",") if v.strip()} <= _HARMLESS_VARY
+
+
+def _expires_in(headers: Mapping[str, str]) -> float | None:
+    try:
+        expires = parsedate_to_datetime(headers["expires"])
+        date = parsedate_to_datetime(headers["date"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return (expires - date).total_seconds() if expires > date else None
+
+
+class RequestRouter:
+    """Block unwanted requests and serve static subresources from a shared cache."""
+
+    def __init__(
+        self,
+        *,
+        cache_bytes: int = 0,
+        block_types: Iterable[str] = (),
+        block_hosts: Iterable[str] = (),
+    ) -> None:
+        self.cache = ResourceCache(cache_bytes) if cache_bytes > 0 else None
+        self._block_types = frozenset(t.lower() for t in block_types)
+        self._block_hosts = tuple(h.lower().lstrip(".") for h in block_hosts)
+
+    @property
+    def enabled(self) -> bool:
+        return self.cache is not None or bool(self._block_types or self._block_hosts)
+
+    async def install(self, page: Page) -> None:
+        """Route every request made by *page* through :meth:`handle`."""
+        await page.route("**/*", self.handle)
+
+    async def handle(self, route: Route) -> None:
+        request = route.request
+        if request.resource_type in self._block_types or self._blocked_host(request.url):
+            record_browser_request("blocked")
+            await route.abort("blockedbyclient")
+            return
+
+        if (
+            self.cache is None
+            or request.method != "GET"
+            or request.resource_type not in _CACHEABLE_TYPES
+        ):
+            await route.continue_()
+            return
+
+        sent = await request.all_headers()  # .headers omits cookies
+        if any(h in sent for h in _CREDENTIALS):
+            await route.continue_()  # personal – never shared across contexts
+            return
+
+        hit = self.cache.get(request.url)
+        if hit is not None:
+            record_browser_request("cache_hit")
+            await route.fulfill(status=hit.status, headers=hit.headers, body=hit.body)
+            return
+
+        record_browser_request("cache_miss")
+        try:
+            response = await route.fetch()
+            body = await response.body()
+        except PlaywrightError as exc:
+            logger.debug("RequestRouter: fetch failed for %s: %s", request.url, exc)
+            await route.abort()
+            return
+        if response.status == 200:
+            self.cache.put(request.url, response.status, response.headers, body)
+        await route.fulfill(response=response, body=body)
+
+    def _blocked_host(self, url: str) -> bool:
+        if not self._block_hosts:
+            return False
+        host = (urlparse(url).hostname or "").lower()
+        return any(host == h or host.endswith("." + h) for h in self._block_hosts)
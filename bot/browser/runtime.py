@@ -1,7 +1,12 @@
 """Centralised browser runtime hub.
 
 This module provides a thread-safe singleton ``runtime`` that owns exactly one
-:class:`BrowserEngine` instance per Discord channel.  External code should use
+:class:`BrowserEngine` instance per Discord channel.  With
+``settings.browser.shared_browser`` enabled the engines lease lightweight
+contexts from a shared :class:`~bot.browser.pool.BrowserPool` instead of each
+launching Chromium; with ``settings.browser.shards`` every call is routed to
+worker processes by :class:`~bot.browser.shard.ShardedExecutor`.  External code
+should use
 ``runtime.enqueue()``, ``runtime.close_channel()``, ``runtime.close_all()``, and
 ``runtime.status()``.
 
@@ -12,18 +17,34 @@ unification*.
 from __future__ import annotations
 
 import asyncio
+import logging
+import time
 from collections import defaultdict
 from typing import Any
 
+from bot.core import metrics
 from bot.core.settings import settings
+from bot.core.telemetry import record_browser_reap, record_queue_wait, record_state_snapshot
 from bot.utils.queue_helpers import (
     get as q_get,
+    get_nowait as q_get_nowait,
     put_nowait as q_put,
     task_done as q_task_done,
 )
 
-from .engine import BrowserEngine
+from .engine import BrowserEngine, command_deadline
+from .exceptions import BrowserError, CommandExpiredError
+from .governor import MemoryGovernor
+from .pool import BrowserPool
+from .routing import RequestRouter
+from .scheduler import FairScheduler, lane_for
+from .shard import ShardedExecutor
+from .storage import StateStore
+from .tracing import Trace, current_trace
 from .types import Command
+from .warm import WarmSpares
+
+logger = logging.getLogger(__name__)
 
 
 class _ChannelCtx:
@@ -33,6 +54,9 @@ class _ChannelCtx:
         self.engine: BrowserEngine | None = None
         self.queue: asyncio.Queue[Command] | None = None
         self.task: asyncio.Task[None] | None = None
+        self.last_used: float = time.monotonic()  # LRU / idle bookkeeping
+        self.busy: bool = False  # True while the worker executes a command
+        self.start_lock = asyncio.Lock()  # serialises engine launch for this channel only
 
 
 class BrowserRuntime:
@@ -42,62 +66,195 @@ class BrowserRuntime:
         # Mapping: Discord channel ID -> _ChannelCtx
         self._ch: dict[int, _ChannelCtx] = defaultdict(_ChannelCtx)
         self._lock = asyncio.Lock()
+        # Shared Chromium pool – created lazily when settings.browser.shared_browser
+        self._pool: BrowserPool | None = None
+        # Request blocking / shared resource cache – see _request_router()
+        self._router: RequestRouter | None = None
+        # Global run-slot arbiter across channel workers – see _fair_scheduler()
+        self._scheduler: FairScheduler | None = None
+        # Out-of-process executor – created lazily when settings.browser.shards > 0
+        self._shards: ShardedExecutor | None = None
+        # Standby engines for dedicated-browser mode – see warm_up()
+        self._spares: WarmSpares | None = None
+        # Launches the shared pool's browsers ahead of the first command – see warm_up()
+        self._warm_task: asyncio.Task[None] | None = None
+        # Background task closing workers idle past worker_idle_timeout_sec
+        self._reaper_task: asyncio.Task[None] | None = None
+        # Recycles bloated contexts / sheds channels – see _ensure_governor()
+        self._governor: MemoryGovernor | None = None
+        # On-disk cookies/localStorage per channel – see _state_store()
+        self._states: StateStore | None = None
+        # Background task snapshotting idle channels every state_snapshot_sec
+        self._snapshot_task: asyncio.Task[None] | None = None
 
     # ---------------------------------------------------------------------
     # Public API
     # ---------------------------------------------------------------------
     async def enqueue(
-        self, channel_id: int, action: str, *args: Any, **kwargs: Any
+        self,
+        channel_id: int,
+        action: str,
+        *args: Any,
+        deadline: float | None = None,
+        **kwargs: Any,
     ) -> asyncio.Future[Any]:
         """Schedule *action* to run for *channel_id* and return a Future.
 
         The returned :class:`asyncio.Future` resolves with the value returned by
-        the corresponding :pyclass:`BrowserEngine` coroutine.
+        the corresponding :pyclass:`BrowserEngine` coroutine.  *deadline* is an
+        absolute ``time.monotonic()`` value: the command fails with
+        :class:`CommandExpiredError` if it has not finished by then, and every
+        Playwright timeout inside it is capped to the time left.  Cancelling
+        the Future drops a queued command or aborts a running one.
         """
+        if settings.browser.shards > 0:
+            if self._shards is None:
+                self._shards = ShardedExecutor(settings.browser.shards)
+            if deadline is not None:
+                kwargs["deadline"] = deadline  # monotonic clock is host-wide
+            return await self._shards.enqueue(channel_id, action, args, kwargs)
+
+        # Commands from a traced interaction extend its trace; others get one of
+        # their own so the stage histograms still cover them.
+        trace = current_trace.get() or Trace(action, channel_id)
+        trace.action = action
+        waited = time.perf_counter()
+
+        # The global lock only guards the channel map; it is never held across
+        # an engine launch so warm channels are not stuck behind a cold start.
         async with self._lock:
+            self._ensure_reaper()
+            self._ensure_governor()
+            self._ensure_snapshots()
             ctx = self._ch[channel_id]
+            ctx.last_used = time.monotonic()
+
+        # Per-channel lock: concurrent first commands launch exactly one engine.
+        async with ctx.start_lock:
+            trace.add("lock", time.perf_counter() - waited)
             if ctx.engine is None:
-                ctx.engine = BrowserEngine(
-                    headless=False,
-                    proxy=None,
-                    timeout_ms=60_000,
-                )
-                await ctx.engine.start()
+                launched = time.perf_counter()
+                # An empty pool is falsy, but take() is what restarts its refill.
+                engine = self._spares.take() if self._spares is not None else None
+                fresh = engine is None
+                if engine is None:
+                    engine = self._new_engine(channel_id)
+                store = self._state_store()
+                if store is not None:
+                    # Resume where the channel's last browser left off.
+                    await engine.apply_state(await store.load(channel_id))
+                if fresh:
+                    await engine.start()
+                trace.add("launch", time.perf_counter() - launched)
+                if self._ch.get(channel_id) is not ctx:
+                    # Channel was closed or evicted while we were launching.
+                    await engine.close()
+                    raise BrowserError(f"Browser for channel {channel_id} was closed.")
+                ctx.engine = engine
+            elif self._ch.get(channel_id) is not ctx:
+                # Closed or reaped while we waited on start_lock: its worker is gone.
+                raise BrowserError(f"Browser for channel {channel_id} was closed.")
+            elif self._pool is not None:
+                self._pool.touch(channel_id)
 
             if ctx.queue is None:
                 ctx.queue = asyncio.Queue(maxsize=settings.queues.command)
-                ctx.task = asyncio.create_task(self._worker(channel_id))
-
-            fut: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
-            cmd: Command = {
-                "action": action,
-                "args": args,
-                "kwargs": kwargs,
-                "future": fut,
-            }
-            q_put(ctx.queue, cmd, f"browser_cmd:{channel_id}")
-            return fut
+                ctx.task = asyncio.create_task(self._worker(channel_id, ctx))
+
+        fut: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        cmd: Command = {
+            "action": action,
+            "args": args,
+            "kwargs": kwargs,
+            "future": fut,
+            "enqueued_at": time.monotonic(),
+            "deadline": deadline,
+            "trace": trace,
+        }
+        q_put(ctx.queue, cmd, f"browser_cmd:{channel_id}")
+        return fut
 
-    async def close_channel(self, channel_id: int) -> None:
-        """Close and cleanup all resources associated with *channel_id*."""
+    def warm_up(self) -> None:
+        """Pre-launch browsers in the background so first commands start warm.
+
+        Shared-browser mode launches the pool's Chromium processes; dedicated
+        mode keeps ``settings.browser.warm_spares`` started engines on standby.
+        """
+        cfg = settings.browser
+        if cfg.warm_spares <= 0 or cfg.shards > 0:
+            return
+        pool = self._shared_pool()
+        if pool is not None:
+            if self._warm_task is None or self._warm_task.done():
+                self._warm_task = asyncio.create_task(pool.start())
+        elif self._spares is None:
+            self._spares = WarmSpares(
+                lambda: self._new_engine(None),
+                size=cfg.warm_spares,
+                max_rss_mb=cfg.warm_max_rss_mb,
+            )
+            self._spares.start()
+
+    async def shutdown(self) -> None:
+        """Close every channel, standby engine, the shared pool and shard workers."""
+        if self._warm_task is not None and not self._warm_task.done():
+            self._warm_task.cancel()
+            try:
+                await self._warm_task
+            except asyncio.CancelledError:
+                pass
+        self._warm_task = None
+        await self.close_all()
+        if self._shards is not None:
+            await self._shards.stop()
+            self._shards = None
+        if self._spares is not None:
+            await self._spares.stop()
+            self._spares = None
+
+    async def close_channel(self, channel_id: int, *, forget_state: bool = False) -> None:
+        """Close and cleanup all resources associated with *channel_id*.
+
+        With *forget_state* the channel's saved storage state (session
+        cookies) is deleted instead of refreshed – for a user closing the
+        browser for good rather than the runtime reclaiming memory.
+        """
+        if self._shards is not None:
+            await self._shards.close_channel(channel_id, forget_state=forget_state)
+            return
         async with self._lock:
             ctx = self._ch.pop(channel_id, None)
-        if ctx is None:
-            return
-        if ctx.task and not ctx.task.done():
-            ctx.task.cancel()
-        if ctx.engine is not None:
-            await ctx.engine.close()
+        if ctx is not None:
+            self._fair_scheduler().forget(channel_id)
+            await self._close_ctx(channel_id, ctx, save_state=not forget_state)
+        store = self._state_store()
+        if forget_state and store is not None:
+            await store.delete(channel_id)
 
     async def close_all(self) -> None:
         """Close every active channel context."""
+        if self._shards is not None:
+            await self._shards.close_all()
         async with self._lock:
             ch_map = dict(self._ch)
             self._ch.clear()
-        await asyncio.gather(*(self.close_channel(cid) for cid in ch_map))
+        await asyncio.gather(*(self._close_ctx(cid, ctx) for cid, ctx in ch_map.items()))
+        for task in (self._reaper_task, self._snapshot_task):
+            if task is not None and not task.done():
+                task.cancel()
+        self._reaper_task = None
+        self._snapshot_task = None
+        if self._governor is not None:
+            await self._governor.stop()
+            self._governor = None
+        if self._pool is not None:
+            await self._pool.stop()
+            self._pool = None
 
     def status(self) -> list[dict[str, Any]]:
         """Return a lightweight diagnostic snapshot for the /status command."""
+        if self._shards is not None:
+            return self._shards.status()
         out: list[dict[str, Any]] = []
         for cid, ctx in self._ch.items():
             qlen = ctx.queue.qsize() if ctx.queue else 0
@@ -110,26 +267,397 @@ class BrowserRuntime:
             )
         return out
 
+    def idle_channels(self) -> list[int]:
+        """Return channels with a started engine and nothing to do, least recently used first."""
+        ranked = sorted(self._ch.items(), key=lambda item: item[1].last_used)
+        return [cid for cid, ctx in ranked if ctx.engine is not None and self._is_idle(cid)]
+
+    def run_maintenance(self, channel_id: int, action: str) -> asyncio.Future[Any] | None:
+        """Queue an internal engine *action* behind the channel's user commands.
+
+        Unlike :meth:`enqueue` this never starts an engine and does not count
+        as channel activity.  Returns ``None`` when the channel has no worker
+        or its queue is full.
+        """
+        ctx = self._ch.get(channel_id)
+        if ctx is None or ctx.queue is None:
+            return None
+        fut: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        cmd: Command = {
+            "action": action,
+            "args": (),
+            "kwargs": {},
+            "future": fut,
+            "enqueued_at": time.monotonic(),
+            "deadline": None,
+            "trace": None,
+        }
+        try:
+            q_put(ctx.queue, cmd, f"browser_cmd:{channel_id}")
+        except asyncio.QueueFull:
+            return None
+        return fut
+
+    async def snapshot_idle(self) -> int:
+        """Persist the storage state of every idle channel; return how many were written."""
+        store = self._state_store()
+        if store is None:
+            return 0
+        written = 0
+        for cid in self.idle_channels():
+            fut = self.run_maintenance(cid, "snapshot_state")
+            if fut is None:
+                continue
+            try:
+                state = await fut
+            except Exception as exc:  # noqa: BLE001 – channel closed or page gone
+                logger.debug("BrowserRuntime: snapshot of channel %s failed: %s", cid, exc)
+                record_state_snapshot("failed")
+                continue
+            written += await self._store_state(cid, state)
+        return written
+
+    async def reap_idle(self) -> int:
+        """Close every channel idle for longer than ``worker_idle_timeout_sec``.
+
+        Returns the number of channels reclaimed.  The freed memory is the drop
+        in child-process RSS across the close and is exported to Prometheus.
+        """
+        timeout = settings.browser.worker_idle_timeout_sec
+        now = time.monotonic()
+        async with self._lock:
+            stale = [
+                cid
+                for cid, ctx in self._ch.items()
+                if self._is_idle(cid) and now - ctx.last_used > timeout
+            ]
+            victims = [(cid, self._ch.pop(cid)) for cid in stale]
+        if not victims:
+            return 0
+
+        rss_before = metrics.get_children_rss()
+        for cid, ctx in victims:
+            self._fair_scheduler().forget(cid)
+            logger.info("BrowserRuntime: closing channel %s after %.0fs idle", cid, timeout)
+            await self._close_ctx(cid, ctx)
+        rss_after = metrics.get_children_rss()
+
+        freed = 0
+        if rss_before is not None and rss_after is not None:
+            freed = rss_before - rss_after
+        record_browser_reap(len(victims), freed)
+        return len(victims)
+
+    # ---------------------------------------------------------------------
+    # Idle reaper
+    # ---------------------------------------------------------------------
+    def _ensure_reaper(self) -> None:
+        """Start the idle reaper once a worker exists (needs a running loop)."""
+        if settings.browser.worker_idle_timeout_sec <= 0:
+            return
+        if self._reaper_task is None or self._reaper_task.done():
+            self._reaper_task = asyncio.create_task(self._reaper())
+
+    def _ensure_governor(self) -> None:
+        """Start the memory governor once a worker exists (needs a running loop)."""
+        cfg = settings.browser
+        if cfg.governor_interval_sec <= 0:
+            return
+        if self._governor is None:
+            self._governor = MemoryGovernor(
+                self,
+                interval_s=cfg.governor_interval_sec,
+                budget_mb=cfg.context_budget_mb,
+                ceiling_mb=cfg.host_memory_ceiling_mb,
+            )
+        self._governor.start()
+
+    def _ensure_snapshots(self) -> None:
+        """Start periodic storage-state snapshots once a worker exists."""
+        if self._state_store() is None or settings.browser.state_snapshot_sec <= 0:
+            return
+        if self._snapshot_task is None or self._snapshot_task.done():
+            self._snapshot_task = asyncio.create_task(self._snapshotter())
+
+    async def _snapshotter(self) -> None:
+        while True:
+            await asyncio.sleep(settings.browser.state_snapshot_sec)
+            try:
+                await self.snapshot_idle()
+            except Exception as exc:  # noqa: BLE001 – keep the snapshotter alive
+                logger.warning("BrowserRuntime: state snapshot pass failed: %s", exc)
+
+    async def _reaper(self) -> None:
+        while True:
+            timeout = settings.browser.worker_idle_timeout_sec
+            if timeout <= 0:
+                return
+            # Poll a few times per timeout window so reclaim lag stays bounded.
+            await asyncio.sleep(min(max(timeout / 4, 1.0), 30.0))
+            try:
+                await self.reap_idle()
+            except Exception as exc:  # noqa: BLE001 – keep the reaper alive
+                logger.warning("BrowserRuntime: idle reaper failed: %s", exc)
+
+    async def _close_ctx(
+        self, channel_id: int, ctx: _ChannelCtx, *, save_state: bool = True
+    ) -> None:
+        """Cancel the worker, persist the storage state and close the engine."""
+        if ctx.task and not ctx.task.done():
+            ctx.task.cancel()
+        if ctx.engine is not None:
+            if save_state:
+                await self._save_state(channel_id, ctx.engine)
+            await ctx.engine.close()
+
+    # ---------------------------------------------------------------------
+    # Storage-state persistence
+    # ---------------------------------------------------------------------
+    def _state_store(self) -> StateStore | None:
+        """Return the snapshot store, or ``None`` when ``state_dir`` is unset."""
+        if self._states is None and settings.browser.state_dir:
+            self._states = StateStore(settings.browser.state_dir)
+        return self._states
+
+    async def _save_state(self, channel_id: int, engine: BrowserEngine) -> None:
+        """Snapshot *engine* from the caller's task – only when nothing else drives it."""
+        if self._state_store() is None:
+            return
+        try:
+            state = await engine.snapshot_state()
+        except Exception as exc:  # noqa: BLE001 – the last snapshot stays on disk
+            logger.debug("BrowserRuntime: snapshot of channel %s failed: %s", channel_id, exc)
+            record_state_snapshot("failed")
+            return
+        await self._store_state(channel_id, state)
+
+    async def _store_state(self, channel_id: int, state: dict[str, Any] | None) -> int:
+        store = self._state_store()
+        if store is None or state is None:
+            return 0
+        try:
+            written = await store.save(channel_id, state)
+        except OSError as exc:
+            logger.warning(
+                "BrowserRuntime: writing state of channel %s failed: %s", channel_id, exc
+            )
+            record_state_snapshot("failed")
+            return 0
+        record_state_snapshot("written" if written else "unchanged")
+        return int(written)
+
+    # ---------------------------------------------------------------------
+    # Engine construction / shared-browser pool
+    # ---------------------------------------------------------------------
+    def _new_engine(self, channel_id: int | None) -> BrowserEngine:
+        pool = self._shared_pool()
+        return BrowserEngine(
+            headless=settings.browser.headless,
+            proxy=None,
+            timeout_ms=settings.browser.launch_timeout_ms,
+            pool=pool,
+            lease_key=channel_id if pool is not None else None,
+            router=self._request_router(),
+            nav_cache_ttl=settings.browser.nav_cache_ttl_sec,
+        )
+
+    def _request_router(self) -> RequestRouter | None:
+        """Return the router shared by every engine, or ``None`` when unused."""
+        if self._router is None:
+            cfg = settings.browser
+            router = RequestRouter(
+                cache_bytes=cfg.resource_cache_mb * 1024 * 1024,
+                block_types=cfg.block_resource_types,
+                block_hosts=cfg.block_hosts,
+            )
+            if not router.enabled:
+                return None
+            self._router = router
+        return self._router
+
+    def _shared_pool(self) -> BrowserPool | None:
+        """Return the context pool when shared-browser mode is enabled."""
+        cfg = settings.browser
+        if not cfg.shared_browser:
+            return None
+        if self._pool is None:
+            self._pool = BrowserPool(
+                headless=cfg.headless,
+                proxy=None,
+                timeout_ms=cfg.launch_timeout_ms,
+                max_contexts=cfg.pool_max_contexts,
+                browsers=cfg.pool_browsers,
+            )
+            self._pool.can_evict = self._is_idle
+            self._pool.before_evict = self._snapshot_before_evict
+            self._pool.on_evict = self._evict_channel
+        return self._pool
+
+    def _fair_scheduler(self) -> FairScheduler:
+        """Return the scheduler every channel worker takes its run slot from."""
+        if self._scheduler is None:
+            cfg = settings.browser
+            self._scheduler = FairScheduler(cfg.max_active_engines, cfg.channel_weights)
+        return self._scheduler
+
+    def _is_idle(self, channel_id: int) -> bool:
+        ctx = self._ch.get(channel_id)
+        if ctx is None:
+            return True
+        return not ctx.busy and (ctx.queue is None or ctx.queue.empty())
+
+    async def _snapshot_before_evict(self, channel_id: int) -> None:
+        """Persist an idle channel's storage state before the pool closes its context."""
+        ctx = self._ch.get(channel_id)
+        if ctx is not None and ctx.engine is not None:
+            await self._save_state(channel_id, ctx.engine)
+
+    async def _evict_channel(self, channel_id: int) -> None:
+        """Drop *channel_id* after the pool reclaimed its context.
+
+        Runs while another channel's engine start is in flight; it never waits
+        on ``_lock``.  The context is already closed by the pool.
+        """
+        ctx = self._ch.pop(channel_id, None)
+        self._fair_scheduler().forget(channel_id)
+        if ctx is not None and ctx.task and not ctx.task.done():
+            ctx.task.cancel()
+
     # ---------------------------------------------------------------------
     # Internal worker
     # ---------------------------------------------------------------------
-    async def _worker(self, channel_id: int) -> None:  # noqa: D401
-        ctx = self._ch[channel_id]
+    async def _worker(self, channel_id: int, ctx: _ChannelCtx) -> None:  # noqa: D401
         # `ctx.engine` and `ctx.queue` are set in `enqueue()` before we reach here
         assert ctx.engine is not None and ctx.queue is not None
 
+        qname = f"browser_cmd:{channel_id}"
         while True:
-            cmd: Command = await q_get(ctx.queue, f"browser_cmd:{channel_id}")
+            batch: list[Command] = [await q_get(ctx.queue, qname)]
+            # Drain whatever else is already queued (up to batch_max) so a burst
+            # of actions shares one page-liveness check.
+            while len(batch) < settings.browser.batch_max and not ctx.queue.empty():
+                batch.append(q_get_nowait(ctx.queue, qname))
+            dequeued = len(batch)
+            # Cancelled or expired commands never take a run slot.
+            batch = [cmd for cmd in batch if self._still_wanted(cmd)]
+            # Busy while waiting for a slot too, so the reaper/pool never evict
+            # a channel holding dequeued commands.
+            ctx.busy = True
+            lane = lane_for(cmd["action"] for cmd in batch)
             try:
-                method = getattr(ctx.engine, cmd["action"])
-                result = await method(*cmd["args"], **cmd["kwargs"])
-                if not cmd["future"].done():
-                    cmd["future"].set_result(result)
-            except Exception as exc:  # noqa: BLE001 – bubble up for logging
+                if not batch:
+                    continue
+                async with self._fair_scheduler().slot(channel_id, lane, cost=len(batch)):
+                    started = time.monotonic()
+                    for cmd in batch:
+                        record_queue_wait(lane, started - cmd["enqueued_at"])
+                        if cmd["trace"] is not None:
+                            cmd["trace"].add("queue", started - cmd["enqueued_at"])
+                    if len(batch) == 1:
+                        await self._execute(ctx.engine, batch[0])
+                    else:
+                        await self._execute_batch(ctx.engine, batch)
+                if lane == "write" and ctx.queue.empty():
+                    # Going idle after changing the page – persist logins now.
+                    await self._save_state(channel_id, ctx.engine)
+            except asyncio.CancelledError:
+                # Channel closed while these commands waited – don't leave
+                # their callers hanging.
+                for cmd in batch:
+                    if not cmd["future"].done():
+                        cmd["future"].cancel()
+                raise
+            finally:
+                ctx.busy = False
+                ctx.last_used = time.monotonic()
+                for _ in range(dequeued):
+                    q_task_done(ctx.queue, qname)
+
+    @staticmethod
+    def _still_wanted(cmd: Command) -> bool:
+        """Return *False* for a command whose caller gave up or whose deadline passed."""
+        fut = cmd["future"]
+        if fut.done():  # cancelled while queued
+            return False
+        deadline = cmd["deadline"]
+        if deadline is not None and deadline <= time.monotonic():
+            fut.set_exception(CommandExpiredError(f"'{cmd['action']}' expired before it ran."))
+            return False
+        return True
+
+    @classmethod
+    async def _execute(cls, engine: BrowserEngine, cmd: Command) -> bool:
+        """Run one command and resolve its future; return *False* on error."""
+        fut = cmd["future"]
+        if not cls._still_wanted(cmd):
+            return bool(fut.cancelled())  # a skipped cancel is not a failure
+        deadline = cmd["deadline"]
+
+        # The deadline is copied into the task's context, where it caps every
+        # Playwright timeout the action uses; the trace collects its stages.
+        token = command_deadline.set(deadline)
+        trace_token = current_trace.set(cmd["trace"])
+        try:
+            task = asyncio.ensure_future(
+                getattr(engine, cmd["action"])(*cmd["args"], **cmd["kwargs"])
+            )
+        finally:
+            current_trace.reset(trace_token)
+            command_deadline.reset(token)
+        started = time.perf_counter()
+
+        # Cancelling the caller's Future aborts the in-flight Playwright call.
+        def _abort(f: asyncio.Future[Any]) -> None:
+            if f.cancelled():
+                task.cancel()
+
+        fut.add_done_callback(_abort)
+        try:
+            delay = None if deadline is None else deadline - time.monotonic()
+            async with asyncio.timeout(delay) as scope:
+                result = await task
+            if not fut.done():
+                fut.set_result(result)
+            return True
+        except asyncio.CancelledError:
+            current = asyncio.current_task()
+            if fut.cancelled() and (current is None or not current.cancelling()):
+                return True  # caller gave up – nobody will see a result
+            raise
+        except Exception as exc:  # noqa: BLE001 – bubble up for logging
+            if isinstance(exc, TimeoutError) and scope.expired():
+                exc = CommandExpiredError(f"'{cmd['action']}' ran past its deadline.")
+            if not fut.done():
+                fut.set_exception(exc)
+            return False
+        finally:
+            fut.remove_done_callback(_abort)
+            if cmd["trace"] is not None:
+                cmd["trace"].add("playwright", time.perf_counter() - started)
+
+    async def _execute_batch(self, engine: BrowserEngine, batch: list[Command]) -> None:
+        """Run *batch* back-to-back after a single page-liveness check.
+
+        A failed ``goto`` leaves the page somewhere the remaining actions were
+        not written for, so the rest of the batch is failed instead of run.
+        """
+        token = current_trace.set(batch[0]["trace"])  # the shared page check
+        try:
+            async with engine.batch():
+                for i, cmd in enumerate(batch):
+                    if await self._execute(engine, cmd) or cmd["action"] != "goto":
+                        continue
+                    reason = BrowserError(f"Skipped: earlier navigation to {cmd['args']!r} failed.")
+                    for rest in batch[i + 1 :]:
+                        if not rest["future"].done():
+                            rest["future"].set_exception(reason)
+                    return
+        except Exception as exc:  # noqa: BLE001 – page could not be restored
+            for cmd in batch:
                 if not cmd["future"].done():
                     cmd["future"].set_exception(exc)
-            finally:
-                q_task_done(ctx.queue, f"browser_cmd:{channel_id}")
+        finally:
+            current_trace.reset(token)
 
 
 # ---------------------------------------------------------------------+
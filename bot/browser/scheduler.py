@@ -0,0 +1,120 @@
+"""Global fair scheduling across per-channel browser queues.
+
+Every channel keeps its own ``asyncio.Queue`` and worker, but a worker must
+hold a run slot from :class:`FairScheduler` while it drives its engine.  Slots
+are capped globally (``settings.browser.max_active_engines``) and, when they
+are contended, granted by:
+
+1. **Lane** – read-only actions (``screenshot``, ``health_check`` and the
+   runtime's own probes) go before mutating ones, so a status check is never
+   stuck behind a slow navigation.
+2. **Weighted fair queuing** – within a lane, the request with the smallest
+   virtual finish time wins.  A channel's finish time advances by
+   ``cost / weight`` per grant, so a channel spamming commands falls behind
+   channels that rarely ask, instead of taking every free slot.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+from collections.abc import AsyncIterator, Iterable, Mapping
+
+__all__ = ["FairScheduler", "READ_ONLY_ACTIONS", "lane_for"]
+
+READ_ONLY_ACTIONS = frozenset({"screenshot", "health_check", "snapshot_state", "memory_usage"})
+LANES = ("read", "write")  # highest priority first
+
+
+def lane_for(actions: Iterable[str]) -> str:
+    """Return ``"read"`` when every action in *actions* is read-only."""
+    return "read" if all(a in READ_ONLY_ACTIONS for a in actions) else "write"
+
+
+class FairScheduler:
+    """Grant at most *max_active* run slots, fairly across channels."""
+
+    def __init__(self, max_active: int = 0, weights: Mapping[int, float] | None = None) -> None:
+        self._max_active = max_active  # 0 = unlimited
+        self._weights = dict(weights or {})
+        self._active = 0
+        self._vtime = 0.0
+        self._finish: dict[int, float] = {}  # channel -> last virtual finish time
+        # lane -> heap of (finish, seq, start, future)
+        self._waiting: dict[str, list[tuple[float, int, float, asyncio.Future[None]]]] = {
+            lane: [] for lane in LANES
+        }
+        self._seq = itertools.count()
+
+    @contextlib.asynccontextmanager
+    async def slot(self, channel_id: int, lane: str, cost: float = 1.0) -> AsyncIterator[None]:
+        """Hold one run slot for the duration of the block."""
+        await self._acquire(channel_id, lane, cost)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def forget(self, channel_id: int) -> None:
+        """Drop the fairness history of a closed channel."""
+        self._finish.pop(channel_id, None)
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    def waiting(self) -> dict[str, int]:
+        """Return how many workers wait for a slot, per lane."""
+        return {lane: sum(not e[3].done() for e in heap) for lane, heap in self._waiting.items()}
+
+    # ------------------------------------------------------------------+
+    # Internals                                                         |
+    # ------------------------------------------------------------------+
+    async def _acquire(self, channel_id: int, lane: str, cost: float) -> None:
+        start = max(self._vtime, self._finish.get(channel_id, 0.0))
+        finish = start + cost / self._weights.get(channel_id, 1.0)
+        self._finish[channel_id] = finish
+
+        if not self._max_active or (self._active < self._max_active and not self._queued()):
+            self._active += 1
+            self._vtime = max(self._vtime, start)
+            return
+
+        fut: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting[lane], (finish, next(self._seq), start, fut))
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self._release()  # granted just before the cancel landed
+            else:
+                fut.cancel()  # lazily skipped by _dispatch
+            raise
+
+    def _release(self) -> None:
+        self._active -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while not self._max_active or self._active < self._max_active:
+            entry = self._pop()
+            if entry is None:
+                return
+            _finish, _seq, start, fut = entry
+            self._active += 1
+            self._vtime = max(self._vtime, start)
+            fut.set_result(None)
+
+    def _pop(self) -> tuple[float, int, float, asyncio.Future[None]] | None:
+        for lane in LANES:
+            heap = self._waiting[lane]
+            while heap:
+                entry = heapq.heappop(heap)
+                if not entry[3].done():
+                    return entry
+        return None
+
+    def _queued(self) -> bool:
+        return any(not e[3].done() for heap in self._waiting.values() for e in heap)
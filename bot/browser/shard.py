@@ -0,0 +1,380 @@
+"""Out-of-process browser sharding.
+
+With ``settings.browser.shards > 0`` all Playwright driving moves off the bot's
+event loop into *N* worker processes.  Each worker runs its own
+:class:`~bot.browser.runtime.BrowserRuntime` and owns the slice of channels a
+consistent-hash ring assigns to it, so adding a worker only remaps ~1/N of the
+channels.
+
+Parent and worker talk over the worker's stdin/stdout using length-prefixed
+pickle frames (both ends are this codebase, so pickle is trusted here):
+
+* request  ``(req_id, op, channel_id, payload)``
+* reply    ``(req_id, kind, ok, value)`` where *kind* is ``"ack"`` once an
+  ``enqueue`` was accepted, or ``"done"`` with the final result.
+
+A worker that dies fails its in-flight futures with :class:`BrowserError` and
+is respawned automatically.
+
+Run a worker by hand with ``python -m bot.browser.shard``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import bisect
+import hashlib
+import importlib
+import itertools
+import logging
+import os
+import pickle
+import struct
+import sys
+from typing import Any
+
+from .exceptions import BrowserError
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["HashRing", "ShardedExecutor"]
+
+_LEN = struct.Struct(">I")
+_RESPAWN_DELAY_S = 1.0
+DEFAULT_RUNTIME = "bot.browser.runtime:BrowserRuntime"
+
+
+# ---------------------------------------------------------------------------+
+#  Wire format                                                               +
+# ---------------------------------------------------------------------------+
+async def _read_frame(reader: asyncio.StreamReader) -> Any:
+    header = await reader.readexactly(_LEN.size)
+    (size,) = _LEN.unpack(header)
+    return pickle.loads(await reader.readexactly(size))
+
+
+def _write_frame(writer: asyncio.StreamWriter, obj: Any) -> None:
+    try:
+        data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:  # unpicklable result/exception – degrade to text
+        req_id, kind, ok, value = obj
+        data = pickle.dumps((req_id, kind, ok, BrowserError(repr(value))))
+    writer.write(_LEN.pack(len(data)) + data)
+
+
+def _portable(exc: BaseException) -> BaseException:
+    """Return *exc* if it survives a pickle round-trip, else a BrowserError copy."""
+    try:
+        pickle.loads(pickle.dumps(exc))
+        return exc
+    except Exception:
+        return BrowserError(f"{type(exc).__name__}: {exc}")
+
+
+# ---------------------------------------------------------------------------+
+#  Consistent hashing                                                        +
+# ---------------------------------------------------------------------------+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], "big")
+
+
+class HashRing:
+    """Map channel IDs onto *nodes* workers with virtual-node smoothing."""
+
+    def __init__(self, nodes: int, *, replicas: int = 64) -> None:
+        points = sorted((_hash(f"{n}:{r}"), n) for n in range(nodes) for r in range(replicas))
+        self._keys = [h for h, _ in points]
+        self._nodes = [n for _, n in points]
+
+    def node_for(self, channel_id: int) -> int:
+        idx = bisect.bisect(self._keys, _hash(str(channel_id))) % len(self._keys)
+        return self._nodes[idx]
+
+
+# ---------------------------------------------------------------------------+
+#  Parent side                                                               +
+# ---------------------------------------------------------------------------+
+class _Worker:
+    """One browser worker process plus its in-flight request table."""
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self.proc: asyncio.subprocess.Process | None = None
+        self.reader_task: asyncio.Task[None] | None = None
+        # req_id -> (ack future, done future); ack is None for single-phase ops
+        self.pending: dict[int, tuple[asyncio.Future[Any] | None, asyncio.Future[Any]]] = {}
+        self.channels: dict[int, int] = {}  # channel_id -> in-flight commands
+
+    def alive(self) -> bool:
+        # The reply reader ends on stdout EOF, which can precede the exit status
+        # being reaped – a worker without a reader can never answer again.
+        return (
+            self.proc is not None
+            and self.proc.returncode is None
+            and self.reader_task is not None
+            and not self.reader_task.done()
+        )
+
+
+class ShardedExecutor:
+    """Route browser commands to worker processes by consistent hash."""
+
+    def __init__(self, workers: int, *, runtime_factory: str = DEFAULT_RUNTIME) -> None:
+        self._workers = [_Worker(i) for i in range(max(1, workers))]
+        self._ring = HashRing(len(self._workers))
+        self._runtime_factory = runtime_factory
+        self._ids = itertools.count(1)
+        self._closing = False
+        self._spawn_lock = asyncio.Lock()
+
+    # ------------------------------------------------------------------+
+    # Public API – mirrors BrowserRuntime                               |
+    # ------------------------------------------------------------------+
+    async def enqueue(
+        self, channel_id: int, action: str, args: tuple[Any, ...], kwargs: dict[str, Any]
+    ) -> asyncio.Future[Any]:
+        """Send *action* to the owning worker; return a Future for its result."""
+        worker = self._workers[self._ring.node_for(channel_id)]
+        loop = asyncio.get_running_loop()
+        ack: asyncio.Future[Any] = loop.create_future()
+        done: asyncio.Future[Any] = loop.create_future()
+        req_id = await self._send(worker, "enqueue", channel_id, (action, args, kwargs), ack, done)
+        await ack  # re-raises e.g. asyncio.QueueFull from the worker's runtime
+
+        worker.channels[channel_id] = worker.channels.get(channel_id, 0) + 1
+
+        def _settled(f: asyncio.Future[Any]) -> None:
+            worker.channels[channel_id] = max(0, worker.channels.get(channel_id, 1) - 1)
+            if f.cancelled() and req_id in worker.pending and worker.alive():
+                # Propagate the cancel so the worker drops or aborts the command.
+                loop.create_task(self._cancel_remote(worker, channel_id, req_id))
+
+        done.add_done_callback(_settled)
+        return done
+
+    async def close_channel(self, channel_id: int, *, forget_state: bool = False) -> None:
+        worker = self._workers[self._ring.node_for(channel_id)]
+        worker.channels.pop(channel_id, None)
+        await self._call(worker, "close_channel", channel_id, forget_state)
+
+    async def close_all(self) -> None:
+        for worker in self._workers:
+            worker.channels.clear()
+        await asyncio.gather(
+            *(self._call(w, "close_all", 0) for w in self._workers if w.proc is not None)
+        )
+
+    def status(self) -> list[dict[str, Any]]:
+        """Channel rows from parent-side book-keeping (no worker round-trip)."""
+        return [
+            {"channel": cid, "queue": n, "idle": n == 0, "shard": w.index}
+            for w in self._workers
+            for cid, n in w.channels.items()
+        ]
+
+    async def stop(self) -> None:
+        """Terminate every worker process."""
+        self._closing = True
+        for worker in self._workers:
+            proc = worker.proc
+            if proc is None or proc.returncode is not None:
+                continue
+            assert proc.stdin is not None
+            proc.stdin.close()
+            try:
+                await asyncio.wait_for(proc.wait(), timeout=5)
+            except TimeoutError:
+                proc.kill()
+                await proc.wait()
+            if worker.reader_task is not None:
+                await asyncio.gather(worker.reader_task, return_exceptions=True)
+
+    # ------------------------------------------------------------------+
+    # Internals                                                         |
+    # ------------------------------------------------------------------+
+    async def _call(self, worker: _Worker, op: str, channel_id: int, payload: Any = None) -> Any:
+        done: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        await self._send(worker, op, channel_id, payload, None, done)
+        return await done
+
+    async def _cancel_remote(self, worker: _Worker, channel_id: int, req_id: int) -> None:
+        try:
+            await self._call(worker, "cancel", channel_id, req_id)
+        except BrowserError:
+            pass  # worker gone – the command died with it
+
+    async def _send(
+        self,
+        worker: _Worker,
+        op: str,
+        channel_id: int,
+        payload: Any,
+        ack: asyncio.Future[Any] | None,
+        done: asyncio.Future[Any],
+    ) -> int:
+        await self._ensure_spawned(worker)
+        assert worker.proc is not None and worker.proc.stdin is not None
+        req_id = next(self._ids)
+        worker.pending[req_id] = (ack, done)
+        try:
+            _write_frame(worker.proc.stdin, (req_id, op, channel_id, payload))
+            await worker.proc.stdin.drain()
+        except (ConnectionError, BrokenPipeError) as exc:
+            worker.pending.pop(req_id, None)
+            raise BrowserError(f"Browser worker {worker.index} is unavailable.") from exc
+        return req_id
+
+    async def _ensure_spawned(self, worker: _Worker) -> None:
+        if worker.alive():
+            return
+        async with self._spawn_lock:
+            if worker.alive():
+                return
+            worker.proc = await asyncio.create_subprocess_exec(
+                sys.executable,
+                "-m",
+                "bot.browser.shard",
+                "--runtime",
+                self._runtime_factory,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+            )
+            worker.reader_task = asyncio.create_task(self._read_replies(worker))
+            logger.info("Browser shard %d started (pid %s)", worker.index, worker.proc.pid)
+
+    async def _read_replies(self, worker: _Worker) -> None:
+        proc = worker.proc
+        assert proc is not None and proc.stdout is not None
+        try:
+            while True:
+                req_id, kind, ok, value = await _read_frame(proc.stdout)
+                ack, done = worker.pending.get(req_id, (None, None))
+                target = ack if kind == "ack" else done
+                if kind == "done" or not ok:
+                    worker.pending.pop(req_id, None)
+                if not ok and kind == "ack" and done is not None and not done.done():
+                    done.cancel()  # never accepted – nobody holds this future
+                if target is not None and not target.done():
+                    if ok:
+                        target.set_result(value)
+                    else:
+                        target.set_exception(value)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass  # worker exited
+        finally:
+            self._fail_pending(worker)
+            worker.channels.clear()
+            if not self._closing:
+                logger.warning("Browser shard %d died – respawning", worker.index)
+                asyncio.create_task(self._respawn(worker))
+
+    @staticmethod
+    def _fail_pending(worker: _Worker) -> None:
+        err = BrowserError(f"Browser worker {worker.index} exited; command aborted.")
+        for ack, done in worker.pending.values():
+            if ack is not None and not ack.done():
+                ack.set_exception(err)
+                done.cancel()  # never handed out – nobody would retrieve it
+            elif not done.done():
+                done.set_exception(err)
+        worker.pending.clear()
+
+    async def _respawn(self, worker: _Worker) -> None:
+        if worker.proc is not None:
+            await worker.proc.wait()
+        await asyncio.sleep(_RESPAWN_DELAY_S)
+        if not self._closing:
+            await self._ensure_spawned(worker)
+
+
+# ---------------------------------------------------------------------------+
+#  Worker side                                                               +
+# ---------------------------------------------------------------------------+
+def _load_runtime(spec: str) -> Any:
+    module, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(module), attr)()
+
+
+async def _serve(runtime_spec: str, proto_out: int) -> None:
+    from bot.core.settings import settings
+
+    settings.browser.shards = 0  # a worker must never shard again
+    runtime = _load_runtime(runtime_spec)
+
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    w_transport, w_protocol = await loop.connect_write_pipe(
+        asyncio.streams.FlowControlMixin, os.fdopen(proto_out, "wb")
+    )
+    writer = asyncio.StreamWriter(w_transport, w_protocol, reader, loop)
+
+    inflight: dict[int, asyncio.Future[Any]] = {}  # req_id -> runtime future
+
+    async def _finish(req_id: int, fut: asyncio.Future[Any]) -> None:
+        inflight[req_id] = fut
+        try:
+            _write_frame(writer, (req_id, "done", True, await fut))
+        except asyncio.CancelledError:
+            _write_frame(writer, (req_id, "done", False, BrowserError("Command cancelled.")))
+        except Exception as exc:  # noqa: BLE001 – forwarded to the parent
+            _write_frame(writer, (req_id, "done", False, _portable(exc)))
+        finally:
+            inflight.pop(req_id, None)
+
+    async def _handle(req_id: int, op: str, channel_id: int, payload: Any) -> None:
+        try:
+            if op == "enqueue":
+                action, args, kwargs = payload
+                fut = await runtime.enqueue(channel_id, action, *args, **kwargs)
+                _write_frame(writer, (req_id, "ack", True, None))
+                await _finish(req_id, fut)
+                return
+            if op == "cancel":
+                target = inflight.get(payload)
+                result = target.cancel() if target is not None else False
+            elif op == "close_channel":
+                result = await runtime.close_channel(channel_id, forget_state=bool(payload))
+            elif op == "close_all":
+                result = await runtime.close_all()
+            else:
+                raise BrowserError(f"Unknown shard op {op!r}")
+            _write_frame(writer, (req_id, "done", True, result))
+        except Exception as exc:  # noqa: BLE001 – forwarded to the parent
+            kind = "ack" if op == "enqueue" else "done"
+            _write_frame(writer, (req_id, kind, False, _portable(exc)))
+
+    tasks: set[asyncio.Task[None]] = set()
+    try:
+        while True:
+            try:
+                req_id, op, channel_id, payload = await _read_frame(reader)
+            except asyncio.IncompleteReadError:
+                return  # parent closed stdin – shut down
+            task = asyncio.create_task(_handle(req_id, op, channel_id, payload))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    finally:
+        for task in tasks:
+            task.cancel()
+        shutdown = getattr(runtime, "shutdown", None) or runtime.close_all
+        await shutdown()
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Entry-point for ``python -m bot.browser.shard``."""
+    parser = argparse.ArgumentParser(description="Browser shard worker process")
+    parser.add_argument("--runtime", default=DEFAULT_RUNTIME, help="module:Class to serve")
+    args = parser.parse_args(argv)
+
+    # Keep the protocol channel private: anything printed to stdout (e.g. by a
+    # library) would corrupt the frame stream, so fd 1 is pointed at stderr.
+    proto_out = os.dup(1)
+    os.dup2(2, 1)
+    logging.basicConfig(level=logging.INFO, format="[shard %(process)d] %(message)s")
+    asyncio.run(_serve(args.runtime, proto_out))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Per-channel browser storage-state snapshots.
+
+A Playwright *storage state* (cookies plus per-origin localStorage) is what
+keeps a user logged in.  :class:`StateStore` persists one snapshot per channel
+as gzip-compressed compact JSON so a recreated, recycled or reaped browser can
+start its next context with ``new_context(storage_state=...)`` instead of
+making the user sign in again.
+
+Writes are atomic (temp file + ``os.replace``), serialised per channel,
+owner-readable only – the files hold session cookies – and skipped when the
+snapshot did not change.
+
+Retention: a snapshot outlives reaps, pool/governor evictions and restarts –
+that is its purpose – and is deleted when a user closes the channel's
+browser (``BrowserRuntime.close_channel(..., forget_state=True)``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+from collections.abc import Awaitable
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["StateStore"]
+
+
+class StateStore:
+    """Load and save storage-state snapshots under *directory*."""
+
+    def __init__(self, directory: str | os.PathLike[str]) -> None:
+        self._dir = Path(directory)
+        self._digests: dict[int, bytes] = {}  # channel -> digest of the last write
+        # One writer per channel: the periodic snapshotter and the idle-save
+        # path may both be saving it.
+        self._locks: dict[int, asyncio.Lock] = {}
+
+    def path(self, channel_id: int) -> Path:
+        return self._dir / f"{channel_id}.json.gz"
+
+    async def load(self, channel_id: int) -> dict[str, Any] | None:
+        """Return the saved snapshot for *channel_id*, or ``None``."""
+        return await asyncio.to_thread(self._load, channel_id)
+
+    async def save(self, channel_id: int, state: dict[str, Any]) -> bool:
+        """Persist *state*; return ``False`` when it matched the previous write."""
+        raw = json.dumps(state, separators=(",", ":"), sort_keys=True).encode()
+        digest = hashlib.blake2b(raw, digest_size=16).digest()
+        async with self._lock(channel_id):
+            if self._digests.get(channel_id) == digest:
+                return False
+            await _finish(asyncio.to_thread(self._write, channel_id, raw))
+            self._digests[channel_id] = digest
+        return True
+
+    async def delete(self, channel_id: int) -> None:
+        """Remove the snapshot of *channel_id*, e.g. once its user closed it."""
+        async with self._lock(channel_id):
+            self._digests.pop(channel_id, None)
+            await asyncio.to_thread(self.path(channel_id).unlink, missing_ok=True)
+        self._locks.pop(channel_id, None)
+
+    def _lock(self, channel_id: int) -> asyncio.Lock:
+        return self._locks.setdefault(channel_id, asyncio.Lock())
+
+    # ------------------------------------------------------------------+
+    # Blocking helpers – run in a worker thread                         |
+    # ------------------------------------------------------------------+
+    def _load(self, channel_id: int) -> dict[str, Any] | None:
+        path = self.path(channel_id)
+        try:
+            with gzip.open(path, "rb") as fh:
+                state = json.loads(fh.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:  # truncated / corrupt snapshot
+            logger.warning("StateStore: ignoring unreadable snapshot %s: %s", path, exc)
+            return None
+        return state if isinstance(state, dict) else None
+
+    def _write(self, channel_id: int, raw: bytes) -> None:
+        self._dir.mkdir(parents=True, exist_ok=True)
+        path = self.path(channel_id)
+        tmp = path.with_name(path.name + ".tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(gzip.compress(raw, compresslevel=6, mtime=0))
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+
+
+async def _finish(aw: Awaitable[None]) -> None:
+    """Await *aw*; if the caller is cancelled, still let it finish first.
+
+    Cancelling ``to_thread`` does not stop the thread, so without this a
+    cancelled save could land after a later ``delete`` and resurrect the file.
+    """
+    task = asyncio.ensure_future(aw)
+    try:
+        await asyncio.shield(task)
+    except asyncio.CancelledError:
+        await task
+        raise
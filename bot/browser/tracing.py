@@ -0,0 +1,108 @@
+"""Per-stage timing of browser commands.
+
+A :class:`Trace` follows one command from the Discord interaction to the
+reply.  Each stage adds its duration to the trace, which also observes the
+``browser_stage_seconds{stage,action}`` histogram:
+
+=============== ==========================================================
+``interaction`` Discord created the interaction → the bot started on it
+``wrapper``     ``browser_command`` handler + defer
+``lock``        waiting for the runtime / per-channel start locks
+``launch``      starting the channel's engine (cold start only)
+``queue``       sitting in the channel queue and waiting for a run slot
+``ensure_page`` page liveness check / recreation (part of ``playwright``)
+``playwright``  the engine call itself
+``reply``       sending the result back to Discord
+=============== ==========================================================
+
+The active trace travels in the :data:`current_trace` context variable, so
+tasks spawned by a command inherit it; the runtime carries it across the
+channel queue inside the :class:`~bot.browser.types.Command`.  Traces begun
+with :func:`start_trace` are kept in a small ring buffer for ``/web status``.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextvars import ContextVar
+
+from bot.core.telemetry import record_browser_stage
+
+__all__ = ["STAGES", "Trace", "current_trace", "recent_traces", "span", "start_trace"]
+
+STAGES = (
+    "interaction",
+    "wrapper",
+    "lock",
+    "launch",
+    "queue",
+    "ensure_page",
+    "playwright",
+    "reply",
+)
+_RECENT_MAX = 50
+
+current_trace: ContextVar[Trace | None] = ContextVar("current_trace", default=None)
+
+
+class Trace:
+    """Stage durations of one browser command."""
+
+    __slots__ = ("action", "channel_id", "started", "updated", "stages")
+
+    def __init__(self, action: str, channel_id: int | None) -> None:
+        self.action = action
+        self.channel_id = channel_id
+        self.started = time.monotonic()
+        self.updated = self.started
+        self.stages: dict[str, float] = {}  # stage -> seconds
+
+    def add(self, stage: str, seconds: float) -> None:
+        """Record *seconds* spent in *stage* (repeated stages accumulate)."""
+        seconds = max(0.0, seconds)
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+        self.updated = time.monotonic()
+        record_browser_stage(stage, self.action, seconds)
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds from the start of the trace to its latest stage."""
+        return self.updated - self.started
+
+    def summary(self) -> str:
+        """Return a one-line ``stage=ms`` breakdown in pipeline order."""
+        parts = [f"{s} {self.stages[s] * 1000:.0f}ms" for s in STAGES if s in self.stages]
+        return f"{self.action} · {self.elapsed * 1000:.0f}ms – " + ", ".join(parts)
+
+
+_recent: deque[Trace] = deque(maxlen=_RECENT_MAX)
+
+
+def start_trace(action: str, channel_id: int | None) -> Trace:
+    """Begin a trace, make it current and keep it for :func:`recent_traces`."""
+    trace = Trace(action, channel_id)
+    _recent.append(trace)
+    current_trace.set(trace)
+    return trace
+
+
+def recent_traces(limit: int = 10) -> list[Trace]:
+    """Return up to *limit* most recent traces, newest first."""
+    return list(reversed(_recent))[:limit]
+
+
+@contextlib.contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Time the block as *stage* of the current trace (no-op without one)."""
+    trace = current_trace.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(stage, time.perf_counter() - start)
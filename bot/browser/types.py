@@ -1,4 +1,9 @@
-from typing import Any, TypedDict
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, TypedDict
+
+if TYPE_CHECKING:
+    from .tracing import Trace
 
 
 class Command(TypedDict):
@@ -8,6 +13,9 @@ class Command(TypedDict):
     args: tuple[Any, ...]
     kwargs: dict[str, Any]
     future: Any
+    enqueued_at: float  # time.monotonic() when queued – feeds the queue-wait histogram
+    deadline: float | None  # time.monotonic() after which the result is useless
+    trace: Trace | None  # stage timings – see bot.browser.tracing
 
 
 __all__ = ["Command"]
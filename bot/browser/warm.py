@@ -0,0 +1,107 @@
+"""Pre-warmed standby browser engines.
+
+``/web start`` on a new channel normally pays for ``async_playwright().start()``
+plus ``chromium.launch`` inside the interaction.  :class:`WarmSpares` keeps *K*
+already-started :class:`BrowserEngine` instances on standby and hands one to the
+next channel that needs it, then refills in the background.
+
+Refilling stops while the bot's child processes (Chromium + driver) exceed the
+configured RSS ceiling so spares never push the host over its memory budget.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from collections.abc import Callable
+
+from bot.core import metrics
+
+from .engine import BrowserEngine
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["WarmSpares"]
+
+_MIB = 1024 * 1024
+
+
+class WarmSpares:
+    """Keep up to *size* started engines ready for immediate hand-out."""
+
+    def __init__(
+        self,
+        factory: Callable[[], BrowserEngine],
+        *,
+        size: int,
+        max_rss_mb: int = 0,
+    ) -> None:
+        self._factory = factory
+        self._size = max(0, size)
+        self._max_rss_mb = max_rss_mb  # 0 = no ceiling
+        self._ready: deque[BrowserEngine] = deque()
+        self._refill_task: asyncio.Task[None] | None = None
+
+    # ------------------------------------------------------------------+
+    # Public API                                                        |
+    # ------------------------------------------------------------------+
+    def start(self) -> None:
+        """Begin filling the standby pool in the background."""
+        self._kick()
+
+    def take(self) -> BrowserEngine | None:
+        """Return a started engine, or ``None`` when no spare is ready."""
+        engine = self._ready.popleft() if self._ready else None
+        self._kick()
+        return engine
+
+    async def stop(self) -> None:
+        """Cancel refilling and close every standby engine."""
+        if self._refill_task is not None and not self._refill_task.done():
+            self._refill_task.cancel()
+            try:
+                await self._refill_task
+            except asyncio.CancelledError:
+                pass
+        self._refill_task = None
+        while self._ready:
+            engine = self._ready.popleft()
+            try:
+                await engine.close()
+            except Exception:
+                pass  # spare may have crashed while idle
+
+    def __len__(self) -> int:
+        return len(self._ready)
+
+    # ------------------------------------------------------------------+
+    # Internals                                                         |
+    # ------------------------------------------------------------------+
+    def _kick(self) -> None:
+        if self._size and (self._refill_task is None or self._refill_task.done()):
+            self._refill_task = asyncio.create_task(self._refill())
+
+    def _over_ceiling(self) -> bool:
+        if not self._max_rss_mb:
+            return False
+        rss = metrics.get_children_rss()
+        return rss is not None and rss >= self._max_rss_mb * _MIB
+
+    async def _refill(self) -> None:
+        # Launch one engine at a time – spares are background work and must not
+        # compete with a channel's own cold start for CPU.
+        while len(self._ready) < self._size:
+            if self._over_ceiling():
+                logger.info("WarmSpares: memory ceiling reached – not refilling")
+                return
+            engine = self._factory()
+            try:
+                await engine.start()
+            except asyncio.CancelledError:
+                await engine.close()
+                raise
+            except Exception as exc:  # noqa: BLE001 – retry on next take()
+                logger.warning("WarmSpares: failed to launch standby engine: %s", exc)
+                return
+            self._ready.append(engine)
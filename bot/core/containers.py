@@ -9,7 +9,7 @@ from bot.history.backends import HistoryBackend
 from bot.history.in_memory import MemoryBackend
 from bot.history.redis_backend import RedisBackend
 from bot.infra.tankpit import engine_factory as tankpit_engine_factory
-from bot.netproxy.service import ProxyService
+from bot.netproxy.service import ProxyService, load_engines
 
 # generic WebSocket addon and TankPit engine factory
 from bot.netproxy.ws_addon import GenericWSAddon
@@ -80,6 +80,8 @@ class Container(containers.DeclarativeContainer):
             providers.Object(GenericWSAddon),
         ),
         engine_factory=tankpit_engine_factory,
+        # Further subscribers fan the frame stream out (settings.proxy_engines)
+        engines=providers.Callable(lambda cfg: load_engines(cfg.proxy_engines), config),
     )
 
     # Browser runtime – one process-wide instance wired through DI
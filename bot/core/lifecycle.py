@@ -111,6 +111,8 @@ class BotLifecycle:
         self._bot.lifecycle = self
 
         await start_proxy_service_if_enabled(self._container, self._bot)
+        # 🔥 Pre-launch standby browsers so the first /web command starts warm
+        self._container.browser_runtime().warm_up()
         logger.info("Services and bot instance initialized.")
 
     async def _load_extensions(self) -> None:
@@ -198,6 +200,11 @@ class BotLifecycle:
         logger.info("Attempting to gracefully shutdown services...")
         if self._bot:
             await stop_proxy_service(self._bot)
+        if self._container:
+            try:
+                await self._container.browser_runtime().shutdown()
+            except Exception as e:
+                logger.exception("Error during browser runtime shutdown:", exc_info=e)
         logger.info("Finished service shutdown attempts.")
 
         if self._bot and not self._bot.is_closed():
@@ -111,4 +111,42 @@ def get_cpu_mem() -> tuple[str, str]:  # noqa: D401 – utility
     return f"{cpu_total:.1f} %", f"{mem_bot:.0f} MB"
 
 
+def get_children_rss() -> int | None:
+    """
+    Return the summed RSS (bytes) of every descendant process.
+
+    Chromium and the Playwright driver run as children of the bot, so this is
+    the cheapest whole-fleet browser memory reading.  ``None`` without psutil.
+    """
+    if psutil is None or _PROC is None:  # pragma: no cover
+        return None
+
+    total = 0
+    for child in _PROC.children(recursive=True):
+        try:
+            total += child.memory_info().rss
+        except psutil.Error:  # process exited between listing and sampling
+            continue
+    return total
+
+
+def get_rss(pids: list[int]) -> int | None:
+    """
+    Return the summed RSS (bytes) of *pids*, skipping processes that are gone.
+
+    Used to attribute Chromium renderer memory to the engine owning it.
+    ``None`` without psutil.
+    """
+    if psutil is None:  # pragma: no cover
+        return None
+
+    total = 0
+    for pid in pids:
+        try:
+            total += psutil.Process(pid).memory_info().rss
+        except psutil.Error:
+            continue
+    return total
+
+
 # End of core/metrics.py
@@ -2,9 +2,9 @@
 Settings for the DiscordBot. All browser flags live in Settings.browser (see BrowserConfig).
 """
 
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Literal
 
-from pydantic import BaseModel, Field, ValidationInfo, field_validator
+from pydantic import BaseModel, Field, ValidationInfo, field_validator, model_validator
 from pydantic_settings import BaseSettings
 
 
@@ -16,9 +16,37 @@ class BrowserConfig(BaseModel):
     proxy_enabled: bool = False
     worker_idle_timeout_sec: float = 120.0  # Seconds before an idle worker shuts down
     slow_mo: int = 0  # Milliseconds to slow down Playwright operations, 0 to disable
+    batch_max: int = 1  # Queued commands a worker runs per page check (1 = no batching)
+    shared_browser: bool = False  # Lease per-channel contexts from a shared Chromium pool
+    pool_browsers: int = 1  # Shared Chromium processes backing the context pool
+    pool_max_contexts: int = 16  # Max leased contexts before LRU eviction of idle channels
+    shards: int = 0  # Run browsers in N worker processes off the bot loop (0 = in-process)
+    warm_spares: int = 0  # Pre-started standby engines handed to new channels (0 = off)
+    warm_max_rss_mb: int = 0  # Stop refilling spares above this child RSS (0 = no ceiling)
+    nav_cache_ttl_sec: float = 0.0  # Skip goto() to the URL already loaded this recently (0 = off)
+    resource_cache_mb: int = 0  # Static subresource cache shared by all contexts (0 = off)
+    block_resource_types: list[str] = []  # e.g. ["font", "media"] – aborted before fetching
+    block_hosts: list[str] = []  # Hosts (and their subdomains) whose requests are aborted
+    max_active_engines: int = 0  # Engines executing at once across channels (0 = unlimited)
+    channel_weights: dict[int, float] = {}  # Fair-share weight per channel ID (default 1.0)
+    governor_interval_sec: float = 0.0  # Memory governor sampling period (0 = off)
+    context_budget_mb: int = 512  # JS heap / renderer RSS that triggers a context recycle
+    host_memory_ceiling_mb: int = 0  # Evict LRU idle channels above this child RSS (0 = off)
+    state_dir: str = ""  # Persist per-channel cookies/localStorage here ("" = off)
+    state_snapshot_sec: float = 300.0  # Periodic storage-state snapshot interval (0 = off)
 
     model_config = {"extra": "ignore"}
 
+    @field_validator("block_resource_types", "block_hosts", mode="before")
+    @classmethod
+    def _split_csv(cls, v: Any) -> list[str]:  # noqa: D401
+        """Accept comma-separated strings, e.g. ``BROWSER__BLOCK_HOSTS=ads.example``."""
+        if isinstance(v, str):
+            return [item.strip().lower() for item in v.split(",") if item.strip()]
+        if isinstance(v, list):
+            return [str(item).lower() for item in v]
+        return []
+
     @field_validator("visible")
     @classmethod
     def _exclusive_with_headless(cls, v: bool, info: ValidationInfo) -> bool:  # noqa: D401
@@ -40,10 +68,38 @@ class QueueConfig(BaseModel):
     outbound: int = 200  # outbound frames (AI → server)
     command: int = 100  # browser command queue per channel
     alerts: int = 200  # lifecycle → owner DM
+    gauge_interval_sec: float = 1.0  # Sampling period of the proxy queue gauges
 
     model_config = {"extra": "ignore"}
 
 
+class ProxyRule(BaseModel):
+    """One ingress rule for proxied WebSocket frames, see bot/netproxy/rules.py."""
+
+    name: str | None = None  # Metric label; defaults to the rule's position
+    direction: Literal["TX", "RX"] | None = None  # None = both
+    host: str | None = None  # Exact host or glob, e.g. "*.tankpit.com"
+    opcode: int | None = Field(None, ge=0, le=255)  # First payload byte
+    prefix: str = ""  # Hex payload prefix, e.g. "0301"
+    action: Literal["drop", "sample", "route"] = "drop"
+    every: int = Field(1, ge=1)  # sample: keep one frame in *every*
+    subscriber: str | None = None  # route / sample: deliver only to this engine
+
+    model_config = {"extra": "forbid"}
+
+    @field_validator("prefix")
+    @classmethod
+    def _hex(cls, v: str) -> str:
+        bytes.fromhex(v)  # ValueError → validation error
+        return v.lower()
+
+    @model_validator(mode="after")
+    def _route_needs_subscriber(self) -> "ProxyRule":
+        if self.action == "route" and not self.subscriber:
+            raise ValueError("a route rule needs a subscriber")
+        return self
+
+
 class Settings(BaseSettings):
     if TYPE_CHECKING:  # pragma: no cover
 
@@ -83,6 +139,21 @@ class Settings(BaseSettings):
     proxy_enabled: bool = False
     proxy_port: int | None = None
     proxy_cert_dir: str | None = ".mitm_certs"  # Default cert directory for mitmproxy
+    proxy_capture_path: str | None = None  # Record every WebSocket frame to this capture file
+    proxy_mode: Literal["inline", "thread", "process"] = "inline"  # Where mitmproxy's loop runs
+    proxy_overflow_policy: Literal["drop_newest", "drop_oldest", "coalesce", "flow_control"] = (
+        "drop_newest"  # What a full inbound queue does with the next frame
+    )
+    proxy_flow_control_ms: int = 250  # Longest flow_control pauses a client before dropping
+    proxy_overflow_alert_sec: float = 60.0  # At most one overflow summary alert per window
+    proxy_engines: dict[str, str] = {}  # Extra fan-out engines, e.g. {"logger": "pkg.mod:factory"}
+    proxy_subscriber_queue: int = 500  # Per-engine queue when several engines share the proxy
+    proxy_subscriber_policy: Literal["drop_newest", "drop_oldest", "coalesce"] = "drop_oldest"
+    proxy_subscriber_policies: dict[
+        str, Literal["drop_newest", "drop_oldest", "coalesce"]
+    ] = {}  # Per-engine override, e.g. {"logger": "coalesce"}
+    proxy_rules: list[ProxyRule] = []  # Ingress filter, first match wins; /proxy rules reload
+    tankpit_decoder: bool = False  # Decode frames in TankPitEngine – placeholder opcode table
 
     # --- Browser session config ---
     chrome_profile_dir: str | None = None
@@ -15,11 +15,11 @@ has already been started, the call becomes a no-op.
 
 from __future__ import annotations
 
-import asyncio
 import logging
 import os
+from contextlib import suppress
 from errno import EADDRINUSE
-from typing import Any
+from typing import Protocol
 
 from prometheus_client import (
     CollectorRegistry,
@@ -34,7 +34,20 @@ from prometheus_client import (
 __all__ = [
     "record_llm_call",
     "record_frame",
+    "record_decode_error",
+    "record_frame_drop",
+    "record_subscriber_lag",
+    "record_rule_hits",
+    "record_flow",
+    "forget_flow",
     "update_queue_gauge",
+    "record_browser_reap",
+    "record_browser_request",
+    "record_queue_wait",
+    "record_governor_action",
+    "record_engine_memory",
+    "record_state_snapshot",
+    "record_browser_stage",
     "start_exporter",
 ]
 
@@ -71,12 +84,68 @@ FRAME_TOTAL = Counter(
     ["direction"],
     registry=REGISTRY,
 )
+FRAME_DECODE_ERRORS = Counter(
+    "tankpit_decode_errors_total",
+    "Binary frames the protocol decoder rejected, by direction",
+    ["direction"],
+    registry=REGISTRY,
+)
 FRAME_LATENCY = Histogram(
     "tankpit_frame_latency_seconds",
     "Time spent handling one frame",
     registry=REGISTRY,
 )
 
+# ——— Proxy metrics —————————————————————————————————————————————————
+PROXY_FRAMES_DROPPED = Counter(
+    "proxy_frames_dropped_total",
+    "WebSocket frames lost to a full proxy queue, by overflow policy and direction",
+    ["policy", "direction"],
+    registry=REGISTRY,
+)
+PROXY_RULE_FRAMES = Counter(
+    "proxy_rule_frames_total",
+    "WebSocket frames matched by a proxy ingress rule, by rule and action",
+    ["rule", "action"],
+    registry=REGISTRY,
+)
+PROXY_FLOW_FRAMES = Gauge(
+    "proxy_flow_frames",
+    "Frames seen on an open WebSocket connection, by direction",
+    ["conn", "host", "direction"],
+    registry=REGISTRY,
+)
+PROXY_FLOW_BYTES = Gauge(
+    "proxy_flow_bytes",
+    "Payload bytes seen on an open WebSocket connection, by direction",
+    ["conn", "host", "direction"],
+    registry=REGISTRY,
+)
+PROXY_FLOW_JITTER = Gauge(
+    "proxy_flow_jitter_seconds",
+    "Smoothed inter-arrival jitter of an open WebSocket connection",
+    ["conn", "host"],
+    registry=REGISTRY,
+)
+PROXY_SUBSCRIBER_LAG_FRAMES = Gauge(
+    "proxy_subscriber_lag_frames",
+    "Frames queued for a fan-out subscriber",
+    ["subscriber"],
+    registry=REGISTRY,
+)
+PROXY_SUBSCRIBER_LAG_SECONDS = Gauge(
+    "proxy_subscriber_lag_seconds",
+    "Age of the oldest frame queued for a fan-out subscriber",
+    ["subscriber"],
+    registry=REGISTRY,
+)
+PROXY_SUBSCRIBER_DROPPED = Counter(
+    "proxy_subscriber_dropped_total",
+    "Frames a fan-out subscriber lost to its overflow policy",
+    ["subscriber"],
+    registry=REGISTRY,
+)
+
 # ——— Dynamic gauges ————————————————————————————————————————————————
 QUEUE_SIZE = Gauge(
     "bot_queue_fill",
@@ -85,6 +154,57 @@ QUEUE_SIZE = Gauge(
     registry=REGISTRY,
 )
 
+# ——— Browser runtime metrics ————————————————————————————————————————
+BROWSER_REAPED_TOTAL = Counter(
+    "browser_reaped_total",
+    "Idle browser workers closed by the idle reaper",
+    registry=REGISTRY,
+)
+BROWSER_REAPED_BYTES = Counter(
+    "browser_reaped_bytes_total",
+    "Approximate child-process RSS freed by reaping idle browser workers",
+    registry=REGISTRY,
+)
+BROWSER_REQUEST_TOTAL = Counter(
+    "browser_request_total",
+    "Routed browser subresource requests by outcome",
+    ["outcome"],  # blocked | cache_hit | cache_miss
+    registry=REGISTRY,
+)
+BROWSER_QUEUE_WAIT = Histogram(
+    "browser_queue_wait_seconds",
+    "Time a browser command waited between enqueue and execution",
+    ["lane"],  # read | write
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+    registry=REGISTRY,
+)
+BROWSER_GOVERNOR_ACTIONS = Counter(
+    "browser_governor_actions_total",
+    "Memory governor decisions",
+    ["action"],  # recycle | evict
+    registry=REGISTRY,
+)
+BROWSER_ENGINE_MEMORY = Histogram(
+    "browser_engine_memory_bytes",
+    "Per-engine memory sampled by the governor",
+    ["kind"],  # js_heap | renderer_rss
+    buckets=tuple(mb * 1024 * 1024 for mb in (16, 32, 64, 128, 256, 512, 1024, 2048)),
+    registry=REGISTRY,
+)
+BROWSER_STAGE_SECONDS = Histogram(
+    "browser_stage_seconds",
+    "Time a browser command spends in each pipeline stage",
+    ["stage", "action"],  # stage: see bot.browser.tracing.STAGES
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+    registry=REGISTRY,
+)
+BROWSER_STATE_SNAPSHOTS = Counter(
+    "browser_state_snapshots_total",
+    "Storage-state snapshots taken for persistence",
+    ["outcome"],  # written | unchanged | failed
+    registry=REGISTRY,
+)
+
 # Resolve shard label once at import time so all metrics share it
 _SHARD_ID: str = os.getenv("SHARD_ID", "0")
 
@@ -132,11 +252,97 @@ def record_frame(direction: str, duration_s: float) -> None:
     FRAME_LATENCY.observe(duration_s)
 
 
-def update_queue_gauge(name: str, q: asyncio.Queue[Any]) -> None:
-    """Export instantaneous fill level of an ``asyncio.Queue``."""
+class SupportsQsize(Protocol):
+    def qsize(self) -> int: ...
+
+
+def record_decode_error(direction: str) -> None:
+    """Count one TankPit frame the protocol decoder rejected."""
+    FRAME_DECODE_ERRORS.labels(direction).inc()
+
+
+def record_frame_drop(policy: str, direction: str, count: int = 1) -> None:
+    """Count frames an overflow policy discarded."""
+    PROXY_FRAMES_DROPPED.labels(policy, direction).inc(count)
+
+
+def record_rule_hits(rule: str, action: str, count: int) -> None:
+    """Count frames a proxy ingress rule matched since the last sample."""
+    PROXY_RULE_FRAMES.labels(rule, action).inc(count)
+
+
+def record_subscriber_lag(name: str, frames: int, seconds: float, dropped: int) -> None:
+    """Publish one fan-out subscriber's backlog and new drops since the last sample."""
+    PROXY_SUBSCRIBER_LAG_FRAMES.labels(name).set(frames)
+    PROXY_SUBSCRIBER_LAG_SECONDS.labels(name).set(seconds)
+    if dropped:
+        PROXY_SUBSCRIBER_DROPPED.labels(name).inc(dropped)
+
+
+def record_flow(
+    conn: str, host: str, frames: list[int], payload_bytes: list[int], jitter_s: float
+) -> None:
+    """Publish one WebSocket connection's counters (``frames``/``bytes`` are ``[TX, RX]``)."""
+    for direction, label in enumerate(("TX", "RX")):
+        PROXY_FLOW_FRAMES.labels(conn, host, label).set(frames[direction])
+        PROXY_FLOW_BYTES.labels(conn, host, label).set(payload_bytes[direction])
+    PROXY_FLOW_JITTER.labels(conn, host).set(jitter_s)
+
+
+def forget_flow(conn: str, host: str) -> None:
+    """Stop exporting a closed WebSocket connection."""
+    for label in ("TX", "RX"):
+        for gauge in (PROXY_FLOW_FRAMES, PROXY_FLOW_BYTES):
+            with suppress(KeyError):
+                gauge.remove(conn, host, label)
+    with suppress(KeyError):
+        PROXY_FLOW_JITTER.remove(conn, host)
+
+
+def update_queue_gauge(name: str, q: SupportsQsize) -> None:
+    """Export instantaneous fill level of an ``asyncio.Queue`` (or anything with ``qsize()``)."""
     QUEUE_SIZE.labels(name).set(q.qsize())
 
 
+def record_browser_reap(count: int, freed_bytes: int) -> None:
+    """Record *count* idle browser workers reclaimed and the memory they freed."""
+    BROWSER_REAPED_TOTAL.inc(count)
+    BROWSER_REAPED_BYTES.inc(max(0, freed_bytes))
+
+
+def record_browser_request(outcome: str) -> None:
+    """Count one routed subresource request (blocked / cache_hit / cache_miss)."""
+    BROWSER_REQUEST_TOTAL.labels(outcome=outcome).inc()
+
+
+def record_queue_wait(lane: str, wait_s: float) -> None:
+    """Observe how long one browser command queued before it ran."""
+    BROWSER_QUEUE_WAIT.labels(lane=lane).observe(max(0.0, wait_s))
+
+
+def record_governor_action(action: str) -> None:
+    """Count one memory-governor decision (``recycle`` / ``evict``)."""
+    BROWSER_GOVERNOR_ACTIONS.labels(action=action).inc()
+
+
+def record_engine_memory(js_heap: int | None, rss: int | None) -> None:
+    """Observe one per-engine memory sample; ``None`` values are skipped."""
+    if js_heap is not None:
+        BROWSER_ENGINE_MEMORY.labels(kind="js_heap").observe(js_heap)
+    if rss is not None:
+        BROWSER_ENGINE_MEMORY.labels(kind="renderer_rss").observe(rss)
+
+
+def record_browser_stage(stage: str, action: str, seconds: float) -> None:
+    """Observe the time one browser command spent in *stage*."""
+    BROWSER_STAGE_SECONDS.labels(stage=stage, action=action).observe(seconds)
+
+
+def record_state_snapshot(outcome: str) -> None:
+    """Count one storage-state snapshot (``written`` / ``unchanged`` / ``failed``)."""
+    BROWSER_STATE_SNAPSHOTS.labels(outcome=outcome).inc()
+
+
 # ---------------------------------------------------------------------------+
 #  Exporter bootstrap                                                        +
 # ---------------------------------------------------------------------------+
@@ -9,13 +9,14 @@ from __future__ import annotations
 import asyncio
 
 from bot.infra.tankpit.engine import TankPitEngine
+from bot.netproxy.frames import FrameRing, Outbound
 
 __all__: list[str] = ["engine_factory"]
 
 
 def engine_factory(
-    q_in: asyncio.Queue[tuple[str, bytes]],
-    q_out: asyncio.Queue[bytes],
+    q_in: FrameRing,
+    q_out: asyncio.Queue[Outbound],
 ) -> TankPitEngine:
     """Return a :class:`TankPitEngine` bound to the given queues."""
     return TankPitEngine(q_in, q_out)
@@ -0,0 +1,108 @@
+"""Throughput benchmark for the TankPit decoder and game-state model.
+
+Decodes a synthetic session (see :mod:`bot.infra.tankpit.corpus`) repeatedly
+and prints one JSON object with frames/s, messages/s and MB/s::
+
+    python -m bot.infra.tankpit.bench --entities 64 --ticks 500 --repeat 20
+
+``--engine`` pushes the frames through a :class:`~bot.netproxy.frames.FrameRing`
+and a running :class:`TankPitEngine` instead, so the number includes the
+batch drain and per-frame metrics.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import Any
+
+from bot.netproxy.frames import FrameRing
+
+from .corpus import synthetic_session
+from .engine import TankPitEngine
+from .protocol import iter_messages
+from .state import GameState
+
+__all__ = ["bench_decoder", "bench_engine"]
+
+
+def bench_decoder(frames: list[tuple[int, bytes]], repeat: int) -> dict[str, Any]:
+    """Decode and apply *frames* *repeat* times on a fresh state each pass."""
+    views = [(d, memoryview(p)) for d, p in frames]
+    messages = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        state = GameState()
+        apply = state.apply
+        for direction, view in views:
+            for spec, values, tail in iter_messages(direction, view):
+                apply(spec, values, tail)
+                messages += 1
+    return _report(len(frames) * repeat, messages, _bytes(frames) * repeat, started)
+
+
+async def bench_engine(frames: list[tuple[int, bytes]], repeat: int) -> dict[str, Any]:
+    """Feed *frames* through a ring into a running engine as fast as it drains."""
+    ring = FrameRing(4096)
+    engine = TankPitEngine(ring, asyncio.Queue(), decode=True)
+    await engine.start()
+    started = time.perf_counter()
+    try:
+        for _ in range(repeat):
+            for direction, payload in frames:
+                await ring.put(direction, payload)
+        await engine.wait_handled(len(frames) * repeat)
+    finally:
+        report = _report(len(frames) * repeat, None, _bytes(frames) * repeat, started)
+        await engine.stop()
+    return report
+
+
+def _bytes(frames: list[tuple[int, bytes]]) -> int:
+    return sum(len(p) for _d, p in frames)
+
+
+def _report(frames: int, messages: int | None, size: int, started: float) -> dict[str, Any]:
+    elapsed = time.perf_counter() - started
+    out: dict[str, Any] = {
+        "frames": frames,
+        "elapsed_s": round(elapsed, 4),
+        "frames_per_s": round(frames / elapsed) if elapsed else 0,
+        "mb_per_s": round(size / elapsed / 1e6, 2) if elapsed else 0.0,
+    }
+    if messages is not None:
+        out["messages"] = messages
+        out["messages_per_s"] = round(messages / elapsed) if elapsed else 0
+    return out
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Entry-point for ``python -m bot.infra.tankpit.bench``."""
+    parser = argparse.ArgumentParser(description="Benchmark the TankPit decoder")
+    parser.add_argument("--entities", type=int, default=32)
+    parser.add_argument("--ticks", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--engine", action="store_true", help="go through FrameRing + engine")
+    args = parser.parse_args(argv)
+
+    frames = synthetic_session(entities=args.entities, ticks=args.ticks, seed=args.seed)
+    if args.engine:
+        report = asyncio.run(bench_engine(frames, args.repeat))
+    else:
+        report = bench_decoder(frames, args.repeat)
+    report["config"] = {
+        "entities": args.entities,
+        "ticks": args.ticks,
+        "repeat": args.repeat,
+        "mode": "engine" if args.engine else "decoder",
+    }
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
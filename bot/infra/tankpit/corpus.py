@@ -0,0 +1,84 @@
+"""Synthetic TankPit sessions for tests and benchmarks.
+
+:func:`synthetic_session` builds a deterministic frame sequence shaped like a
+real match – a welcome, the map streamed in rows, a spawn burst, then server
+ticks carrying one move per entity interleaved with client input, pings and
+entity churn.  It is encoded with the placeholder opcode table of
+:mod:`bot.infra.tankpit.protocol`, so it exercises the decoder's speed and
+correctness against itself only – it says nothing about real TankPit traffic.
+"""
+
+from __future__ import annotations
+
+import random
+
+from bot.netproxy.frames import RX, TX
+
+from .protocol import encode
+
+__all__ = ["synthetic_session"]
+
+
+def synthetic_session(
+    *,
+    entities: int = 32,
+    ticks: int = 200,
+    map_size: int = 64,
+    seed: int = 0,
+) -> list[tuple[int, bytes]]:
+    """Return ``(direction, payload)`` frames of one simulated match."""
+    rng = random.Random(seed)
+    frames: list[tuple[int, bytes]] = [(RX, encode(RX, "welcome", 1, map_size, map_size))]
+
+    # Map: eight rows per frame.
+    for row in range(0, map_size, 8):
+        chunk = b"".join(
+            encode(RX, "tiles", 0, y, tail=bytes(rng.randrange(4) for _ in range(map_size)))
+            for y in range(row, min(row + 8, map_size))
+        )
+        frames.append((RX, chunk))
+
+    pos = {
+        eid: [rng.randrange(map_size * 16), rng.randrange(map_size * 16)] for eid in range(entities)
+    }
+    frames.append(
+        (
+            RX,
+            b"".join(
+                encode(RX, "spawn", eid, 1, eid % 2, x, y, rng.randrange(256))
+                for eid, (x, y) in pos.items()
+            ),
+        )
+    )
+
+    next_id = entities
+    for tick in range(ticks):
+        moves = []
+        for eid, p in pos.items():
+            p[0] += rng.randint(-3, 3)
+            p[1] += rng.randint(-3, 3)
+            moves.append(encode(RX, "move", eid, p[0], p[1], rng.randrange(256)))
+        frames.append((RX, b"".join(moves)))
+        frames.append(
+            (TX, encode(TX, "input", tick & 0xFFFF, rng.randrange(16), rng.randrange(256)))
+        )
+        if tick % 10 == 0:
+            frames.append((TX, encode(TX, "fire", tick & 0xFFFF, rng.randrange(256))))
+        if tick % 50 == 0:
+            frames.append((RX, encode(RX, "ping", tick)))
+            frames.append((TX, encode(TX, "pong", tick)))
+        if tick % 25 == 24 and pos:
+            # One tank dies, another joins.
+            gone = rng.choice(list(pos))
+            del pos[gone]
+            pos[next_id] = [rng.randrange(map_size * 16), rng.randrange(map_size * 16)]
+            x, y = pos[next_id]
+            frames.append(
+                (
+                    RX,
+                    encode(RX, "remove", gone)
+                    + encode(RX, "spawn", next_id, 1, next_id % 2, x, y, 0),
+                )
+            )
+            next_id += 1
+    return frames
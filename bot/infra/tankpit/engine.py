@@ -1,11 +1,13 @@
 """TankPitEngine
 ===============
-A minimal asynchronous game-state engine that consumes raw WebSocket frames
-from the TankPit mitmproxy addon and can inject responses back.  For now the
-engine is only a stub so that the surrounding infrastructure (proxy service
-and addon) can create and run it without raising `ImportError`.
-
-The actual game logic will be filled in a later PR.
+An asynchronous game-state engine that consumes raw WebSocket frames from
+the TankPit mitmproxy addon and can inject responses back.
+
+With ``settings.tankpit_decoder`` (or ``decode=True``) frames are decoded by
+:mod:`bot.infra.tankpit.protocol` and applied to an incrementally updated
+:class:`~bot.infra.tankpit.state.GameState`.  The decoder's opcode table is a
+placeholder that has not been checked against real traffic, so it is off by
+default and the live engine only drains and counts frames.
 """
 
 from __future__ import annotations
@@ -15,35 +17,44 @@ import logging
 import time
 
 from bot.core.service_base import ServiceABC
-from bot.core.telemetry import record_frame
-from bot.utils.queue_helpers import (
-    get as q_get,
-    put_nowait as q_put,
-    task_done as q_task_done,
-)
+from bot.core.settings import settings
+from bot.core.telemetry import record_decode_error, record_frame
+from bot.netproxy.frames import DIRECTIONS, FrameRing, Outbound
+
+from .protocol import ProtocolError, iter_messages
+from .state import GameState
 
 logger = logging.getLogger(__name__)
 
-_DirFrame = tuple[str, bytes]
+_BATCH_MAX = 256  # frames handled per wake-up of the consume loop
 
 
 class TankPitEngine(ServiceABC):
-    """Very small placeholder implementation.
+    """Track the game from the proxied frame stream.
 
     Parameters
     ----------
     q_in:
-        Queue that receives `(direction, payload)` tuples where *direction* is
-        either ``"RX"`` (from server) or ``"TX"`` (from client).
+        :class:`~bot.netproxy.frames.FrameRing` of ``(direction, timestamp,
+        payload)`` frames where *direction* is ``RX`` (from server) or ``TX``
+        (from client).
     q_out:
-        Queue into which the engine can put crafted binary frames that should be
-        forwarded upstream to the TankPit server.
+        Queue into which the engine can put crafted ``(conn_id, payload)``
+        frames that should be forwarded upstream to the TankPit server.
+    decode:
+        Apply frames to :attr:`state`; defaults to ``settings.tankpit_decoder``.
     """
 
-    def __init__(self, q_in: asyncio.Queue[_DirFrame], q_out: asyncio.Queue[bytes]) -> None:
+    def __init__(
+        self, q_in: FrameRing, q_out: asyncio.Queue[Outbound], *, decode: bool | None = None
+    ) -> None:
         self._in = q_in
         self._out = q_out
         self._task: asyncio.Task[None] | None = None
+        self.decode = settings.tankpit_decoder if decode is None else decode
+        self.state = GameState()
+        self.frames = 0  # frames handled since construction
+        self._handled = asyncio.Event()  # set after every batch
 
     async def start(self) -> None:
         if self._task is None:
@@ -60,6 +71,12 @@ class TankPitEngine(ServiceABC):
                 pass
         self._task = None
 
+    async def wait_handled(self, count: int) -> None:
+        """Wait until the engine has handled *count* frames in total."""
+        while self.frames < count:
+            self._handled.clear()
+            await self._handled.wait()
+
     def is_running(self) -> bool:
         return self._task is not None and not self._task.done()
 
@@ -75,27 +92,34 @@ class TankPitEngine(ServiceABC):
                 pass
 
     async def _run(self) -> None:
-        """Run the main consume loop (placeholder implementation)."""
+        """Drain the inbound ring in batches and handle every frame."""
         try:
             while True:
-                direction, payload = await q_get(self._in, "proxy_in")
+                batch = await self._in.get_batch(_BATCH_MAX)
+                for direction, _ts, payload in batch:
+                    t0 = time.perf_counter()
+                    try:
+                        self._handle(direction, payload)
+                    except Exception as exc:  # pragma: no cover – dev aid
+                        logger.error("TankPitEngine error: %s", exc, exc_info=True)
+                    finally:
+                        record_frame(DIRECTIONS[direction], time.perf_counter() - t0)
+                self.frames += len(batch)
+                self._handled.set()
         except (asyncio.CancelledError, GeneratorExit):
             # Task cancelled or loop shutting down – exit quietly to avoid
             # unraisable warnings during test teardown.
             return
-            try:
-                t0 = time.perf_counter()
-                # TODO: parse payload and update state. For now we just echo.
-                if direction == "RX":
-                    # naive echo logic for proof-of-wiring
-                    try:
-                        q_put(self._out, payload, "proxy_out")
-                    except asyncio.QueueFull:
-                        from bot.core import alerts
-
-                        alerts.alert("Proxy outbound queue overflow – dropping frame")
-            except Exception as exc:  # pragma: no cover – dev aid
-                logger.error("TankPitEngine error: %s", exc, exc_info=True)
-            finally:
-                record_frame(direction, time.perf_counter() - t0)
-                q_task_done(self._in, "proxy_in")
+
+    def _handle(self, direction: int, payload: memoryview) -> None:
+        """Decode one frame and apply its messages to :attr:`state`."""
+        if not self.decode:
+            return
+        apply = self.state.apply
+        try:
+            for spec, values, tail in iter_messages(direction, payload):
+                apply(spec, values, tail)
+        except ProtocolError as exc:
+            # Messages before the bad one are already applied; skip the rest.
+            record_decode_error(DIRECTIONS[direction])
+            logger.debug("TankPitEngine: dropping rest of %s frame: %s", DIRECTIONS[direction], exc)
@@ -0,0 +1,129 @@
+"""TankPit wire protocol – table-driven binary decoder.
+
+A WebSocket frame carries one or more messages back to back::
+
+    opcode:u8  body:<fixed struct>  [tail_len:u16  tail:bytes]
+
+All integers are big-endian.  Each opcode maps to a :class:`MessageSpec` in
+:data:`RX_MESSAGES` (server → client) or :data:`TX_MESSAGES` (client →
+server); the spec's precompiled :class:`struct.Struct` unpacks the body
+straight from the frame's ``memoryview`` and a variable-length tail is handed
+on as a slice of that same view, so decoding copies no payload bytes.
+
+.. warning::
+
+   **Placeholder.**  :data:`RX_MESSAGES` and :data:`TX_MESSAGES` were written
+   without access to real TankPit traffic; every opcode and layout below is
+   an assumption.  :class:`~bot.infra.tankpit.engine.TankPitEngine` therefore
+   only decodes when ``settings.tankpit_decoder`` is set.  Rebuild the table
+   from frames recorded with ``PROXY_CAPTURE_PATH`` (``python -m
+   bot.netproxy.capture info FILE`` lists the opcodes seen per direction),
+   check a capture in as a test fixture, then turn the flag on by default.
+
+The decoder and :class:`~bot.infra.tankpit.state.GameState` need no code
+changes for new fixed-layout messages beyond a table entry and a handler.
+"""
+
+from __future__ import annotations
+
+import struct
+from collections.abc import Iterator
+from typing import NamedTuple
+
+from bot.netproxy.frames import DIRECTIONS, RX, TX
+
+__all__ = [
+    "MESSAGES",
+    "RX_MESSAGES",
+    "TX_MESSAGES",
+    "Message",
+    "MessageSpec",
+    "ProtocolError",
+    "encode",
+    "iter_messages",
+]
+
+
+class ProtocolError(ValueError):
+    """Raised for an unknown opcode or a truncated message."""
+
+
+class MessageSpec(NamedTuple):
+    opcode: int
+    name: str
+    body: struct.Struct
+    fields: tuple[str, ...]
+    tail: bool  # followed by a u16 length-prefixed blob
+
+
+def _spec(opcode: int, name: str, fmt: str, fields: str, *, tail: bool = False) -> MessageSpec:
+    return MessageSpec(opcode, name, struct.Struct(">" + fmt), tuple(fields.split()), tail)
+
+
+RX_MESSAGES: dict[int, MessageSpec] = {
+    s.opcode: s
+    for s in (
+        _spec(0x01, "welcome", "HHH", "player_id map_w map_h"),
+        _spec(0x02, "spawn", "HBBhhB", "entity_id kind team x y heading"),
+        _spec(0x03, "move", "HhhB", "entity_id x y heading"),
+        _spec(0x04, "remove", "H", "entity_id"),
+        _spec(0x05, "tiles", "HH", "x y", tail=True),  # row-major run from (x, y)
+        _spec(0x06, "ping", "I", "token"),
+    )
+}
+TX_MESSAGES: dict[int, MessageSpec] = {
+    s.opcode: s
+    for s in (
+        _spec(0x81, "input", "HBB", "seq keys heading"),
+        _spec(0x82, "fire", "HB", "seq heading"),
+        _spec(0x83, "pong", "I", "token"),
+        _spec(0x84, "chat", "", "", tail=True),  # UTF-8 text
+    )
+}
+# Opcode ranges are disjoint, so one table can dispatch both directions.
+MESSAGES: dict[int, MessageSpec] = RX_MESSAGES | TX_MESSAGES
+assert len(MESSAGES) == len(RX_MESSAGES) + len(TX_MESSAGES)
+
+_TABLES = {RX: RX_MESSAGES, TX: TX_MESSAGES}
+_BY_NAME = {(d, s.name): s for d, table in _TABLES.items() for s in table.values()}
+_TAIL_LEN = struct.Struct(">H")
+
+Message = tuple[MessageSpec, tuple[int, ...], memoryview | None]  # spec, body values, tail
+
+
+def iter_messages(direction: int, payload: memoryview) -> Iterator[Message]:
+    """Yield every message in one frame; raise :class:`ProtocolError` on bad input."""
+    table = _TABLES[direction]
+    end = len(payload)
+    off = 0
+    while off < end:
+        opcode = payload[off]
+        spec = table.get(opcode)
+        if spec is None:
+            raise ProtocolError(
+                f"unknown {DIRECTIONS[direction]} opcode 0x{opcode:02x} at offset {off}"
+            )
+        off += 1
+        try:
+            values = spec.body.unpack_from(payload, off)
+            off += spec.body.size
+            tail = None
+            if spec.tail:
+                (n,) = _TAIL_LEN.unpack_from(payload, off)
+                off += _TAIL_LEN.size
+                if off + n > end:
+                    raise ProtocolError(f"truncated {spec.name} tail at offset {off}")
+                tail = payload[off : off + n]
+                off += n
+        except struct.error as exc:
+            raise ProtocolError(f"truncated {spec.name} at offset {off}") from exc
+        yield spec, values, tail
+
+
+def encode(direction: int, name: str, *values: int, tail: bytes = b"") -> bytes:
+    """Serialise one message – for fixtures, replays and crafted outbound frames."""
+    spec = _BY_NAME[direction, name]
+    out = bytes((spec.opcode,)) + spec.body.pack(*values)
+    if spec.tail:
+        out += _TAIL_LEN.pack(len(tail)) + tail
+    return out
@@ -0,0 +1,165 @@
+"""Incrementally updated TankPit game state.
+
+Every decoded message is applied in place: entities live in an array-backed
+column store with slot reuse, the map is one ``bytearray`` of tile codes, and
+both container classes use ``__slots__`` – a busy game allocates nothing per
+message beyond the decoder's value tuple.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Callable, Iterator
+
+from .protocol import MESSAGES, MessageSpec
+
+__all__ = ["EntityTable", "GameState"]
+
+
+class EntityTable:
+    """Column store of live entities; slots of removed entities are reused."""
+
+    __slots__ = ("ids", "kind", "team", "x", "y", "heading", "_index", "_free")
+
+    def __init__(self) -> None:
+        self.ids = array("H")
+        self.kind = array("B")
+        self.team = array("B")
+        self.x = array("h")
+        self.y = array("h")
+        self.heading = array("B")
+        self._index: dict[int, int] = {}  # entity id -> slot
+        self._free: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, entity_id: object) -> bool:
+        return entity_id in self._index
+
+    def upsert(self, entity_id: int, kind: int, team: int, x: int, y: int, heading: int) -> None:
+        slot = self._index.get(entity_id)
+        if slot is None:
+            if self._free:
+                slot = self._free.pop()
+            else:
+                slot = len(self.ids)
+                for col in (self.ids, self.kind, self.team, self.x, self.y, self.heading):
+                    col.append(0)
+            self._index[entity_id] = slot
+        self.ids[slot] = entity_id
+        self.kind[slot] = kind
+        self.team[slot] = team
+        self.x[slot] = x
+        self.y[slot] = y
+        self.heading[slot] = heading
+
+    def move(self, entity_id: int, x: int, y: int, heading: int) -> bool:
+        """Update a position; return ``False`` for an entity we never saw spawn."""
+        slot = self._index.get(entity_id)
+        if slot is None:
+            return False
+        self.x[slot] = x
+        self.y[slot] = y
+        self.heading[slot] = heading
+        return True
+
+    def remove(self, entity_id: int) -> bool:
+        slot = self._index.pop(entity_id, None)
+        if slot is None:
+            return False
+        self._free.append(slot)
+        return True
+
+    def position(self, entity_id: int) -> tuple[int, int] | None:
+        slot = self._index.get(entity_id)
+        return None if slot is None else (self.x[slot], self.y[slot])
+
+    def items(self) -> Iterator[tuple[int, int, int]]:
+        """Yield ``(entity_id, x, y)`` for every live entity."""
+        for entity_id, slot in self._index.items():
+            yield entity_id, self.x[slot], self.y[slot]
+
+    def clear(self) -> None:
+        self._index.clear()
+        self._free = list(range(len(self.ids)))
+
+
+class GameState:
+    """The client's view of the game, updated one decoded message at a time."""
+
+    __slots__ = (
+        "player_id",
+        "map_w",
+        "map_h",
+        "tiles",
+        "entities",
+        "last_ping",
+        "input_seq",
+        "unknown_moves",
+        "_handlers",
+    )
+
+    def __init__(self) -> None:
+        self.player_id = 0
+        self.map_w = 0
+        self.map_h = 0
+        self.tiles = bytearray()  # row-major tile codes
+        self.entities = EntityTable()
+        self.last_ping = 0
+        self.input_seq = 0  # last input sequence the client sent
+        self.unknown_moves = 0  # moves for entities we never saw spawn
+        # opcode -> handler, resolved once from the protocol table
+        self._handlers: dict[int, Callable[[tuple[int, ...], memoryview | None], None]] = {
+            op: getattr(self, f"_on_{spec.name}") for op, spec in MESSAGES.items()
+        }
+
+    def apply(self, spec: MessageSpec, values: tuple[int, ...], tail: memoryview | None) -> None:
+        self._handlers[spec.opcode](values, tail)
+
+    def tile(self, x: int, y: int) -> int:
+        return self.tiles[y * self.map_w + x]
+
+    # ------------------------------------------------------------------+
+    # Server → client                                                   |
+    # ------------------------------------------------------------------+
+    def _on_welcome(self, values: tuple[int, ...], _tail: memoryview | None) -> None:
+        self.player_id, self.map_w, self.map_h = values
+        self.tiles = bytearray(self.map_w * self.map_h)
+        self.entities.clear()
+
+    def _on_spawn(self, values: tuple[int, ...], _tail: memoryview | None) -> None:
+        self.entities.upsert(*values)
+
+    def _on_move(self, values: tuple[int, ...], _tail: memoryview | None) -> None:
+        if not self.entities.move(*values):
+            self.unknown_moves += 1
+
+    def _on_remove(self, values: tuple[int, ...], _tail: memoryview | None) -> None:
+        self.entities.remove(values[0])
+
+    def _on_tiles(self, values: tuple[int, ...], tail: memoryview | None) -> None:
+        x, y = values
+        start = y * self.map_w + x
+        if tail is None or start >= len(self.tiles):
+            return
+        run = tail[: len(self.tiles) - start]
+        self.tiles[start : start + len(run)] = run
+
+    def _on_ping(self, values: tuple[int, ...], _tail: memoryview | None) -> None:
+        self.last_ping = values[0]
+
+    # ------------------------------------------------------------------+
+    # Client → server                                                   |
+    # ------------------------------------------------------------------+
+    def _on_input(self, values: tuple[int, ...], _tail: memoryview | None) -> None:
+        self.input_seq = values[0]
+
+    def _on_fire(self, values: tuple[int, ...], _tail: memoryview | None) -> None:
+        self.input_seq = values[0]
+
+    def _on_pong(self, _values: tuple[int, ...], _tail: memoryview | None) -> None:
+        pass
+
+    def _on_chat(self, _values: tuple[int, ...], _tail: memoryview | None) -> None:
+        pass
@@ -0,0 +1,367 @@
+"""Throughput benchmark for the MITM proxy frame path.
+
+Starts a local WebSocket echo server and a real :class:`ProxyService` with
+:class:`~bot.netproxy.ws_addon.GenericWSAddon`, then drives *N* clients
+through the proxy in stages of increasing frame size and rate.  A sink engine
+drains ``in_q`` in place of a game engine.  The report is a single JSON object
+on stdout::
+
+    python -m bot.netproxy.bench --clients 4 --rates 500,2000,8000 \\
+        --sizes 64,4096 --duration 2 --mode inline
+
+Per stage it reports offered vs. sustained frames/s, the drop rate at the
+inbound ring, ``in_q`` fill over time and latency per hop:
+
+``client_to_proxy``  client send → frame queued by the add-on (TX frames)
+``echo_to_proxy``    client send → echoed frame queued by the add-on (RX)
+``queue``            queued by the add-on → taken by the engine
+``round_trip``       client send → echo received by the client
+
+The first stage that drops frames or falls 10 % short of its offered rate is
+reported as ``saturated_at``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import socket
+import struct
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+from aiohttp import web
+
+from bot.core.settings import settings
+from bot.core.telemetry import REGISTRY
+
+from .frames import DIRECTIONS, RX, TX, FrameRing, Outbound
+from .overflow import PolicyName
+from .service import ProxyService
+from .ws_addon import GenericWSAddon
+
+__all__ = ["BenchConfig", "run_bench"]
+
+# The proxy ignores localhost/127.0.0.1; any other loopback address is proxied.
+_SERVER_HOST = "127.0.0.2"
+_STAMP = struct.Struct(">Qd")  # seq, client send time (time.monotonic)
+_FILL_SAMPLE_S = 0.05
+_DRAIN_S = 1.0  # grace period for in-flight frames after a stage
+
+
+@dataclass
+class BenchConfig:
+    clients: int = 4
+    rates: list[int] = field(default_factory=lambda: [500, 2000, 8000])  # frames/s, all clients
+    sizes: list[int] = field(default_factory=lambda: [64, 4096])  # payload bytes
+    duration: float = 2.0  # seconds per stage
+    ring: int = settings.queues.inbound
+    mode: str = "inline"  # settings.proxy_mode
+    policy: PolicyName = settings.proxy_overflow_policy
+    engine_cost_us: int = 0  # simulated per-frame engine work
+
+
+def _percentiles(samples: list[float]) -> dict[str, float]:
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    ordered = sorted(samples)
+
+    def pick(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 3)
+
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": round(ordered[-1], 3)}
+
+
+def _dropped() -> float:
+    return sum(
+        REGISTRY.get_sample_value(
+            "proxy_frames_dropped_total",
+            {"policy": settings.proxy_overflow_policy, "direction": d},
+        )
+        or 0
+        for d in DIRECTIONS
+    )
+
+
+@contextlib.contextmanager
+def _configured(cfg: BenchConfig) -> Iterator[None]:
+    """Apply *cfg*'s ring size, mode and policy to ``settings`` for the run only."""
+    saved = settings.queues.inbound, settings.proxy_mode, settings.proxy_overflow_policy
+    settings.queues.inbound = cfg.ring
+    settings.proxy_mode = cfg.mode  # type: ignore[assignment]
+    settings.proxy_overflow_policy = cfg.policy
+    try:
+        yield
+    finally:
+        settings.queues.inbound, settings.proxy_mode, settings.proxy_overflow_policy = saved
+
+
+# ---------------------------------------------------------------------------+
+#  Echo server and sink engine                                               +
+# ---------------------------------------------------------------------------+
+async def _start_echo_server() -> tuple[web.AppRunner, str]:
+    async def echo(request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse(max_msg_size=0)
+        await ws.prepare(request)
+        async for msg in ws:
+            if msg.type is aiohttp.WSMsgType.BINARY:
+                await ws.send_bytes(msg.data)
+        return ws
+
+    app = web.Application()
+    app.router.add_get("/ws", echo)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    sock = socket.socket()
+    sock.bind((_SERVER_HOST, 0))
+    await web.SockSite(runner, sock).start()
+    # http:// – mitmproxy rejects ws:// in absolute-form proxy requests
+    return runner, f"http://{_SERVER_HOST}:{sock.getsockname()[1]}/ws"
+
+
+class _Sink:
+    """Engine stand-in that drains ``in_q`` and timestamps every frame."""
+
+    def __init__(self, ring: FrameRing, _out: asyncio.Queue[Outbound], cost_us: int) -> None:
+        self._ring = ring
+        self._cost_s = cost_us / 1e6
+        self._task: asyncio.Task[None] | None = None
+        self.hops: dict[str, list[float]] = defaultdict(list)
+        self.frames = [0, 0]
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self, *, graceful: bool = True) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def reset(self) -> None:
+        self.hops.clear()
+        self.frames = [0, 0]
+
+    async def _run(self) -> None:
+        hop = ("client_to_proxy", "echo_to_proxy")
+        while True:
+            batch = await self._ring.get_batch(256)
+            taken = time.monotonic()
+            for direction, queued, payload in batch:
+                self.frames[direction] += 1
+                if len(payload) >= _STAMP.size:
+                    _seq, sent = _STAMP.unpack_from(payload)
+                    self.hops[hop[direction]].append((queued - sent) * 1000)
+                self.hops["queue"].append((taken - queued) * 1000)
+                if self._cost_s:
+                    end = time.perf_counter() + self._cost_s
+                    while time.perf_counter() < end:
+                        pass
+
+
+# ---------------------------------------------------------------------------+
+#  Driver                                                                    +
+# ---------------------------------------------------------------------------+
+async def _client(
+    session: aiohttp.ClientSession,
+    url: str,
+    proxy: str,
+    rate: float,
+    size: int,
+    duration: float,
+    round_trips: list[float],
+) -> int:
+    padding = bytes(max(0, size - _STAMP.size))
+    async with session.ws_connect(url, proxy=proxy, max_msg_size=0) as ws:
+
+        async def read_echoes() -> None:
+            async for msg in ws:
+                if msg.type is aiohttp.WSMsgType.BINARY:
+                    _seq, sent = _STAMP.unpack_from(msg.data)
+                    round_trips.append((time.monotonic() - sent) * 1000)
+
+        reader = asyncio.create_task(read_echoes())
+        interval, sent = 1 / rate, 0
+        start = due = time.monotonic()
+        while (now := time.monotonic()) < start + duration:
+            while due <= now:  # catch up in a burst when the loop fell behind
+                await ws.send_bytes(_STAMP.pack(sent, time.monotonic()) + padding)
+                sent += 1
+                due += interval
+            await asyncio.sleep(due - time.monotonic())
+        await asyncio.sleep(_DRAIN_S)
+        reader.cancel()
+    return sent
+
+
+async def _wait_listening(port: int, timeout: float = 10.0) -> None:
+    """``ProxyService.start`` returns before mitmproxy has bound its port."""
+    async with asyncio.timeout(timeout):
+        while True:
+            try:
+                _reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            except OSError:
+                await asyncio.sleep(0.05)
+                continue
+            writer.close()
+            return
+
+
+async def _sample_fill(ring: FrameRing, samples: list[int], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        samples.append(ring.qsize())
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=_FILL_SAMPLE_S)
+        except TimeoutError:
+            pass
+
+
+async def _stage(
+    svc: ProxyService, sink: _Sink, url: str, cfg: BenchConfig, rate: int, size: int
+) -> dict[str, Any]:
+    sink.reset()
+    round_trips: list[float] = []
+    fill: list[int] = []
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(_sample_fill(svc.in_q, fill, stop))
+    dropped_before = _dropped()
+    proxy = f"http://127.0.0.1:{svc.port}"
+    async with aiohttp.ClientSession() as session:
+        sent = sum(
+            await asyncio.gather(
+                *(
+                    _client(
+                        session, url, proxy, rate / cfg.clients, size, cfg.duration, round_trips
+                    )
+                    for _ in range(cfg.clients)
+                )
+            )
+        )
+    stop.set()
+    await sampler
+
+    dropped = _dropped() - dropped_before
+    reached = sink.frames[TX]
+    offered = sum(sink.frames) + dropped
+    return {
+        "size": size,
+        "offered_fps": rate,
+        "sent": sent,
+        "sustained_fps": round(reached / cfg.duration),
+        "echoed": sink.frames[RX],
+        "drop_rate": round(dropped / offered, 4) if offered else 0.0,
+        "queue_fill": {
+            "max": max(fill, default=0),
+            "mean": round(sum(fill) / len(fill), 1) if fill else 0.0,
+            "timeline": fill[:: max(1, len(fill) // 20)],  # ≤ ~20 points
+        },
+        "latency_ms": {name: _percentiles(samples) for name, samples in sorted(sink.hops.items())}
+        | {"round_trip": _percentiles(round_trips)},
+    }
+
+
+async def run_bench(cfg: BenchConfig) -> dict[str, Any]:
+    """Run every (size, rate) stage of *cfg* and return the JSON-ready report."""
+    with _configured(cfg):
+        stages = await _run_stages(cfg)
+
+    saturated = next(
+        (
+            {"size": s["size"], "offered_fps": s["offered_fps"]}
+            for s in stages
+            if s["drop_rate"] > 0 or s["sustained_fps"] < 0.9 * s["offered_fps"]
+        ),
+        None,
+    )
+    return {
+        "config": {
+            "clients": cfg.clients,
+            "duration_s": cfg.duration,
+            "ring": cfg.ring,
+            "mode": cfg.mode,
+            "overflow_policy": cfg.policy,
+            "engine_cost_us": cfg.engine_cost_us,
+        },
+        "stages": stages,
+        "saturated_at": saturated,
+    }
+
+
+async def _run_stages(cfg: BenchConfig) -> list[dict[str, Any]]:
+    runner, url = await _start_echo_server()
+    sinks: list[_Sink] = []
+
+    def make_sink(ring: FrameRing, out: asyncio.Queue[Outbound]) -> _Sink:
+        sinks.append(_Sink(ring, out, cfg.engine_cost_us))
+        return sinks[-1]
+
+    with tempfile.TemporaryDirectory() as certdir:
+        svc = ProxyService(
+            port=9400,
+            certdir=Path(certdir),
+            addons=[GenericWSAddon],  # type: ignore[list-item]
+            engine_factory=make_sink,
+        )
+        await svc.start()
+        try:
+            await _wait_listening(svc.port)
+            stages = [
+                await _stage(svc, sinks[0], url, cfg, rate, size)
+                for size in cfg.sizes
+                for rate in cfg.rates
+            ]
+        finally:
+            await svc.stop()
+            await runner.cleanup()
+    return stages
+
+
+def _int_list(spec: str) -> list[int]:
+    return [int(part) for part in spec.split(",") if part.strip()]
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Entry-point for ``python -m bot.netproxy.bench``."""
+    parser = argparse.ArgumentParser(description="Benchmark the MITM proxy frame path")
+    parser.add_argument("--clients", type=int, default=BenchConfig.clients)
+    parser.add_argument("--rates", type=_int_list, default=[500, 2000, 8000])
+    parser.add_argument("--sizes", type=_int_list, default=[64, 4096])
+    parser.add_argument("--duration", type=float, default=BenchConfig.duration)
+    parser.add_argument("--ring", type=int, default=settings.queues.inbound)
+    parser.add_argument("--mode", choices=["inline", "thread", "process"], default="inline")
+    parser.add_argument(
+        "--policy",
+        choices=["drop_newest", "drop_oldest", "coalesce", "flow_control"],
+        default=settings.proxy_overflow_policy,
+    )
+    parser.add_argument("--engine-cost-us", type=int, default=0, help="per-frame engine work")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(
+        run_bench(
+            BenchConfig(
+                clients=args.clients,
+                rates=args.rates,
+                sizes=args.sizes,
+                duration=args.duration,
+                ring=args.ring,
+                mode=args.mode,
+                policy=args.policy,
+                engine_cost_us=args.engine_cost_us,
+            )
+        )
+    )
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
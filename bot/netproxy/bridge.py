@@ -0,0 +1,269 @@
+"""Run mitmproxy off the bot's event loop.
+
+In ``inline`` mode :class:`~bot.netproxy.service.ProxyService` runs
+``DumpMaster.run()`` on the discord.py loop, so TLS interception competes
+with gateway heartbeats.  With ``proxy_mode = "thread"`` or ``"process"``
+mitmproxy gets a loop of its own – a dedicated thread, or a spawned child
+process that also sidesteps the GIL – and talks to the bot over one local
+TCP connection:
+
+* the proxy side (:class:`BridgeAddon`) sends ``open`` / ``close`` records
+  from the WebSocket hooks and one ``frame`` record per message;
+* the bot side (:class:`ProxyBridge`) applies ``settings.proxy_rules``,
+  feeds frames into ``in_q`` through the configured
+  :class:`~bot.netproxy.overflow.OverflowPolicy` and sends ``out_q`` items
+  back as ``send`` records.
+
+Every record is ``kind:u8  direction:u8  conn_id:u32  length:u32`` followed
+by *length* payload bytes (the host name for ``open``).  The socket is the
+backpressure path: when the bot stops reading, the proxy's ``drain()`` waits
+and mitmproxy stops reading from the client.  Closing the connection shuts
+the proxy down.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import multiprocessing
+import struct
+import threading
+from dataclasses import dataclass
+from multiprocessing.process import BaseProcess
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal
+
+from bot.core import alerts
+from bot.core.settings import settings
+
+from .flows import FlowIndex, FlowTable
+from .frames import RX, TX, FrameRing, Outbound
+from .overflow import OverflowPolicy
+from .rules import RuleSet
+from .ws_addon import send_outbound
+
+if TYPE_CHECKING:  # mitmproxy type stubs are incomplete
+    from mitmproxy.http import HTTPFlow
+    from mitmproxy.tools.dump import DumpMaster
+
+__all__ = ["BridgeAddon", "ProxyBridge", "run_proxy"]
+
+logger = logging.getLogger(__name__)
+
+_RECORD = struct.Struct(">BBII")
+_FRAME, _OPEN, _CLOSE, _SEND = range(4)
+_CONNECT_TIMEOUT_S = 15.0  # a spawned child imports mitmproxy before it connects
+_JOIN_TIMEOUT_S = 5.0
+
+
+async def _read_record(reader: asyncio.StreamReader) -> tuple[int, int, int, bytes]:
+    kind, direction, conn_id, length = _RECORD.unpack(await reader.readexactly(_RECORD.size))
+    return kind, direction, conn_id, await reader.readexactly(length) if length else b""
+
+
+def _write_record(
+    writer: asyncio.StreamWriter, kind: int, direction: int, conn_id: int, payload: bytes
+) -> None:
+    writer.write(_RECORD.pack(kind, direction, conn_id, len(payload)))
+    if payload:
+        writer.write(payload)
+
+
+# ---------------------------------------------------------------------------+
+#  Proxy side – runs on mitmproxy's own loop                                 +
+# ---------------------------------------------------------------------------+
+@dataclass(frozen=True)
+class _ProxyArgs:
+    port: int
+    certdir: str
+    bridge_port: int
+    capture_path: str | None = None
+
+
+class BridgeAddon:
+    """mitmproxy add-on that forwards WebSocket traffic over the bridge."""
+
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        self._writer = writer
+        self.flows = FlowIndex()
+
+    def websocket_start(self, flow: HTTPFlow) -> None:
+        conn_id = self.flows.open(flow)
+        _write_record(self._writer, _OPEN, 0, conn_id, flow.request.pretty_host.encode())
+
+    def websocket_end(self, flow: HTTPFlow) -> None:
+        conn_id = self.flows.close(flow)
+        if conn_id is not None:
+            _write_record(self._writer, _CLOSE, 0, conn_id, b"")
+
+    async def websocket_message(self, flow: HTTPFlow) -> None:
+        if not flow.websocket:
+            return
+        msg = flow.websocket.messages[-1]
+        direction = TX if msg.from_client else RX
+        _write_record(self._writer, _FRAME, direction, self.flows.conn_id(flow) or 0, msg.content)
+        with contextlib.suppress(ConnectionError):  # bot went away; shutdown follows
+            await self._writer.drain()  # only waits while the bot is behind
+
+    async def pump(self, reader: asyncio.StreamReader, master: DumpMaster) -> None:
+        """Inject ``send`` records until the bot closes the bridge, then shut down."""
+        try:
+            while True:
+                kind, _direction, conn_id, data = await _read_record(reader)
+                if kind == _SEND:
+                    send_outbound(self.flows, conn_id or None, data)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            master.shutdown()  # type: ignore[no-untyped-call]
+
+
+def run_proxy(args: _ProxyArgs) -> None:
+    """Thread / child-process entry point: run mitmproxy on a fresh loop."""
+    asyncio.run(_serve(args))
+
+
+async def _serve(args: _ProxyArgs) -> None:
+    from .capture import CaptureAddon
+    from .service import build_master
+
+    master = build_master(args.port, Path(args.certdir))
+    reader, writer = await asyncio.open_connection("127.0.0.1", args.bridge_port)
+    addon = BridgeAddon(writer)
+    master.addons.add(addon)  # type: ignore[no-untyped-call]
+    capture = CaptureAddon(args.capture_path) if args.capture_path else None
+    if capture is not None:
+        master.addons.add(capture)  # type: ignore[no-untyped-call]
+    pump = asyncio.create_task(addon.pump(reader, master))
+    try:
+        await master.run()
+    finally:
+        pump.cancel()
+        writer.close()
+        if capture is not None:
+            capture.close()
+
+
+# ---------------------------------------------------------------------------+
+#  Bot side                                                                  +
+# ---------------------------------------------------------------------------+
+class ProxyBridge:
+    """Start mitmproxy in a thread or child process and relay its frames."""
+
+    def __init__(
+        self,
+        inbound: FrameRing,
+        outbound: asyncio.Queue[Outbound],
+        *,
+        mode: Literal["thread", "process"] = "thread",
+        rules: RuleSet | None = None,
+    ) -> None:
+        self.mode = mode
+        self._rules = rules if rules is not None else RuleSet()
+        self.table = FlowTable()  # open WebSockets, fed from the bridge records
+        self._out = outbound
+        self._overflow = OverflowPolicy(
+            inbound,
+            settings.proxy_overflow_policy,
+            wait_s=settings.proxy_flow_control_ms / 1000,
+            alert_interval_s=settings.proxy_overflow_alert_sec,
+        )
+        self._runner: threading.Thread | BaseProcess | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._tasks: list[asyncio.Task[None]] = []
+        self._stopping = False
+
+    async def start(self, port: int, certdir: Path, capture_path: str | None = None) -> None:
+        loop = asyncio.get_running_loop()
+        connected: asyncio.Future[tuple[asyncio.StreamReader, asyncio.StreamWriter]]
+        connected = loop.create_future()
+
+        def accept(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            if connected.done():
+                writer.close()  # only the proxy we started may connect
+            else:
+                connected.set_result((reader, writer))
+
+        server = await asyncio.start_server(accept, "127.0.0.1", 0)
+        args = _ProxyArgs(port, str(certdir), server.sockets[0].getsockname()[1], capture_path)
+        if self.mode == "process":
+            ctx = multiprocessing.get_context("spawn")  # never fork the bot's loop
+            self._runner = ctx.Process(target=run_proxy, args=(args,), name="mitmproxy")
+        else:
+            self._runner = threading.Thread(
+                target=run_proxy, args=(args,), name="mitmproxy", daemon=True
+            )
+        self._runner.start()
+        try:
+            async with asyncio.timeout(_CONNECT_TIMEOUT_S):
+                reader, writer = await connected
+        except TimeoutError:
+            await self._join()
+            raise RuntimeError(f"mitmproxy {self.mode} did not connect to the bridge") from None
+        finally:
+            server.close()
+
+        self._stopping = False
+        self._writer = writer
+        self._tasks = [
+            asyncio.create_task(self._pump_in(reader), name="proxy-bridge-in"),
+            asyncio.create_task(self._pump_out(writer), name="proxy-bridge-out"),
+        ]
+
+    async def stop(self) -> None:
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+        if self._writer is not None:
+            self._writer.close()  # EOF tells the proxy side to shut down
+            with contextlib.suppress(ConnectionError):
+                await self._writer.wait_closed()
+            self._writer = None
+        await self._join()
+        self._overflow.close()
+        self.table.clear()
+
+    # ------------------------------------------------------------------+
+    # Internals                                                         |
+    # ------------------------------------------------------------------+
+    async def _pump_in(self, reader: asyncio.StreamReader) -> None:
+        overflow, offer, table = self._overflow, self._rules.offer, self.table
+        try:
+            while True:
+                kind, direction, conn_id, data = await _read_record(reader)
+                if kind == _FRAME:
+                    stats = table.frame(conn_id, direction, len(data))
+                    host = stats.host if stats is not None else ""
+                    await offer(overflow, direction, data, host)  # flow_control stops reading
+                elif kind == _OPEN:
+                    table.open(conn_id, data.decode())
+                elif kind == _CLOSE:
+                    table.close(conn_id)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            if not self._stopping:
+                logger.error("ProxyBridge: mitmproxy %s exited unexpectedly", self.mode)
+                alerts.alert(f"⚠️ mitmproxy {self.mode} exited unexpectedly")
+
+    async def _pump_out(self, writer: asyncio.StreamWriter) -> None:
+        while True:
+            conn_id, data = await self._out.get()
+            try:
+                _write_record(writer, _SEND, TX, conn_id or 0, data)
+                await writer.drain()
+            finally:
+                self._out.task_done()
+
+    async def _join(self) -> None:
+        runner, self._runner = self._runner, None
+        if runner is None:
+            return
+        await asyncio.to_thread(runner.join, _JOIN_TIMEOUT_S)
+        if isinstance(runner, BaseProcess) and runner.is_alive():
+            runner.terminate()
+            await asyncio.to_thread(runner.join, 1.0)
+        elif runner.is_alive():
+            logger.warning("ProxyBridge: mitmproxy thread still running after %ss", _JOIN_TIMEOUT_S)
@@ -0,0 +1,386 @@
+"""Frame capture and replay for the MITM proxy.
+
+:class:`CaptureAddon` sits next to :class:`~bot.netproxy.ws_addon.GenericWSAddon`
+and appends every WebSocket frame to a capture file; :func:`replay` feeds a
+capture back into a :class:`~bot.netproxy.frames.FrameRing` (normally
+``ProxyService.in_q``) at recorded speed, *N*× or as fast as the consumer
+drains, so engines and queues can be load-tested without a game server.
+
+File layout (all integers big-endian)::
+
+    header   magic "FCAP"  version:u16  reserved:u16  created:f64
+    record   kind:u8  direction:u8  length:u32  ts:f64  payload[length]
+
+``kind`` is ``0`` for a frame (``ts`` = wall-clock seconds), ``1`` for an
+index block written every ``index_every`` frames and ``2`` for the footer
+written on close.  An index block's payload is the offset of the previous
+block (``0`` for the first) followed by the offsets of the frames since then
+(``u64`` each); its ``ts`` is the first of those frames' timestamp.  The
+footer's payload is the offset of the last index block, so a reader seeks
+by walking the block chain back from the end instead of reading every
+record.  A capture whose writer died has no footer and is scanned instead.
+
+The file is only ever appended to – a reopened capture continues the chain,
+a record torn by a crash is truncated first and a stale footer is skipped
+like any unknown record – and
+:class:`CaptureReader` maps it read-only so frames are served as
+``memoryview`` slices without copying.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from collections import Counter
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO
+
+from .frames import DIRECTIONS, RX, TX, FrameRing
+
+if TYPE_CHECKING:  # mitmproxy type stubs are incomplete
+    from mitmproxy.http import HTTPFlow
+
+__all__ = ["CaptureAddon", "CaptureReader", "CaptureWriter", "ReplayStats", "replay"]
+
+MAGIC = b"FCAP"
+VERSION = 2
+_HEADER = struct.Struct(">4sHHd")
+_RECORD = struct.Struct(">BBId")
+_OFFSET = struct.Struct(">Q")
+_FRAME, _INDEX, _FOOTER = 0, 1, 2
+_FOOTER_SIZE = _RECORD.size + _OFFSET.size
+_FLUSH_EVERY_S = 1.0
+
+
+class CaptureWriter:
+    """Append frames to a capture file, creating it with a header if needed."""
+
+    def __init__(self, path: str | Path, *, index_every: int = 1024) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._last_index = _resume(self.path)  # offset of the newest index block, 0 = none
+        self._fh: BinaryIO = open(self.path, "ab", buffering=1 << 20)  # noqa: SIM115
+        if self._fh.tell() == 0:
+            self._fh.write(_HEADER.pack(MAGIC, VERSION, 0, time.time()))
+        self._index_every = index_every
+        self._pending = array("Q")  # offsets of frames since the last index block
+        self._first_ts = 0.0
+        self._flushed = time.monotonic()
+        self.frames = 0
+
+    def write(self, direction: int, payload: bytes | memoryview, ts: float | None = None) -> None:
+        ts = time.time() if ts is None else ts
+        if not self._pending:
+            self._first_ts = ts
+        self._pending.append(self._fh.tell())
+        self._fh.write(_RECORD.pack(_FRAME, direction, len(payload), ts))
+        self._fh.write(payload)
+        self.frames += 1
+        if len(self._pending) >= self._index_every:
+            self._write_index()
+        if time.monotonic() - self._flushed >= _FLUSH_EVERY_S:
+            self.flush()
+
+    def flush(self) -> None:
+        self._fh.flush()
+        self._flushed = time.monotonic()
+
+    def close(self) -> None:
+        if self._fh.closed:
+            return
+        if self._pending:
+            self._write_index()
+        if self._last_index:
+            self._fh.write(_RECORD.pack(_FOOTER, 0, _OFFSET.size, 0.0))
+            self._fh.write(_OFFSET.pack(self._last_index))
+        self._fh.close()
+
+    def _write_index(self) -> None:
+        self._pending.insert(0, self._last_index)
+        body = self._pending.tobytes() if sys.byteorder == "big" else _byteswapped(self._pending)
+        self._last_index = self._fh.tell()
+        self._fh.write(_RECORD.pack(_INDEX, 0, len(body), self._first_ts))
+        self._fh.write(body)
+        self._pending = array("Q")
+
+
+def _resume(path: Path) -> int:
+    """Prepare an existing capture for appending; return its last index block.
+
+    A record cut short by a crash is truncated away so new frames follow the
+    last complete one instead of being swallowed by the torn record's length.
+    """
+    if not path.exists() or path.stat().st_size == 0:
+        return 0
+    with CaptureReader(path) as reader:  # raises ValueError for foreign files
+        end, last = reader.tail()
+    if end < path.stat().st_size:
+        os.truncate(path, end)
+    return last
+
+
+def _byteswapped(values: array[int]) -> bytes:
+    swapped = array("Q", values)
+    swapped.byteswap()
+    return swapped.tobytes()
+
+
+class CaptureAddon:
+    """mitmproxy add-on that records every WebSocket frame to *path*."""
+
+    def __init__(self, path: str | Path, *, index_every: int = 1024) -> None:
+        self._writer = CaptureWriter(path, index_every=index_every)
+
+    async def websocket_message(self, flow: HTTPFlow) -> None:
+        if not flow.websocket:
+            return
+        msg = flow.websocket.messages[-1]
+        self._writer.write(TX if msg.from_client else RX, msg.content, msg.timestamp)
+
+    def done(self) -> None:  # noqa: D401 – mitmproxy naming convention
+        """Close the capture when mitmproxy shuts down."""
+        self._writer.close()
+
+    close = done
+
+
+class CaptureReader:
+    """Memory-mapped, read-only view of a capture file."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        with open(self.path, "rb") as fh:
+            self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size:
+            self.close()
+            raise ValueError(f"{self.path} is not a capture file")
+        magic, version, _reserved, self.created = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{self.path} is not a version {VERSION} capture file")
+
+    def __enter__(self) -> CaptureReader:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._map.close()
+
+    def frames(self, start_ts: float = 0.0) -> Iterator[tuple[int, float, memoryview]]:
+        """Yield ``(direction, ts, payload)`` for frames at or after *start_ts*.
+
+        Iteration starts at the index block covering *start_ts*, so earlier
+        payloads are never touched.  Payload views borrow the mapping – copy
+        or release them before :meth:`close`.  A record cut short by a crash
+        ends the iteration.
+        """
+        view = memoryview(self._map)
+        try:
+            yield from self._frames(view, self._seek(start_ts), start_ts)
+        finally:
+            view.release()
+
+    def index(self) -> list[tuple[int, float]]:
+        """Return ``(offset, first_ts)`` of every index block."""
+        last = self.last_index()
+        if last is None:
+            return [
+                (body - _RECORD.size, ts)
+                for kind, _d, _n, ts, body in self._records(_HEADER.size)
+                if kind == _INDEX
+            ]
+        return [(pos, ts) for pos, ts, _first in self._chain(last)][::-1]
+
+    def last_index(self) -> int | None:
+        """Offset of the last index block per the footer; ``None`` without one."""
+        pos = len(self._map) - _FOOTER_SIZE
+        if pos < _HEADER.size:
+            return None
+        kind, _d, length, _ts = _RECORD.unpack_from(self._map, pos)
+        if kind != _FOOTER or length != _OFFSET.size:
+            return None
+        last = _OFFSET.unpack_from(self._map, pos + _RECORD.size)[0]
+        # Payload bytes of an unfinished capture could pass for a footer.
+        if not _HEADER.size <= last < pos or self._map[last] != _INDEX:
+            return None
+        return int(last)
+
+    def tail(self) -> tuple[int, int]:
+        """Return ``(end of the last complete record, offset of the last index block)``.
+
+        The block offset is ``0`` when there is none.  Reads the footer when
+        the writer closed cleanly, else scans the record headers.
+        """
+        last = self.last_index()
+        if last is not None:
+            return len(self._map), last
+        end, last = _HEADER.size, 0
+        for kind, _d, length, _ts, body in self._records(_HEADER.size):
+            end = body + length
+            if kind == _INDEX:
+                last = body - _RECORD.size
+        return end, last
+
+    def _chain(self, pos: int) -> Iterator[tuple[int, float, int]]:
+        """Walk index blocks back from *pos*: ``(offset, first_ts, first_frame)``."""
+        while pos:
+            _kind, _d, _n, ts = _RECORD.unpack_from(self._map, pos)
+            prev, first = struct.unpack_from(">QQ", self._map, pos + _RECORD.size)
+            yield pos, ts, first
+            pos = prev
+
+    def _seek(self, start_ts: float) -> int:
+        """Offset of the first frame of the last index block starting before *start_ts*."""
+        if not start_ts:
+            return _HEADER.size
+        last = self.last_index()
+        if last is None:  # writer never closed – scan the record headers
+            pos = _HEADER.size
+            for kind, _d, _n, ts, body in self._records(_HEADER.size):
+                if kind != _INDEX:
+                    continue
+                if ts > start_ts:
+                    break
+                pos = struct.unpack_from(">Q", self._map, body + _OFFSET.size)[0]
+            return pos
+        for _pos, ts, first in self._chain(last):
+            if ts <= start_ts:
+                return first
+        return _HEADER.size
+
+    def _records(self, pos: int) -> Iterator[tuple[int, int, int, float, int]]:
+        """Yield ``(kind, direction, length, ts, payload_offset)`` from *pos* on."""
+        end = len(self._map)
+        while pos + _RECORD.size <= end:
+            kind, direction, length, ts = _RECORD.unpack_from(self._map, pos)
+            body = pos + _RECORD.size
+            if body + length > end:
+                return  # torn write at the tail
+            yield kind, direction, length, ts, body
+            pos = body + length
+
+    def _frames(
+        self, view: memoryview, pos: int, start_ts: float
+    ) -> Iterator[tuple[int, float, memoryview]]:
+        for kind, direction, length, ts, body in self._records(pos):
+            if kind == _FRAME and ts >= start_ts:
+                yield direction, ts, view[body : body + length]
+
+
+@dataclass
+class ReplayStats:
+    frames: int = 0
+    dropped: int = 0
+    elapsed_s: float = 0.0
+
+
+async def replay(
+    path: str | Path,
+    ring: FrameRing,
+    *,
+    speed: float = 1.0,
+    drop_when_full: bool = False,
+) -> ReplayStats:
+    """Feed the frames of *path* into *ring*.
+
+    *speed* scales the recorded inter-frame gaps (``2.0`` plays twice as
+    fast); ``0`` ignores them and pushes as fast as the ring drains.  With
+    *drop_when_full* a full ring drops the frame like the live add-on does,
+    otherwise replay waits for room.
+    """
+    stats = ReplayStats()
+    started = time.monotonic()
+    with CaptureReader(path) as reader:
+        first_ts: float | None = None
+        for direction, ts, payload in reader.frames():
+            if first_ts is None:
+                first_ts = ts
+            if speed > 0:
+                delay = started + (ts - first_ts) / speed - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            data = bytes(payload)  # the ring outlives the mapping
+            payload.release()
+            if ring.full() and drop_when_full:
+                stats.dropped += 1
+                continue
+            await ring.put(direction, data)
+            stats.frames += 1
+    stats.elapsed_s = time.monotonic() - started
+    return stats
+
+
+# ---------------------------------------------------------------------------+
+#  CLI                                                                       +
+# ---------------------------------------------------------------------------+
+async def _replay_into_engine(args: argparse.Namespace) -> dict[str, Any]:
+    from bot.infra.tankpit.engine import TankPitEngine
+
+    ring = FrameRing(args.ring)
+    engine = TankPitEngine(ring, asyncio.Queue())
+    await engine.start()
+    started = time.monotonic()
+    try:
+        stats = await replay(args.file, ring, speed=args.speed, drop_when_full=args.drop)
+        await engine.wait_handled(stats.frames)  # include the engine catching up
+        elapsed = time.monotonic() - started
+    finally:
+        await engine.stop()
+    return {
+        "frames": stats.frames,
+        "dropped": stats.dropped,
+        "elapsed_s": round(elapsed, 4),
+        "frames_per_s": round(stats.frames / elapsed) if elapsed else 0,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Entry-point for ``python -m bot.netproxy.capture``."""
+    parser = argparse.ArgumentParser(description="Inspect or replay a proxy capture")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    info = sub.add_parser("info", help="summarise a capture file")
+    info.add_argument("file")
+    rep = sub.add_parser("replay", help="replay a capture into TankPitEngine")
+    rep.add_argument("file")
+    rep.add_argument("--speed", type=float, default=1.0, help="N× recorded speed, 0 = max")
+    rep.add_argument("--ring", type=int, default=500, help="inbound ring size")
+    rep.add_argument("--drop", action="store_true", help="drop frames when the ring is full")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "info":
+        with CaptureReader(args.file) as reader:
+            count, size, first, last = 0, 0, None, None
+            opcodes: dict[str, Counter[str]] = {label: Counter() for label in DIRECTIONS}
+            for direction, ts, payload in reader.frames():
+                count, size = count + 1, size + len(payload)
+                first = ts if first is None else first
+                last = ts
+                opcodes[DIRECTIONS[direction]][f"0x{payload[0]:02x}" if payload else "empty"] += 1
+                payload.release()
+            report: dict[str, Any] = {
+                "frames": count,
+                "payload_bytes": size,
+                "duration_s": round((last or 0) - (first or 0), 3),
+                "index_blocks": len(reader.index()),
+                # first payload byte per direction – raw material for a protocol table
+                "opcodes": {d: dict(sorted(c.items())) for d, c in opcodes.items()},
+            }
+    else:
+        report = asyncio.run(_replay_into_engine(args))
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
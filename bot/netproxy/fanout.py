@@ -0,0 +1,148 @@
+"""Broadcast the proxy's frame stream to several consumers.
+
+:class:`FanOut` drains ``ProxyService.in_q`` and copies every frame into one
+bounded :class:`~bot.netproxy.frames.FrameRing` per subscriber – a logger, a
+state tracker and an AI agent can all watch the same traffic.  Payloads are
+shared ``memoryview`` references, so a broadcast copies no bytes.
+
+Each subscriber has its own :class:`~bot.netproxy.overflow.OverflowPolicy`.
+Only non-blocking policies are accepted: a full subscriber loses frames
+(counted per subscriber) but never holds up the others.  Backlog depth, the
+age of the oldest queued frame and drops are sampled into the
+``proxy_subscriber_*`` metrics.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from typing import NamedTuple
+
+from bot.core.telemetry import record_subscriber_lag
+
+from .frames import FrameRing
+from .overflow import OverflowPolicy, PolicyName
+
+__all__ = ["FanOut", "SubscriberLag"]
+
+_BATCH_MAX = 256
+
+
+class SubscriberLag(NamedTuple):
+    name: str
+    queued: int
+    maxsize: int
+    lag_s: float
+    dropped: int
+
+
+class _Subscriber:
+    __slots__ = ("name", "ring", "policy", "_reported")
+
+    def __init__(self, name: str, ring: FrameRing, policy: OverflowPolicy) -> None:
+        self.name = name
+        self.ring = ring
+        self.policy = policy
+        self._reported = 0  # drops already published
+
+    def lag(self, now: float) -> SubscriberLag:
+        oldest = self.ring.oldest_ts()
+        return SubscriberLag(
+            self.name,
+            self.ring.qsize(),
+            self.ring.maxsize,
+            0.0 if oldest is None else max(0.0, now - oldest),
+            self.policy.dropped,
+        )
+
+
+class FanOut:
+    """Copy frames from *source* into one bounded ring per subscriber."""
+
+    def __init__(self, source: FrameRing, *, sample_interval_s: float = 1.0) -> None:
+        self._source = source
+        self._subs: dict[str, _Subscriber] = {}
+        self._sample_interval_s = sample_interval_s
+        self._task: asyncio.Task[None] | None = None
+        self._sampler: asyncio.Task[None] | None = None
+
+    def subscribe(
+        self,
+        name: str,
+        *,
+        maxsize: int = 500,
+        policy: PolicyName = "drop_oldest",
+        alert_interval_s: float = 60.0,
+    ) -> FrameRing:
+        """Register *name* and return the ring it should consume."""
+        if name in self._subs:
+            raise ValueError(f"Subscriber {name!r} already exists")
+        if policy == "flow_control":
+            raise ValueError("flow_control would let one subscriber stall the others")
+        ring = FrameRing(maxsize)
+        overflow = OverflowPolicy(
+            ring,
+            policy,
+            name=f"proxy subscriber {name}",
+            alert_interval_s=alert_interval_s,
+        )
+        self._subs[name] = _Subscriber(name, ring, overflow)
+        return ring
+
+    def unsubscribe(self, name: str) -> None:
+        sub = self._subs.pop(name, None)
+        if sub is not None:
+            sub.policy.close()
+
+    def policy(self, name: str) -> OverflowPolicy | None:
+        """Return the overflow policy feeding *name*'s ring, for frames routed to it alone."""
+        sub = self._subs.get(name)
+        return sub.policy if sub is not None else None
+
+    def lag(self) -> list[SubscriberLag]:
+        now = time.monotonic()
+        return [sub.lag(now) for sub in self._subs.values()]
+
+    def sample(self) -> None:
+        """Publish every subscriber's lag and new drops to Prometheus."""
+        now = time.monotonic()
+        for sub in self._subs.values():
+            lag = sub.lag(now)
+            record_subscriber_lag(sub.name, lag.queued, lag.lag_s, lag.dropped - sub._reported)
+            sub._reported = lag.dropped
+
+    # ------------------------------------------------------------------+
+    # Lifecycle                                                         |
+    # ------------------------------------------------------------------+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="proxy-fanout")
+            self._sampler = asyncio.create_task(self._sample_loop(), name="proxy-fanout-lag")
+
+    async def stop(self) -> None:
+        for task in (self._task, self._sampler):
+            if task is not None:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        self._task = self._sampler = None
+        for sub in self._subs.values():
+            sub.policy.close()
+
+    async def _run(self) -> None:
+        source = self._source
+        while True:
+            batch = await source.get_batch(_BATCH_MAX)
+            for sub in self._subs.values():
+                ring = sub.ring
+                for direction, ts, payload in batch:
+                    if not ring.full():
+                        ring.put_nowait(direction, payload, ts)
+                    else:  # never suspends: flow_control is refused in subscribe()
+                        await sub.policy.offer(direction, payload, ts)
+
+    async def _sample_loop(self) -> None:
+        while True:
+            self.sample()
+            await asyncio.sleep(self._sample_interval_s)
@@ -0,0 +1,218 @@
+"""Live WebSocket connections seen by the proxy.
+
+mitmproxy's ``ctx.master.state.flows`` is the whole flow history – every
+HTTP request and every closed WebSocket since start-up.  :class:`FlowIndex`
+holds only the *open* WebSocket flows, maintained from the add-on's
+``websocket_start`` / ``websocket_end`` hooks, so its size tracks live
+connections rather than proxy uptime.
+
+Each connection gets a small integer ID (``conn_id``) that outbound frames
+use as their target, see :data:`~bot.netproxy.frames.Outbound`.
+
+:class:`FlowTable` keeps per-connection traffic statistics – frames and
+bytes per direction, a log₂ frame-size histogram and inter-arrival jitter –
+updated in O(1) per frame, so one hot connection saturating the pipeline
+stands out in ``/proxy status`` and the ``proxy_flow_*`` metrics.
+"""
+
+from __future__ import annotations
+
+import time
+from array import array
+from collections.abc import Iterator
+from itertools import count
+from typing import TYPE_CHECKING
+
+from bot.core.telemetry import forget_flow, record_flow
+
+if TYPE_CHECKING:  # mitmproxy type stubs are incomplete
+    from mitmproxy.http import HTTPFlow
+
+__all__ = ["FlowIndex", "FlowStats", "FlowTable"]
+
+_SIZE_BUCKETS = 18  # bucket i holds sizes of bit_length i; the last one is open-ended
+
+
+class FlowStats:
+    """Traffic counters of one WebSocket connection."""
+
+    __slots__ = (
+        "conn_id",
+        "host",
+        "opened",
+        "frames",
+        "bytes",
+        "sizes",
+        "jitter",
+        "exported",
+        "_last_ts",
+        "_last_gap",
+    )
+
+    def __init__(self, conn_id: int, host: str) -> None:
+        self.conn_id = conn_id
+        self.host = host
+        self.opened = time.time()
+        self.frames = [0, 0]  # indexed by TX / RX
+        self.bytes = [0, 0]
+        self.sizes = array("I", bytes(4 * _SIZE_BUCKETS))
+        self.jitter = 0.0  # smoothed |Δ inter-arrival gap| in seconds (RFC 3550 style)
+        self.exported = False  # published by FlowTable.sample()
+        self._last_ts = 0.0
+        self._last_gap = -1.0
+
+    def add(self, direction: int, size: int, ts: float) -> None:
+        self.frames[direction] += 1
+        self.bytes[direction] += size
+        self.sizes[min(size.bit_length(), _SIZE_BUCKETS - 1)] += 1
+        if self._last_ts:
+            gap = ts - self._last_ts
+            if self._last_gap >= 0:
+                self.jitter += (abs(gap - self._last_gap) - self.jitter) / 16
+            self._last_gap = gap
+        self._last_ts = ts
+
+    def size_quantile(self, q: float) -> int:
+        """Upper bound in bytes of the size bucket holding quantile *q*.
+
+        Frames of 64 KiB and more share the last bucket and report 128 KiB − 1.
+        """
+        seen, target = 0, q * sum(self.sizes)
+        for i, n in enumerate(self.sizes):
+            seen += n
+            if n and seen >= target:
+                return (1 << i) - 1
+        return 0
+
+    def summary(self) -> str:
+        tx, rx = self.frames
+        age = time.time() - self.opened
+        return (
+            f"#{self.conn_id} {self.host} {age:.0f}s · "
+            f"TX {tx} / {_human(self.bytes[0])} · RX {rx} / {_human(self.bytes[1])} · "
+            f"p50 ≤{self.size_quantile(0.5)}B p99 ≤{self.size_quantile(0.99)}B · "
+            f"jitter {self.jitter * 1000:.1f}ms"
+        )
+
+
+def _human(n: int) -> str:
+    size = float(n)
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GB"
+
+
+class FlowTable:
+    """Live :class:`FlowStats` by conn_id, exported to Prometheus on demand."""
+
+    def __init__(self) -> None:
+        self._stats: dict[int, FlowStats] = {}
+        self._closed: list[FlowStats] = []  # closed but still exported, until sample()
+
+    def open(self, conn_id: int, host: str) -> FlowStats:
+        stats = self._stats.get(conn_id)
+        if stats is None:
+            stats = self._stats[conn_id] = FlowStats(conn_id, host)
+        return stats
+
+    def frame(
+        self, conn_id: int, direction: int, size: int, ts: float | None = None
+    ) -> FlowStats | None:
+        """Count one frame; return the connection's stats, ``None`` if it is not open."""
+        stats = self._stats.get(conn_id)
+        if stats is not None:
+            stats.add(direction, size, time.monotonic() if ts is None else ts)
+        return stats
+
+    def close(self, conn_id: int) -> None:
+        stats = self._stats.pop(conn_id, None)
+        if stats is not None and stats.exported:
+            self._closed.append(stats)
+
+    def get(self, conn_id: int) -> FlowStats | None:
+        return self._stats.get(conn_id)
+
+    def top(self, n: int = 5) -> list[FlowStats]:
+        """Return the *n* open connections that moved the most bytes."""
+        ranked = sorted(self._stats.values(), key=lambda s: s.bytes[0] + s.bytes[1], reverse=True)
+        return ranked[:n]
+
+    def sample(self) -> None:
+        """Publish open connections' counters; drop closed ones from the exporter."""
+        for stats in self._closed:
+            forget_flow(str(stats.conn_id), stats.host)
+        self._closed.clear()
+        for stats in self._stats.values():
+            record_flow(str(stats.conn_id), stats.host, stats.frames, stats.bytes, stats.jitter)
+            stats.exported = True
+
+    def clear(self) -> None:
+        for conn_id in list(self._stats):
+            self.close(conn_id)
+
+    def __len__(self) -> int:
+        return len(self._stats)
+
+
+class FlowIndex:
+    """Open WebSocket flows keyed by connection ID and by host."""
+
+    def __init__(self, table: FlowTable | None = None) -> None:
+        self.table = table if table is not None else FlowTable()
+        self._ids = count(1)
+        self._flows: dict[int, HTTPFlow] = {}
+        self._conn_ids: dict[str, int] = {}  # mitmproxy flow.id → conn_id
+        self._hosts: dict[str, dict[int, None]] = {}  # host → conn_ids, oldest first
+
+    def open(self, flow: HTTPFlow) -> int:
+        """Register *flow*; idempotent for a flow that is already open."""
+        conn_id = self._conn_ids.get(flow.id)
+        if conn_id is not None:
+            return conn_id
+        conn_id = next(self._ids)
+        self._flows[conn_id] = flow
+        self._conn_ids[flow.id] = conn_id
+        self._hosts.setdefault(flow.request.pretty_host, {})[conn_id] = None
+        self.table.open(conn_id, flow.request.pretty_host)
+        return conn_id
+
+    def close(self, flow: HTTPFlow) -> int | None:
+        """Forget *flow*; return its conn_id, or ``None`` if it was not open."""
+        conn_id = self._conn_ids.pop(flow.id, None)
+        if conn_id is None:
+            return None
+        del self._flows[conn_id]
+        self.table.close(conn_id)
+        host = flow.request.pretty_host
+        ids = self._hosts[host]
+        del ids[conn_id]
+        if not ids:
+            del self._hosts[host]
+        return conn_id
+
+    def get(self, conn_id: int) -> HTTPFlow | None:
+        return self._flows.get(conn_id)
+
+    def conn_id(self, flow: HTTPFlow) -> int | None:
+        return self._conn_ids.get(flow.id)
+
+    def for_host(self, host: str) -> list[int]:
+        """Return the open conn_ids to *host*, oldest first."""
+        return list(self._hosts.get(host, ()))
+
+    def hosts(self) -> list[str]:
+        return list(self._hosts)
+
+    def clear(self) -> None:
+        self.table.clear()
+        self._flows.clear()
+        self._conn_ids.clear()
+        self._hosts.clear()
+
+    def __len__(self) -> int:
+        return len(self._flows)
+
+    def __iter__(self) -> Iterator[tuple[int, HTTPFlow]]:
+        return iter(list(self._flows.items()))
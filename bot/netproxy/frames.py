@@ -0,0 +1,175 @@
+"""Compact frame transport between the proxy add-on and game engines.
+
+:class:`FrameRing` replaces an ``asyncio.Queue[tuple[str, bytes]]`` on the hot
+path.  Slots are preallocated once: directions live in a byte array,
+timestamps in a double array and payloads as :class:`memoryview` references
+to the bytes mitmproxy already holds, so queuing a frame copies nothing and
+allocates no label string.  Consumers drain it in batches with
+:meth:`FrameRing.get_batch`.
+
+The ring is *single-consumer*: one task awaits it at a time; any number of
+producers may wait for room in :meth:`FrameRing.put`.  It never touches
+Prometheus itself – gauges are sampled on an interval instead, see
+:func:`bot.utils.queue_helpers.sample_gauges`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from array import array
+from collections import deque
+
+__all__ = ["DIRECTIONS", "RX", "TX", "Frame", "FrameRing", "Outbound"]
+
+TX = 0  # client → server
+RX = 1  # server → client
+DIRECTIONS = ("TX", "RX")  # code → label, for logs and metrics
+
+Frame = tuple[int, float, memoryview]  # (direction, monotonic timestamp, payload)
+# Crafted frame for ``ProxyService.out_q``: (target conn_id or None = every open
+# connection, payload); conn_ids come from :class:`bot.netproxy.flows.FlowIndex`.
+Outbound = tuple[int | None, bytes]
+
+
+class FrameRing:
+    """Bounded FIFO of frames backed by preallocated parallel arrays."""
+
+    __slots__ = (
+        "_maxsize",
+        "_dirs",
+        "_ts",
+        "_payloads",
+        "_head",
+        "_size",
+        "_waiter",
+        "_putters",
+    )
+
+    def __init__(self, maxsize: int) -> None:
+        if maxsize <= 0:
+            raise ValueError("FrameRing needs a positive maxsize")
+        self._maxsize = maxsize
+        self._dirs = array("B", bytes(maxsize))
+        self._ts = array("d", [0.0]) * maxsize
+        self._payloads: list[memoryview | None] = [None] * maxsize
+        self._head = 0  # slot of the oldest frame
+        self._size = 0
+        self._waiter: asyncio.Future[None] | None = None  # the consumer
+        self._putters: deque[asyncio.Future[None]] = deque()  # producers waiting for room
+
+    # ------------------------------------------------------------------+
+    # asyncio.Queue-compatible surface                                  |
+    # ------------------------------------------------------------------+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    def qsize(self) -> int:
+        return self._size
+
+    def empty(self) -> bool:
+        return not self._size
+
+    def full(self) -> bool:
+        return self._size == self._maxsize
+
+    def put_nowait(
+        self, direction: int, payload: bytes | memoryview, ts: float | None = None
+    ) -> None:
+        """Append one frame; raise :class:`asyncio.QueueFull` when the ring is full."""
+        if self._size == self._maxsize:
+            raise asyncio.QueueFull
+        i = (self._head + self._size) % self._maxsize
+        self._dirs[i] = direction
+        self._ts[i] = time.monotonic() if ts is None else ts
+        self._payloads[i] = payload if isinstance(payload, memoryview) else memoryview(payload)
+        self._size += 1
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    async def put(
+        self, direction: int, payload: bytes | memoryview, ts: float | None = None
+    ) -> None:
+        """Append one frame, waiting while the ring is full."""
+        while self._size == self._maxsize:
+            putter = asyncio.get_running_loop().create_future()
+            self._putters.append(putter)
+            try:
+                await putter
+            except asyncio.CancelledError:
+                if putter.done() and not putter.cancelled():
+                    self._wake_putter()  # pass the slot we were given on
+                raise
+        self.put_nowait(direction, payload, ts)
+
+    def coalesce(
+        self, direction: int, payload: bytes | memoryview, ts: float | None = None
+    ) -> bool:
+        """Overwrite the newest queued frame of the same direction and type.
+
+        The message type is the payload's first byte (the opcode).  Returns
+        ``False`` when no such frame is queued.
+        """
+        if not payload:
+            return False
+        key = payload[0]
+        for k in range(self._size - 1, -1, -1):
+            i = (self._head + k) % self._maxsize
+            old = self._payloads[i]
+            if self._dirs[i] == direction and old and old[0] == key:
+                self._payloads[i] = (
+                    payload if isinstance(payload, memoryview) else memoryview(payload)
+                )
+                self._ts[i] = time.monotonic() if ts is None else ts
+                return True
+        return False
+
+    def oldest_ts(self) -> float | None:
+        """Timestamp of the frame that would be popped next, if any."""
+        return self._ts[self._head] if self._size else None
+
+    def get_nowait(self) -> Frame:
+        """Pop the oldest frame; raise :class:`asyncio.QueueEmpty` when empty."""
+        if not self._size:
+            raise asyncio.QueueEmpty
+        return self._pop()
+
+    async def get(self) -> Frame:
+        await self._wait()
+        return self._pop()
+
+    async def get_batch(self, limit: int) -> list[Frame]:
+        """Wait for at least one frame, then pop up to *limit* in FIFO order."""
+        await self._wait()
+        return [self._pop() for _ in range(min(limit, self._size))]
+
+    # ------------------------------------------------------------------+
+    # Internals                                                         |
+    # ------------------------------------------------------------------+
+    async def _wait(self) -> None:
+        while not self._size:
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+
+    def _pop(self) -> Frame:
+        i = self._head
+        payload = self._payloads[i]
+        assert payload is not None  # slot is occupied while _size > 0
+        self._payloads[i] = None  # release mitmproxy's buffer
+        self._head = (i + 1) % self._maxsize
+        self._size -= 1
+        if self._putters:
+            self._wake_putter()
+        return self._dirs[i], self._ts[i], payload
+
+    def _wake_putter(self) -> None:
+        while self._putters:
+            putter = self._putters.popleft()
+            if not putter.done():
+                putter.set_result(None)
+                return
@@ -0,0 +1,118 @@
+"""Overflow policies for the proxy's inbound frame ring.
+
+When engines fall behind, the :class:`~bot.netproxy.frames.FrameRing` between
+the mitmproxy add-on and the engines fills up.  :class:`OverflowPolicy`
+decides what happens to the next frame:
+
+``drop_newest``
+    Discard the incoming frame (the historical behaviour).
+``drop_oldest``
+    Evict the oldest queued frame to make room – engines see the freshest
+    traffic.
+``coalesce``
+    Overwrite the newest queued frame of the same direction and message type
+    (first payload byte); falls back to ``drop_newest`` when there is none.
+    Suits state updates where only the latest one matters.
+``flow_control``
+    Hold the mitmproxy hook until the ring has room, for at most *wait_s*.
+    mitmproxy stops reading from that client meanwhile, so TCP backpressure
+    slows the client down instead of losing data; drops only on timeout.
+
+Every discarded frame is counted in ``proxy_frames_dropped_total`` and
+summarised in at most one owner alert per *alert_interval_s*.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Literal, get_args
+
+from bot.core import alerts
+from bot.core.telemetry import record_frame_drop
+
+from .frames import DIRECTIONS, FrameRing
+
+__all__ = ["POLICIES", "OverflowPolicy", "PolicyName"]
+
+PolicyName = Literal["drop_newest", "drop_oldest", "coalesce", "flow_control"]
+POLICIES: tuple[str, ...] = get_args(PolicyName)
+
+
+class OverflowPolicy:
+    """Put frames into a :class:`FrameRing`, applying *policy* when it is full."""
+
+    def __init__(
+        self,
+        ring: FrameRing,
+        policy: PolicyName = "drop_newest",
+        *,
+        name: str = "proxy_in",
+        wait_s: float = 0.25,
+        alert_interval_s: float = 60.0,
+    ) -> None:
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown overflow policy {policy!r}; expected one of {POLICIES}")
+        self.ring = ring
+        self.policy = policy
+        self.name = name
+        self._wait_s = wait_s
+        self._alert_interval_s = alert_interval_s
+        self._pending = [0, 0]  # drops per direction since the last alert
+        self._alert_handle: asyncio.TimerHandle | None = None
+        self.dropped = 0
+
+    async def offer(
+        self, direction: int, payload: bytes | memoryview, ts: float | None = None
+    ) -> bool:
+        """Queue one frame; return ``False`` when *this* frame was discarded."""
+        ring = self.ring
+        if not ring.full():
+            ring.put_nowait(direction, payload, ts)
+            return True
+
+        policy = self.policy
+        if policy == "drop_oldest":
+            evicted, _ts, _payload = ring.get_nowait()
+            ring.put_nowait(direction, payload, ts)
+            self._drop(evicted)
+            return True
+        if policy == "coalesce":
+            if ring.coalesce(direction, payload, ts):
+                self._drop(direction)
+                return True
+        elif policy == "flow_control":
+            try:
+                async with asyncio.timeout(self._wait_s):
+                    await ring.put(direction, payload, ts)
+                return True
+            except TimeoutError:
+                pass
+        self._drop(direction)
+        return False
+
+    # ------------------------------------------------------------------+
+    # Accounting                                                        |
+    # ------------------------------------------------------------------+
+    def _drop(self, direction: int) -> None:
+        self.dropped += 1
+        self._pending[direction] += 1
+        record_frame_drop(self.policy, DIRECTIONS[direction])
+        if self._alert_handle is None:
+            loop = asyncio.get_running_loop()
+            self._alert_handle = loop.call_later(self._alert_interval_s, self._flush_alert)
+
+    def _flush_alert(self) -> None:
+        self._alert_handle = None
+        tx, rx = self._pending
+        self._pending = [0, 0]
+        if tx or rx:
+            alerts.alert(
+                f"⚠️ {self.name} overflow ({self.policy}): dropped {tx + rx} frames "
+                f"in the last {self._alert_interval_s:g}s (TX {tx}, RX {rx})"
+            )
+
+    def close(self) -> None:
+        """Cancel a pending summary alert."""
+        if self._alert_handle is not None:
+            self._alert_handle.cancel()
+            self._alert_handle = None
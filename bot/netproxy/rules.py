@@ -0,0 +1,227 @@
+"""Declarative ingress rules for proxied WebSocket frames.
+
+Without rules every binary frame is queued for the engines, including
+high-frequency heartbeats nobody reads.  ``settings.proxy_rules`` lists
+:class:`~bot.core.settings.ProxyRule` entries, each matching on direction,
+host, opcode (first payload byte) and a payload prefix; the first match
+decides what happens to the frame before it reaches ``in_q``:
+
+``drop``
+    Discard it.
+``sample``
+    Keep one frame in *every*, counted per rule.
+``route``
+    Deliver it to one :class:`~bot.netproxy.fanout.FanOut` subscriber only,
+    bypassing the shared queue.  ``sample`` may name a subscriber too.
+
+Frames no rule matches are queued as usual.
+
+:class:`RuleSet` compiles the list once into a table indexed by direction
+and opcode, so a frame is only checked against the rules that can match
+its first byte, and an empty rule list costs one identity check.
+Reassigning ``settings.proxy_rules`` recompiles on the next frame; an
+invalid list is logged and the previous rules stay in force.
+:meth:`RuleSet.reload_from_env` (``/proxy rules reload``) re-reads
+``PROXY_RULES`` from the environment and ``.env`` at runtime and does that
+reassignment.
+
+Routed frames skip ``in_q``, so they may reach their subscriber ahead of
+broadcast frames still queued there.  A route to a subscriber that does not
+exist – with a single engine there are no subscribers – queues the frame
+normally.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import logging
+import operator
+import re
+from collections.abc import Callable, Sequence
+from functools import partial
+from typing import Any
+
+from pydantic import ValidationError
+from pydantic_settings import BaseSettings
+
+from bot.core.settings import ProxyRule, settings
+from bot.core.telemetry import record_rule_hits
+
+from .frames import DIRECTIONS
+from .overflow import OverflowPolicy
+
+__all__ = ["RuleSet"]
+
+logger = logging.getLogger(__name__)
+
+_EMPTY = 256  # opcode slot for zero-length payloads
+_QUEUE = ""  # verdict: queue for every engine; None = drop, else a subscriber name
+
+SubscriberLookup = Callable[[str], OverflowPolicy | None]
+
+
+class _Rule:
+    __slots__ = (
+        "name",
+        "action",
+        "host",
+        "prefix",
+        "every",
+        "subscriber",
+        "hits",
+        "reported",
+        "seen",
+    )
+
+    def __init__(self, index: int, spec: ProxyRule) -> None:
+        self.name = spec.name or f"rule{index}"
+        self.action = spec.action
+        self.host = _host_matcher(spec.host)
+        self.prefix = bytes.fromhex(spec.prefix)
+        self.every = spec.every
+        self.subscriber = spec.subscriber or _QUEUE
+        self.hits = 0  # matched frames
+        self.reported = 0  # hits already published by RuleSet.sample()
+        self.seen = 0  # sample counter
+
+    def verdict(self) -> str | None:
+        self.hits += 1
+        if self.action == "drop":
+            return None
+        if self.action == "sample":
+            self.seen += 1
+            if (self.seen - 1) % self.every:
+                return None
+        return self.subscriber
+
+
+def _host_matcher(pattern: str | None) -> Callable[[str], object] | None:
+    if pattern is None:
+        return None
+    pattern = pattern.lower()
+    if any(c in pattern for c in "*?["):
+        return re.compile(fnmatch.translate(pattern)).match
+    return partial(operator.eq, pattern)
+
+
+_Table = list[list[tuple[_Rule, ...]]]  # [direction][opcode or _EMPTY] → rules, in order
+
+
+def _compile(specs: Sequence[ProxyRule | dict[str, Any]]) -> tuple[list[_Rule], _Table]:
+    """Validate *specs* and build the dispatch table; raises ``ValidationError``."""
+    parsed = [ProxyRule.model_validate(spec) for spec in specs]
+    rules = [_Rule(i, spec) for i, spec in enumerate(parsed)]
+    table: _Table = [
+        [
+            tuple(
+                rule
+                for spec, rule in zip(parsed, rules)
+                if spec.direction in (None, label) and _may_match(spec, rule.prefix, slot)
+            )
+            for slot in range(_EMPTY + 1)
+        ]
+        for label in DIRECTIONS
+    ]
+    return rules, table
+
+
+class _RulesEnv(BaseSettings):
+    """Only ``PROXY_RULES``, read from the same sources as :class:`Settings`."""
+
+    proxy_rules: list[ProxyRule] = []
+
+    model_config = {"env_file": ".env", "case_sensitive": False, "extra": "ignore"}
+
+
+def _may_match(spec: ProxyRule, prefix: bytes, slot: int) -> bool:
+    if slot == _EMPTY:
+        return spec.opcode is None and not prefix
+    if spec.opcode is not None and spec.opcode != slot:
+        return False
+    return not prefix or prefix[0] == slot
+
+
+class RuleSet:
+    """``settings.proxy_rules``, compiled and applied to frames before queuing."""
+
+    def __init__(self, subscribers: SubscriberLookup | None = None) -> None:
+        self._subscribers = subscribers
+        self._source: object = None
+        self._table: _Table | None = None
+        self._rules: list[_Rule] = []
+        self.reload()
+
+    def reload(self) -> None:
+        """Recompile ``settings.proxy_rules``; keep the old table if it is invalid."""
+        source = settings.proxy_rules
+        self._source = source
+        try:
+            rules, table = _compile(source)
+        except ValidationError as exc:
+            logger.error("proxy_rules rejected, keeping the previous rules: %s", exc)
+            return
+        self.sample()  # publish the outgoing rules' last hits
+        self._rules = rules
+        self._table = table if rules else None
+        logger.info("proxy_rules: %d rule(s) active", len(self._rules))
+
+    def reload_from_env(self) -> int:
+        """Re-read ``PROXY_RULES`` into ``settings.proxy_rules`` and recompile.
+
+        Returns the number of active rules.  Raises ``ValueError`` (a
+        ``ValidationError`` or malformed JSON) and keeps the current rules
+        when the new value is invalid.
+        """
+        settings.proxy_rules = _RulesEnv().proxy_rules
+        self.reload()
+        return len(self)
+
+    def verdict(self, direction: int, payload: bytes | memoryview, host: str) -> str | None:
+        """``None`` to drop, ``""`` to queue normally, else a subscriber name."""
+        if settings.proxy_rules is not self._source:
+            self.reload()
+        table = self._table
+        if table is None:
+            return _QUEUE
+        for rule in table[direction][payload[0] if payload else _EMPTY]:
+            if rule.host is not None and not rule.host(host):
+                continue
+            if rule.prefix and payload[: len(rule.prefix)] != rule.prefix:
+                continue
+            return rule.verdict()
+        return _QUEUE
+
+    async def offer(
+        self,
+        overflow: OverflowPolicy,
+        direction: int,
+        payload: bytes | memoryview,
+        host: str,
+        ts: float | None = None,
+    ) -> bool:
+        """Apply the rules, then queue through *overflow* or the routed subscriber.
+
+        Returns ``False`` when the frame was filtered out or dropped on overflow.
+        """
+        verdict = self.verdict(direction, payload, host)
+        if verdict is None:
+            return False
+        if verdict and self._subscribers is not None:
+            target = self._subscribers(verdict)
+            if target is not None:
+                return await target.offer(direction, payload, ts)
+        return await overflow.offer(direction, payload, ts)
+
+    def hits(self) -> dict[str, int]:
+        """Frames each active rule matched since it was compiled."""
+        return {rule.name: rule.hits for rule in self._rules}
+
+    def sample(self) -> None:
+        """Publish new rule hits to Prometheus."""
+        for rule in self._rules:
+            if rule.hits > rule.reported:
+                record_rule_hits(rule.name, rule.action, rule.hits - rule.reported)
+                rule.reported = rule.hits
+
+    def __len__(self) -> int:
+        return len(self._rules)
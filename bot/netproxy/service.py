@@ -3,14 +3,24 @@ Generic MITM-TLS proxy service.
 =====================
 Start/stop a TLS-MITM proxy on localhost:*port*.
 
-* `in_q`   – every frame (dir, bytes) → state tracker / logger / AI
-* `out_q`  – crafted frames from AI → server
+* `in_q`   – every frame (dir, timestamp, payload) → state tracker / logger / AI,
+  a :class:`~bot.netproxy.frames.FrameRing`
+* `out_q`  – crafted frames from AI → server, addressed by connection ID
+* `flows`  – the open WebSocket connections those IDs refer to
+
+With more than one engine a :class:`~bot.netproxy.fanout.FanOut` copies
+`in_q` into a bounded queue per engine; a single engine reads `in_q` directly.
+The DI container adds the engines named in ``settings.proxy_engines``
+(see :func:`load_engines`).
+`rules` applies ``settings.proxy_rules`` to every frame before it is queued.
 """
 
 from __future__ import annotations
 
 import asyncio
+import importlib
 import logging
+from collections.abc import Mapping
 from pathlib import Path
 from typing import (
     Any,
@@ -26,7 +36,15 @@ from mitmproxy.tools.dump import DumpMaster
 
 from bot.core.service_base import ServiceABC
 from bot.core.settings import settings
-from bot.utils.queue_helpers import new_pair
+from bot.utils.queue_helpers import sample_gauges
+
+from .bridge import ProxyBridge
+from .capture import CaptureAddon
+from .fanout import FanOut, SubscriberLag
+from .flows import FlowIndex, FlowTable
+from .frames import FrameRing, Outbound
+from .overflow import OverflowPolicy
+from .rules import RuleSet
 
 # Removed: from .addon import WSAddon
 
@@ -50,6 +68,48 @@ class GameEngine(Protocol):
     async def stop(self, *, graceful: bool = True) -> None: ...
 
 
+EngineFactory = Callable[[FrameRing, asyncio.Queue[Outbound]], GameEngine]
+
+
+def load_engines(specs: Mapping[str, str]) -> dict[str, EngineFactory]:
+    """Resolve ``{"name": "module:factory"}`` (``settings.proxy_engines``) to factories."""
+    factories: dict[str, EngineFactory] = {}
+    for name, spec in specs.items():
+        module, sep, attr = spec.partition(":")
+        if name == "engine" or not sep:
+            raise ValueError(f"proxy_engines: bad entry {name!r}: {spec!r}")
+        factories[name] = getattr(importlib.import_module(module), attr)
+    return factories
+
+
+def build_master(port: int, certdir: Path) -> DumpMaster:
+    """Configure a mitmproxy DumpMaster on 127.0.0.1:*port* (needs a running loop)."""
+    opts = options.Options(
+        listen_host="127.0.0.1",
+        listen_port=port,
+        confdir=str(certdir),
+    )
+    # Ignore *all* loop-back traffic so any localhost service bypasses the proxy.
+    LOOPBACK_RE: str = r"^(localhost|127\.0\.0\.1)(:\d+)?$"
+    cast(Any, opts).update(ignore_hosts=[LOOPBACK_RE])
+
+    ProxyConfig: Any | None = getattr(proxy, "ProxyConfig", None)
+    ProxyServer: Any | None = getattr(proxy, "ProxyServer", None)
+    # Disable mitmproxy’s built-in "termlog" and "dumper" handlers to
+    # prevent duplicate log lines once our own logging is configured.
+    # Both flags default to True; overriding keeps proxy functionality but
+    # stops extra StreamHandlers from being attached to the root logger.
+    master = DumpMaster(opts, with_termlog=False, with_dumper=False)
+
+    # mitmproxy <9 needs explicit server objects
+    if ProxyConfig is not None and ProxyServer is not None:
+        pconf = ProxyConfig(opts)
+        # .server is missing in type stubs
+        cast(Any, master).server = ProxyServer(pconf)
+    # mitmproxy 9/10: DumpMaster listens automatically
+    return master
+
+
 class ProxyService(ServiceABC):
     def __init__(
         self,
@@ -57,72 +117,87 @@ class ProxyService(ServiceABC):
         *,
         certdir: Path | None = None,
         addons: list[AddonProtocol] | None = None,
-        engine_factory: Callable[
-            [asyncio.Queue[tuple[str, bytes]], asyncio.Queue[bytes]], GameEngine
-        ]
-        | None = None,
+        engine_factory: EngineFactory | None = None,
+        engines: Mapping[str, EngineFactory] | None = None,
     ):
         self._default_port = port
         self.port = port
         self.certdir = certdir or Path(".mitm_certs")
-        # Centralised helper returns bounded queues sized per settings.queues
-        self.in_q, self.out_q = new_pair("proxy")
+        # Bounded transports sized per settings.queues; their gauges are sampled
+        # by _gauge_task rather than refreshed on every frame.
+        self.in_q = FrameRing(settings.queues.inbound)
+        self.out_q: asyncio.Queue[Outbound] = asyncio.Queue(maxsize=settings.queues.outbound)
+        self.flows = FlowIndex()  # open WebSocket connections, filled by the add-on
+        self._gauge_task: asyncio.Task[None] | None = None
+        self._capture: CaptureAddon | None = None  # settings.proxy_capture_path recorder
+        self._bridge: ProxyBridge | None = None  # mitmproxy off-loop (settings.proxy_mode)
 
         self._dump: DumpMaster | None = None
         self._task: asyncio.Future[None] | None = None
         self._addons: list[AddonProtocol] = addons or []
         # ------------------------------------------------------------------+
-        # Build the game engine                                            +
+        # Build the game engine(s)                                         +
         # ------------------------------------------------------------------+
         if engine_factory is None:
             from bot.infra.tankpit.engine import TankPitEngine
 
             engine_factory = lambda q_in, q_out: TankPitEngine(q_in, q_out)  # noqa: E731
 
-        self._engine: GameEngine = engine_factory(self.in_q, self.out_q)
+        factories: dict[str, EngineFactory] = {"engine": engine_factory, **(engines or {})}
+        self._fanout: FanOut | None = None
+        if len(factories) == 1:
+            self._engines: dict[str, GameEngine] = {"engine": engine_factory(self.in_q, self.out_q)}
+        else:
+            self._fanout = FanOut(self.in_q, sample_interval_s=settings.queues.gauge_interval_sec)
+            self._engines = {
+                name: factory(self._subscribe(self._fanout, name), self.out_q)
+                for name, factory in factories.items()
+            }
+        self.rules = RuleSet(self._route)  # settings.proxy_rules, shared by add-on / bridge
         self._process: asyncio.subprocess.Process | None = None
 
     # ── public API ──────────────────────────────────────────────
     async def start(self) -> None:
-        if self._dump:
+        if self._dump or self._bridge:
             return
         # Always delegate to utils.net – single source of truth
         from bot.utils.net import pick_free_port
 
         self.port = await pick_free_port(self.port)
+        # Ensure the certdir exists
+        self.certdir.mkdir(parents=True, exist_ok=True)
 
-        opts = options.Options(
-            listen_host="127.0.0.1",
-            listen_port=self.port,
-            confdir=str(self.certdir),
-        )
-        # Ignore *all* loop-back traffic so any localhost service bypasses the proxy.
-        LOOPBACK_RE: str = r"^(localhost|127\.0\.0\.1)(:\d+)?$"
-        cast(Any, opts).update(ignore_hosts=[LOOPBACK_RE])
-
-        ProxyConfig: Any | None = getattr(proxy, "ProxyConfig", None)
-        ProxyServer: Any | None = getattr(proxy, "ProxyServer", None)
-        # Disable mitmproxy’s built-in "termlog" and "dumper" handlers to
-        # prevent duplicate log lines once our own logging is configured.
-        # Both flags default to True; overriding keeps proxy functionality but
-        # stops extra StreamHandlers from being attached to the root logger.
-        self._dump = DumpMaster(opts, with_termlog=False, with_dumper=False)
-
-        # mitmproxy <9 needs explicit server objects
-        if ProxyConfig is not None and ProxyServer is not None:
-            pconf = ProxyConfig(opts)
-            # .server is missing in type stubs
-            cast(Any, self._dump).server = ProxyServer(pconf)
-        # mitmproxy 9/10: DumpMaster listens automatically
+        if settings.proxy_mode != "inline":
+            await self._start_engines()
+            self._bridge = ProxyBridge(
+                self.in_q, self.out_q, mode=settings.proxy_mode, rules=self.rules
+            )
+            try:
+                await self._bridge.start(self.port, self.certdir, settings.proxy_capture_path)
+            except Exception:
+                self._bridge = None
+                await self._stop_engines()
+                raise
+            logger.info(
+                f"ProxyService: mitmproxy {settings.proxy_mode} started, "
+                f"listening on http://127.0.0.1:{self.port}"
+            )
+            return
+
+        self._dump = build_master(self.port, self.certdir)
         # wire addons
         for addon in self._addons:
-            instance = addon(self.in_q, self.out_q) if isinstance(addon, type) else addon
+            instance = (
+                addon(self.in_q, self.out_q, flows=self.flows, rules=self.rules)
+                if isinstance(addon, type)
+                else addon
+            )
             self._dump.addons.add(instance)  # type: ignore[no-untyped-call]
-        # Kick-off the game engine
-        await self._engine.start()
+        if settings.proxy_capture_path:
+            self._capture = CaptureAddon(settings.proxy_capture_path)
+            self._dump.addons.add(self._capture)  # type: ignore[no-untyped-call]
+        await self._start_engines()
 
-        # Ensure the certdir exists
-        self.certdir.mkdir(parents=True, exist_ok=True)
         # run mitmproxy in the background
         try:
             self._task = asyncio.create_task(self._dump.run())  # spawn the coroutine
@@ -140,9 +215,17 @@ class ProxyService(ServiceABC):
     # _pick_free_port and _is_port_free are now in bot.utils.net
 
     async def stop(self, *, graceful: bool = True) -> None:
+        if self._bridge is not None:
+            logger.info("ProxyService: Shutting down mitmproxy %s.", settings.proxy_mode)
+            await self._bridge.stop()
+            self._bridge = None
+            self.port = self._default_port
+            await self._stop_engines()
+            return
+
         # Check if proxy was never started – still stop engine if running
         if not self._dump and not self._task:
-            await self._engine.stop()
+            await self._stop_engines()
             return
 
         # Check if proxy is not running but may have been started before
@@ -185,15 +268,63 @@ class ProxyService(ServiceABC):
         self.port = self._default_port
         logger.info("ProxyService: mitmproxy stopped.")
 
-        # Stop game engine
-        try:
-            await self._engine.stop()
-        except Exception as exc:
-            logger.warning("ProxyService: engine stop raised %s", exc)
+        if self._capture is not None:
+            self._capture.close()
+            self._capture = None
+
+        await self._stop_engines()
+
+    async def _start_engines(self) -> None:
+        # Kick-off the game engine(s), then start feeding them
+        for engine in self._engines.values():
+            await engine.start()
+        if self._fanout is not None:
+            await self._fanout.start()
+        self._gauge_task = asyncio.create_task(
+            sample_gauges(
+                {"proxy_in": self.in_q, "proxy_out": self.out_q},
+                settings.queues.gauge_interval_sec,
+                [lambda: self.flow_table.sample(), self.rules.sample],
+            )
+        )
+
+    async def _stop_engines(self) -> None:
+        if self._gauge_task is not None:
+            self._gauge_task.cancel()
+            self._gauge_task = None
+        if self._fanout is not None:
+            await self._fanout.stop()
+        for name, engine in self._engines.items():
+            try:
+                await engine.stop()
+            except Exception as exc:
+                logger.warning("ProxyService: engine %s stop raised %s", name, exc)
+
+    @staticmethod
+    def _subscribe(fanout: FanOut, name: str) -> FrameRing:
+        policy = settings.proxy_subscriber_policies.get(name, settings.proxy_subscriber_policy)
+        return fanout.subscribe(
+            name,
+            maxsize=settings.proxy_subscriber_queue,
+            policy=policy,
+            alert_interval_s=settings.proxy_overflow_alert_sec,
+        )
+
+    def _route(self, name: str) -> OverflowPolicy | None:
+        return self._fanout.policy(name) if self._fanout is not None else None
+
+    @property
+    def flow_table(self) -> FlowTable:
+        """Per-connection traffic stats, wherever mitmproxy runs."""
+        return self._bridge.table if self._bridge is not None else self.flows.table
+
+    def subscribers(self) -> list[SubscriberLag]:
+        """Per-engine backlog when the frame stream is fanned out, else ``[]``."""
+        return self._fanout.lag() if self._fanout is not None else []
 
     # convenience helper for unit tests
     def is_running(self) -> bool:
-        return self._dump is not None
+        return self._dump is not None or self._bridge is not None
 
     # ------------------------------------------------------------------+
     # Human-readable status string                                      |
@@ -206,15 +337,18 @@ class ProxyService(ServiceABC):
         • state (running / stopped)
         • bind address
         • queue sizes – tells the user if frames are piling up
+        • open WebSocket connections
         """
         if not self.is_running():
             return "stopped"
 
         in_q_len: int = self.in_q.qsize()
         out_q_len: int = self.out_q.qsize()
+        open_ws = len(self.flow_table)
         return (
             f"running on http://127.0.0.1:{self.port} — "
-            f"{in_q_len} inbound / {out_q_len} outbound frames queued"
+            f"{in_q_len} inbound / {out_q_len} outbound frames queued, "
+            f"{open_ws} open WebSocket(s)"
         )
 
     async def aclose(self) -> None:
@@ -3,11 +3,15 @@
 This add-on is responsible for two things:
 
 1.  Push every binary WebSocket frame that traverses the proxy into an
-    *inbound* queue so that game-specific engines, loggers or AIs can process
-    them in an asyncio context.
-2.  Pull crafted frames from an *outbound* queue and inject them into *all*
-    open WebSocket connections so they are forwarded upstream to the game
-    server.
+    *inbound* :class:`~bot.netproxy.frames.FrameRing` so that game-specific
+    engines, loggers or AIs can process them in an asyncio context.  A full
+    ring is handled by the configured
+    :class:`~bot.netproxy.overflow.OverflowPolicy`; ``settings.proxy_rules``
+    may drop, sample or route frames first, see :mod:`bot.netproxy.rules`.
+2.  Pull crafted ``(conn_id, payload)`` frames from an *outbound* queue and
+    inject them into that connection – or every open one when ``conn_id`` is
+    ``None`` – so they are forwarded upstream to the game server.  Open
+    connections are tracked in a :class:`~bot.netproxy.flows.FlowIndex`.
 
 The implementation purposefully contains *no* game-specific logic; it only
 concerns itself with frame transport so that any engine can be attached by
@@ -17,9 +21,17 @@ wiring the same pair of queues.
 from __future__ import annotations
 
 import asyncio
+import logging
 from typing import TYPE_CHECKING
 
-from mitmproxy import ctx, websocket
+from mitmproxy import websocket
+
+from bot.core.settings import settings
+
+from .flows import FlowIndex
+from .frames import RX, TX, FrameRing, Outbound
+from .overflow import OverflowPolicy
+from .rules import RuleSet
 
 # Binary opcode constant – works even if stubs lack the Opcode enum
 try:
@@ -30,50 +42,91 @@ except AttributeError:  # fallback for missing stubs
 if TYPE_CHECKING:  # mitmproxy type stubs are incomplete
     from mitmproxy.http import HTTPFlow
 
+logger = logging.getLogger(__name__)
+
 
 class GenericWSAddon:
     """A generic MITM-proxy WebSocket dispatcher."""
 
     def __init__(
         self,
-        inbound: asyncio.Queue[tuple[str, bytes]],
-        outbound: asyncio.Queue[bytes],
+        inbound: FrameRing,
+        outbound: asyncio.Queue[Outbound],
+        *,
+        flows: FlowIndex | None = None,
+        rules: RuleSet | None = None,
     ) -> None:
         self._in = inbound
         self._out = outbound
+        self.flows = flows if flows is not None else FlowIndex()
+        self._rules = rules if rules is not None else RuleSet()
+        self._overflow = OverflowPolicy(
+            inbound,
+            settings.proxy_overflow_policy,
+            wait_s=settings.proxy_flow_control_ms / 1000,
+            alert_interval_s=settings.proxy_overflow_alert_sec,
+        )
 
     # ------------------------------------------------------------------+
     # mitmproxy hooks                                                   +
     # ------------------------------------------------------------------+
+    def websocket_start(self, flow: HTTPFlow) -> None:
+        conn_id = self.flows.open(flow)
+        logger.debug("WebSocket #%d opened to %s", conn_id, flow.request.pretty_host)
+
+    def websocket_end(self, flow: HTTPFlow) -> None:
+        conn_id = self.flows.close(flow)
+        if conn_id is not None:
+            logger.debug("WebSocket #%d to %s closed", conn_id, flow.request.pretty_host)
+
     async def websocket_message(self, flow: HTTPFlow) -> None:
         """Handle an individual WebSocket message captured by mitmproxy."""
         if not flow.websocket:
             return
         msg = flow.websocket.messages[-1]
-        direction = "TX" if msg.from_client else "RX"
-        try:
-            # Fast-path; if the queue is full we emit an alert but continue.
-            self._in.put_nowait((direction, msg.content))
-        except asyncio.QueueFull:
-            from bot.core import alerts
+        direction = TX if msg.from_client else RX
+        conn_id = self.flows.conn_id(flow)
+        stats = None
+        if conn_id is not None:
+            stats = self.flows.table.frame(conn_id, direction, len(msg.content))
+        host = stats.host if stats is not None else ""
+        # Non-blocking unless the ring is full *and* the policy is flow_control.
+        await self._rules.offer(self._overflow, direction, msg.content, host)
 
-            alerts.alert("Proxy inbound queue overflow – dropping frame")
+    def done(self) -> None:  # noqa: D401 – mitmproxy naming convention
+        """Drop a pending overflow summary and the flow index on shutdown."""
+        self._overflow.close()
+        self.flows.clear()
 
     async def running(self) -> None:  # noqa: D401 – mitmproxy naming convention
         """Background task that flushes the outbound queue."""
         while True:
-            data = await self._out.get()
+            conn_id, data = await self._out.get()
             try:
-                # Iterate over *all* open WS connections and inject the frame
-                for f in ctx.master.state.flows:  # type: ignore[attr-defined]
-                    if f.websocket and not f.websocket.closed:
-                        new_msg = websocket.WebSocketMessage(
-                            OP_BINARY,
-                            True,  # from_client
-                            data,
-                        )
-                        f.websocket.messages.append(new_msg)
-                        # mitmproxy >= 10 only exposes send_message()
-                        f.websocket.send_message(new_msg)
+                send_outbound(self.flows, conn_id, data)
             finally:
                 self._out.task_done()
+
+
+def send_outbound(flows: FlowIndex, conn_id: int | None, data: bytes) -> None:
+    """Inject *data* into connection *conn_id*, or every open one for ``None``."""
+    if conn_id is None:
+        for _conn_id, live in flows:
+            _inject(live, data)
+    elif (target := flows.get(conn_id)) is not None:
+        _inject(target, data)
+    else:
+        logger.debug("Outbound frame for closed WebSocket #%d dropped", conn_id)
+
+
+def _inject(flow: HTTPFlow, data: bytes) -> None:
+    if not flow.websocket or flow.websocket.closed:  # type: ignore[attr-defined]
+        return
+    new_msg = websocket.WebSocketMessage(
+        OP_BINARY,
+        True,  # from_client
+        data,
+    )
+    flow.websocket.messages.append(new_msg)
+    # mitmproxy >= 10 only exposes send_message()
+    flow.websocket.send_message(new_msg)  # type: ignore[attr-defined]
@@ -23,6 +23,8 @@ class ProxyCog(
 
         self.svc: ProxyService = self.container.proxy_service()
 
+    rules = app_commands.Group(name="rules", description="Manage the frame ingress rules")
+
     @app_commands.command(name="start", description="Start the proxy")
     async def start(self, interaction: discord.Interaction) -> None:
         await safe_defer(interaction, thinking=True, ephemeral=True)
@@ -40,12 +42,30 @@ class ProxyCog(
     async def status(self, interaction: discord.Interaction) -> None:
         await safe_defer(interaction, thinking=True, ephemeral=True)
         desc: str = self.svc.describe()
-        await safe_send(
-            interaction,
-            f"{desc}\n"
+        lines = [
+            desc,
             f"📥 in-queue {self.svc.in_q.qsize()}/{self.svc.in_q.maxsize}  "
             f"📤 out-queue {self.svc.out_q.qsize()}/{self.svc.out_q.maxsize}",
-        )
+        ]
+        lines += [
+            f"🔀 {sub.name} {sub.queued}/{sub.maxsize}, {sub.lag_s:.2f}s behind, "
+            f"{sub.dropped} dropped"
+            for sub in self.svc.subscribers()
+        ]
+        lines += [f"🔌 {stats.summary()}" for stats in self.svc.flow_table.top(3)]
+        if hits := self.svc.rules.hits():
+            lines.append("🧹 rules " + ", ".join(f"{name} {n}" for name, n in hits.items()))
+        await safe_send(interaction, "\n".join(lines))
+
+    @rules.command(name="reload", description="Re-read PROXY_RULES and apply it")
+    async def reload_rules(self, interaction: discord.Interaction) -> None:
+        await safe_defer(interaction, thinking=True, ephemeral=True)
+        try:
+            count = self.svc.rules.reload_from_env()
+        except ValueError as exc:
+            await safe_send(interaction, f"❌ PROXY_RULES rejected, current rules kept:\n{exc}")
+            return
+        await safe_send(interaction, f"🧹 {count} proxy rule(s) active.")
 
 
 async def setup(bot: commands.Bot) -> None:
@@ -1,18 +1,21 @@
 from __future__ import annotations
 
 import asyncio
+import io
 import logging
 import time
-from pathlib import Path
+from typing import Literal
 
 import discord
 from discord import app_commands
 from discord.ext import commands
 from discord.ext.commands import Bot
+from playwright.async_api import FloatRect
 
+from bot.browser import tracing
 from bot.browser.runtime import BrowserRuntime
 from bot.plugins.commands.decorators import background_app_command
-from bot.utils.discord_interactions import safe_defer, safe_send
+from bot.utils.discord_interactions import interaction_deadline, safe_defer, safe_send
 from bot.utils.urls import validate_and_normalise_web_url
 
 # Import centralised Discord interaction helpers
@@ -25,6 +28,9 @@ from bot.webapi.decorators import (
 # --- validation helpers for this cog -------------------------------------
 logger = logging.getLogger(__name__)
 
+_DM_UPLOAD_LIMIT = 10 * 1024 * 1024  # Discord's default attachment limit outside guilds
+_PNG_MAGIC = b"\x89PNG"
+
 
 class Web(commands.GroupCog, name="web", description="Control a web browser instance."):
     def __init__(self, bot: Bot) -> None:
@@ -83,30 +89,38 @@ class Web(commands.GroupCog, name="web", description="Control a web browser inst
     # Helper removed - now using @read_only_guard() decorator instead
 
     @app_commands.command(name="screenshot", description="Take a screenshot of the current page.")
-    @app_commands.describe(filename="Optional filename for the screenshot.")
+    @app_commands.describe(
+        filename="Optional filename; .jpg/.jpeg sends a JPEG.",
+        quality="JPEG quality (1-100).",
+        region="Only capture this area: x,y,width,height in CSS pixels.",
+        full_page="Capture the whole scrollable page instead of the viewport.",
+    )
     @browser_command(queued=True, allow_mutation=False)
     async def screenshot(
-        self, interaction: discord.Interaction, filename: str | None = None
+        self,
+        interaction: discord.Interaction,
+        filename: str | None = None,
+        quality: app_commands.Range[int, 1, 100] | None = None,
+        region: str | None = None,
+        full_page: bool = False,
     ) -> CommandResult | None:
         """Take a screenshot of the current browser page."""
         actual_filename = filename or "screenshot.png"
         if not any(actual_filename.endswith(ext) for ext in [".png", ".jpg", ".jpeg"]):
             actual_filename += ".png"  # Default to PNG if no extension
+        image_type: Literal["png", "jpeg"] = "png" if actual_filename.endswith(".png") else "jpeg"
 
-        # Create subfolder for screenshots
-        screenshots_dir = Path("./screenshots")
-        screenshots_dir.mkdir(exist_ok=True)
-
-        # Generate unique filename for storage
-        timestamp = int(time.time())
-        unique_name = f"{timestamp}_{actual_filename}"
-        screenshot_path = screenshots_dir / unique_name
-
-        if screenshot_path.exists():
-            await interaction.response.send_message(
-                f"❌ File already exists: {actual_filename}", ephemeral=True
-            )
-            return None
+        clip: FloatRect | None = None
+        if region:
+            try:
+                x, y, width, height = (float(v) for v in region.split(","))
+            except ValueError:
+                await interaction.response.send_message(
+                    "❌ Invalid region – use x,y,width,height (e.g. 0,0,800,600).",
+                    ephemeral=True,
+                )
+                return None
+            clip = {"x": x, "y": y, "width": width, "height": height}
 
         # Ask the browser to take a screenshot and wait for completion
         chan = interaction.channel_id
@@ -118,36 +132,44 @@ class Web(commands.GroupCog, name="web", description="Control a web browser inst
         if not interaction.response.is_done():
             await safe_defer(interaction, thinking=True, ephemeral=True)
 
+        # Oversized captures are re-encoded by the engine to fit the upload limit.
+        max_bytes = interaction.guild.filesize_limit if interaction.guild else _DM_UPLOAD_LIMIT
+
         async def process_screenshot() -> None:
             try:
                 # Enqueue the screenshot action and wait until the browser worker
-                # signals completion.  *enqueue()* returns a Future that resolves
-                # when the underlying Playwright operation has finished.
-                cmd_future = await self.runtime.enqueue(chan, "screenshot", screenshot_path)
-                await cmd_future  # ensures the file has been written
-                if screenshot_path.exists() and screenshot_path.stat().st_size > 0:
-                    await safe_send(
-                        interaction,
-                        "✔️ Screenshot captured:",
-                        file=discord.File(screenshot_path, filename=actual_filename),
-                    )
+                # signals completion.  *enqueue()* returns a Future resolving to
+                # the encoded image, which is uploaded straight from memory.
+                cmd_future = await self.runtime.enqueue(
+                    chan,
+                    "screenshot",
+                    type=image_type,
+                    quality=quality,
+                    clip=clip,
+                    full_page=full_page,
+                    max_bytes=max_bytes,
+                    deadline=interaction_deadline(interaction),
+                )
+                data: bytes = await cmd_future
+                if not data:
+                    await safe_send(interaction, "❌ Failed to capture screenshot (empty image).")
+                    return
+                if image_type == "png" and data[:4] != _PNG_MAGIC:
+                    # Re-encoded as JPEG to fit the limit – keep the name honest.
+                    actual = actual_filename.rsplit(".", 1)[0] + ".jpg"
                 else:
+                    actual = actual_filename
+                with tracing.span("reply"):
                     await safe_send(
                         interaction,
-                        "❌ Failed to capture screenshot (empty or missing file).",
+                        "✔️ Screenshot captured:",
+                        file=discord.File(io.BytesIO(data), filename=actual),
                     )
             except Exception as e:
                 await safe_send(
                     interaction,
                     f"❌ Error sending screenshot: {e}",
                 )
-            finally:
-                # Clean up temporary file
-                if screenshot_path.exists():
-                    try:
-                        screenshot_path.unlink()
-                    except Exception as e:
-                        logger.error(f"Error deleting screenshot: {e}")
 
         # We should schedule this to run after the browser action completes
         # For now, we'll use asyncio.create_task, but a better implementation could
@@ -174,7 +196,10 @@ class Web(commands.GroupCog, name="web", description="Control a web browser inst
                         # This will trigger the self-healing mechanism if browser is closed
                         # We use a 2-second timeout to avoid blocking if there are issues
                         await asyncio.wait_for(
-                            self.runtime.enqueue(chan, "health_check"), timeout=2.0
+                            self.runtime.enqueue(
+                                chan, "health_check", deadline=time.monotonic() + 2.0
+                            ),
+                            timeout=2.0,
                         )
                     except TimeoutError:
                         # If timeout occurs, continue with other channels
@@ -201,6 +226,13 @@ class Web(commands.GroupCog, name="web", description="Control a web browser inst
                 value=(f"📂 **Queue** {r['queue']}\n{status_emoji}\n"),
                 inline=False,
             )
+        traces = tracing.recent_traces(5)
+        if traces:
+            embed.add_field(
+                name="Recent commands",
+                value="\n".join(f"`{t.summary()}`" for t in traces)[:1024],
+                inline=False,
+            )
         await safe_send(interaction, embed=embed, ephemeral=True)
 
     @app_commands.command(name="close", description="Close the browser for this channel")
@@ -214,6 +246,8 @@ class Web(commands.GroupCog, name="web", description="Control a web browser inst
         # First check if a browser exists for this channel
         rows = [r for r in self.runtime.status() if r["channel"] == chan]
         if not rows:
+            # Reaped or evicted earlier: still drop the session it left on disk.
+            await self.runtime.close_channel(chan, forget_state=True)
             await safe_send(
                 interaction,
                 "No browser running for this channel.",
@@ -223,7 +257,7 @@ class Web(commands.GroupCog, name="web", description="Control a web browser inst
 
         try:
             # Close the browser for this channel
-            await self.runtime.close_channel(chan)
+            await self.runtime.close_channel(chan, forget_state=True)  # logs the session out
             await safe_send(interaction, "✅ Browser closed successfully.", ephemeral=True)
         except Exception as exc:
             await safe_send(
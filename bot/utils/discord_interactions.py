@@ -17,6 +17,8 @@ from __future__ import annotations
 
 import inspect
 import logging
+import time
+from datetime import UTC, datetime, timedelta
 from typing import Any
 
 import discord
@@ -24,6 +26,8 @@ import discord
 from bot.core.settings import DISCORD_LIMIT, settings
 
 __all__ = [
+    "interaction_age",
+    "interaction_deadline",
     "safe_defer",
     "safe_send",
 ]
@@ -145,3 +149,30 @@ async def safe_send(
         await target.send(content or "", **kwargs)
     except Exception:  # pragma: no cover – log and swallow
         logger.exception("Final channel send fallback failed.")
+
+
+# Interaction tokens (and with them every follow-up) expire 15 minutes after
+# the interaction was created.
+INTERACTION_TOKEN_LIFETIME = timedelta(minutes=15)
+
+
+def interaction_age(interaction: discord.Interaction) -> float:
+    """Return seconds since Discord created *interaction* (0.0 when unknown)."""
+    created = getattr(interaction, "created_at", None)
+    if not isinstance(created, datetime):  # test doubles
+        return 0.0
+    return max(0.0, (datetime.now(UTC) - created).total_seconds())
+
+
+def interaction_deadline(interaction: discord.Interaction, *, margin_s: float = 5.0) -> float:
+    """Return the ``time.monotonic()`` by which a result must reach *interaction*.
+
+    Work still running after this point could never be reported back, so the
+    browser runtime uses it as the command deadline.  *margin_s* leaves room
+    for the follow-up itself.
+    """
+    created = getattr(interaction, "created_at", None)
+    if not isinstance(created, datetime):  # test doubles
+        return time.monotonic() + INTERACTION_TOKEN_LIFETIME.total_seconds() - margin_s
+    remaining = (created + INTERACTION_TOKEN_LIFETIME - datetime.now(UTC)).total_seconds()
+    return time.monotonic() + remaining - margin_s
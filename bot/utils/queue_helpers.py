@@ -10,18 +10,21 @@ repetitive code.
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Callable, Mapping, Sequence
 from typing import Any, TypeVar
 
 from bot.core.settings import settings
-from bot.core.telemetry import update_queue_gauge
+from bot.core.telemetry import SupportsQsize, update_queue_gauge
 
 T = TypeVar("T")
 
 __all__ = [
     "put_nowait",
     "get",
+    "get_nowait",
     "task_done",
     "new_pair",
+    "sample_gauges",
 ]
 
 
@@ -38,6 +41,13 @@ async def get(q: asyncio.Queue[T], name: str) -> T:
     return item
 
 
+def get_nowait(q: asyncio.Queue[T], name: str) -> T:  # noqa: UP047 – TypeVar like get()
+    """`q.get_nowait()` and refresh its gauge; raises ``asyncio.QueueEmpty``."""
+    item: T = q.get_nowait()
+    update_queue_gauge(name, q)
+    return item
+
+
 def task_done(q: asyncio.Queue[Any], name: str) -> None:  # noqa: ANN401 – Any fine here
     """Mark one task processed for *q* and refresh its gauge."""
     q.task_done()
@@ -61,3 +71,21 @@ def new_pair(direction: str = "proxy") -> tuple[asyncio.Queue[Any], asyncio.Queu
     update_queue_gauge(f"{direction}_in", in_q)
     update_queue_gauge(f"{direction}_out", out_q)
     return in_q, out_q
+
+
+async def sample_gauges(
+    queues: Mapping[str, SupportsQsize],
+    interval_s: float,
+    samplers: Sequence[Callable[[], None]] = (),
+) -> None:
+    """Export the fill level of *queues* every *interval_s* seconds until cancelled.
+
+    For hot queues where refreshing the gauge on every put/get would cost more
+    than the queue operation itself.  *samplers* are called on the same tick.
+    """
+    while True:
+        for name, q in queues.items():
+            update_queue_gauge(name, q)
+        for sample in samplers:
+            sample()
+        await asyncio.sleep(interval_s)
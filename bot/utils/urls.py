@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from collections.abc import Iterable
-from urllib.parse import urlparse
+from urllib.parse import urlparse, urlunparse
 
 from bot.core.settings import settings
 
@@ -51,6 +51,17 @@ def normalise(url: str) -> str:
     return url
 
 
+def canonical(url: str) -> str:
+    """Return a comparison key for *url*: lower-case scheme/host, no default port."""
+    p = urlparse(url)
+    if p.scheme not in ("http", "https"):
+        return url
+    host = (p.hostname or "").lower()
+    if p.port is not None and p.port != {"http": 80, "https": 443}[p.scheme]:
+        host = f"{host}:{p.port}"
+    return urlunparse((p.scheme.lower(), host, p.path or "/", p.params, p.query, p.fragment))
+
+
 def looks_like_web_url(raw: str) -> bool:
     p = urlparse(normalise(raw))
     host = p.hostname or p.netloc
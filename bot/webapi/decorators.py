@@ -19,8 +19,14 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
+from bot.browser import tracing
 from bot.core.settings import settings
-from bot.utils.discord_interactions import safe_defer, safe_send
+from bot.utils.discord_interactions import (
+    interaction_age,
+    interaction_deadline,
+    safe_defer,
+    safe_send,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -94,21 +100,26 @@ def browser_command(
             if not isinstance(interaction, discord.Interaction):
                 raise TypeError("browser_command expects Interaction as second argument")
 
-            # Execute the underlying handler ***first*** so it can validate inputs
-            # (e.g. URL format) before we show the Discord "thinking" state.
-            result = await func(*args, **kwargs)
-            if result is None:
-                return  # Handler already responded or validation failed.
+            # Stage timings of this command – tasks the handler spawns inherit it.
+            trace = tracing.start_trace(func.__name__, interaction.channel_id)
+            trace.add("interaction", interaction_age(interaction))
 
-            op, op_args, success_msg = result
+            with tracing.span("wrapper"):
+                # Execute the underlying handler ***first*** so it can validate inputs
+                # (e.g. URL format) before we show the Discord "thinking" state.
+                result = await func(*args, **kwargs)
+                if result is None:
+                    return  # Handler already responded or validation failed.
 
-            # ------------------------------------------------------------------
-            # Defer early so the user sees instant feedback
-            # ------------------------------------------------------------------
-            if defer_ephemeral:
-                await safe_defer(interaction, thinking=True, ephemeral=True)
-            else:
-                await safe_defer(interaction, thinking=True)
+                op, op_args, success_msg = result
+
+                # ------------------------------------------------------------------
+                # Defer early so the user sees instant feedback
+                # ------------------------------------------------------------------
+                if defer_ephemeral:
+                    await safe_defer(interaction, thinking=True, ephemeral=True)
+                else:
+                    await safe_defer(interaction, thinking=True)
 
             # ------------------------------------------------------------------
             # Non-queued commands simply return here (handler did the work)
@@ -132,7 +143,9 @@ def browser_command(
                 runtime = getattr(self_obj, "runtime")
                 # Dispatch operation to browser worker. We intentionally do not await the returned
                 # Future/task here; the worker manages execution completion.
-                fut = await runtime.enqueue(chan_id, op, *op_args)
+                fut = await runtime.enqueue(
+                    chan_id, op, *op_args, deadline=interaction_deadline(interaction)
+                )
 
                 # Prevent unhandled-exception noise; log a concise error instead.
                 def _log(f: object) -> None:  # noqa: D401 – callback must be sync
@@ -155,7 +168,8 @@ def browser_command(
                     fut.add_done_callback(_log)
 
                 if success_msg:
-                    await safe_send(interaction, success_msg)
+                    with tracing.span("reply"):
+                        await safe_send(interaction, success_msg)
             except asyncio.QueueFull:
                 await safe_send(
                     interaction,
@@ -3,7 +3,10 @@ Mock objects used in tests.
 These are intentionally separated from production code to avoid accidental imports.
 """
 
+import asyncio
+import base64
 import types
+from collections.abc import Awaitable, Callable
 from typing import Any
 from unittest.mock import AsyncMock
 
@@ -127,3 +130,220 @@ class DummyDump:
 
     def shutdown(self) -> None:  # noqa: D401
         return None
+
+
+# ------------------------------------------------------------------+
+# Playwright fakes – shared by browser tests                        +
+# ------------------------------------------------------------------+
+class _Emitter:
+    """Tiny ``page.on(event, cb)`` implementation for the Playwright fakes."""
+
+    def __init__(self) -> None:
+        self._handlers: dict[str, list[Any]] = {}
+
+    def on(self, event: str, handler: Any) -> None:
+        self._handlers.setdefault(event, []).append(handler)
+
+    def emit(self, event: str, *args: Any) -> None:
+        for handler in self._handlers.get(event, []):
+            handler(*args)
+
+
+class FakeLocator:
+    """Records the actions performed through ``page.locator(selector)``."""
+
+    def __init__(self, page: "FakePage", selector: str) -> None:
+        self._page = page
+        self._selector = selector
+
+    async def click(self, **_kw: Any) -> None:  # noqa: D401
+        self._page.actions.append(("click", self._selector))
+
+    async def fill(self, text: str, **_kw: Any) -> None:  # noqa: D401
+        self._page.actions.append(("fill", self._selector, text))
+
+    async def wait_for(self, **_kw: Any) -> None:  # noqa: D401
+        self._page.actions.append(("wait_for", self._selector))
+
+
+class FakePage(_Emitter):
+    """Minimal stand-in for ``playwright.async_api.Page``."""
+
+    def __init__(self, context: "FakeContext | None" = None) -> None:
+        super().__init__()
+        self.context = context
+        self.url = "about:blank"
+        self.closed = False
+        self.evaluations = 0
+        self.gotos: list[str] = []
+        self.actions: list[tuple[str, ...]] = []
+        self.fail_urls: set[str] = set()  # goto() raises for these
+        self.goto_delay = 0.0  # emulate a slow / hung navigation
+        self.goto_timeouts: list[Any] = []  # timeout= passed to each goto()
+        self.js_heap = 10_000_000  # JSHeapUsedSize reported over CDP
+        self.routes: list[tuple[str, Any]] = []  # (pattern, handler) from route()
+        self.shots: list[dict[str, Any]] = []  # kwargs of every screenshot() call
+        self.cdp_shots: list[dict[str, Any]] = []  # params of Page.captureScreenshot
+        self.png_size = 4_000  # bytes returned for a PNG capture
+
+    async def screenshot(self, **kw: Any) -> bytes:  # noqa: D401
+        # Size model: PNG is fixed, JPEG scales with quality, CSS scale halves it.
+        self.shots.append(kw)
+        if kw.get("type", "png") == "png":
+            return b"\x89PNG" + bytes(self.png_size - 4)
+        size = (kw.get("quality") or 80) * 50 // (2 if kw.get("scale") == "css" else 1)
+        return b"\xff\xd8" + bytes(size - 2)
+
+    async def evaluate(self, _script: str) -> int:  # noqa: D401
+        self.evaluations += 1
+        if self.closed:
+            raise RuntimeError("Target page, context or browser has been closed")
+        return 1
+
+    async def goto(self, url: str, **kw: Any) -> None:  # noqa: D401
+        self.gotos.append(url)
+        self.goto_timeouts.append(kw.get("timeout"))
+        if self.goto_delay:
+            await asyncio.sleep(self.goto_delay)
+        if url in self.fail_urls:
+            raise RuntimeError(f"net::ERR_NAME_NOT_RESOLVED at {url}")
+        self.url = url
+
+    def locator(self, selector: str) -> FakeLocator:
+        return FakeLocator(self, selector)
+
+    async def route(self, pattern: str, handler: Any) -> None:  # noqa: D401
+        self.routes.append((pattern, handler))
+
+    async def close(self) -> None:  # noqa: D401
+        self._close()
+
+    def _close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self.emit("close", self)
+
+
+PageOf = Callable[..., FakePage]  # the ``page_of`` fixture in tests/browser/conftest.py
+Until = Callable[..., Awaitable[None]]  # the ``until`` fixture in tests/proxy/conftest.py
+
+
+class FakeContext(_Emitter):
+    """Minimal stand-in for ``playwright.async_api.BrowserContext``."""
+
+    def __init__(self, browser: "FakeBrowser", **kwargs: Any) -> None:
+        super().__init__()
+        self.browser = browser
+        self.kwargs = kwargs
+        self.pages: list[FakePage] = []
+        self.closed = False
+
+    async def new_page(self) -> FakePage:  # noqa: D401
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+    async def storage_state(self) -> dict[str, Any]:  # noqa: D401
+        return {"cookies": [{"name": "sid", "value": str(id(self))}], "origins": []}
+
+    async def new_cdp_session(self, page: FakePage) -> "FakeCDPSession":  # noqa: D401
+        return FakeCDPSession(page=page)
+
+    async def close(self) -> None:  # noqa: D401
+        self._close()
+
+    def _close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            for page in self.pages:
+                page._close()
+            self.emit("close", self)
+
+
+class FakeCDPSession:
+    """Answers the few CDP methods the memory governor sends."""
+
+    def __init__(self, *, page: FakePage | None = None, renderer_pids: list[int] | None = None):
+        self._page = page
+        self._pids = renderer_pids or []
+
+    async def send(self, method: str, params: Any = None) -> dict[str, Any]:  # noqa: D401
+        if method == "Performance.getMetrics":
+            assert self._page is not None
+            return {"metrics": [{"name": "JSHeapUsedSize", "value": self._page.js_heap}]}
+        if method == "SystemInfo.getProcessInfo":
+            return {"processInfo": [{"id": pid, "type": "renderer"} for pid in self._pids]}
+        if method == "Page.getLayoutMetrics":
+            view = {"pageX": 0, "pageY": 0, "clientWidth": 800, "clientHeight": 600}
+            return {"cssLayoutViewport": view, "cssContentSize": {"width": 800, "height": 2400}}
+        if method == "Page.captureScreenshot":
+            # Same size model as FakePage.screenshot, shrunk by the clip scale squared.
+            assert self._page is not None
+            self._page.cdp_shots.append(params)
+            size = int(params["quality"] * 50 * params["clip"]["scale"] ** 2)
+            data = b"\xff\xd8" + bytes(size - 2)
+            return {"data": base64.b64encode(data).decode()}
+        return {}
+
+    async def detach(self) -> None:  # noqa: D401
+        pass
+
+
+class FakeBrowser(_Emitter):
+    """Minimal stand-in for ``playwright.async_api.Browser``."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.contexts: list[FakeContext] = []
+        self.closed = False
+
+    def is_connected(self) -> bool:
+        return not self.closed
+
+    async def new_browser_cdp_session(self) -> "FakeCDPSession":  # noqa: D401
+        return FakeCDPSession(renderer_pids=[])
+
+    async def new_context(self, **kwargs: Any) -> FakeContext:  # noqa: D401
+        ctx = FakeContext(self, **kwargs)
+        self.contexts.append(ctx)
+        return ctx
+
+    async def new_page(self) -> FakePage:  # noqa: D401
+        ctx = await self.new_context()
+        return await ctx.new_page()
+
+    async def close(self) -> None:  # noqa: D401
+        if not self.closed:
+            self.closed = True
+            for ctx in self.contexts:
+                ctx._close()
+            self.emit("disconnected", self)
+
+
+class FakePlaywright:
+    """Playwright driver fake that counts ``chromium.launch`` calls."""
+
+    def __init__(self, launch_delay: float = 0.0) -> None:
+        self.launches = 0
+        self.launch_delay = launch_delay  # emulate a slow cold start
+        self.browsers: list[FakeBrowser] = []
+        self.chromium = types.SimpleNamespace(launch=self._launch)
+
+    async def _launch(self, *_a: Any, **_kw: Any) -> FakeBrowser:
+        self.launches += 1
+        if self.launch_delay:
+            await asyncio.sleep(self.launch_delay)
+        browser = FakeBrowser()
+        self.browsers.append(browser)
+        return browser
+
+    async def stop(self) -> None:  # noqa: D401
+        return None
+
+    def factory(self) -> Any:
+        """Return a drop-in replacement for ``async_playwright``."""
+
+        async def _start() -> "FakePlaywright":
+            return self
+
+        return lambda: types.SimpleNamespace(start=_start)
@@ -0,0 +1,31 @@
+"""Browser-free runtime served by shard worker processes in tests."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Any
+
+
+class EchoRuntime:
+    """Resolve every command with ``(pid, channel_id, action, args)``.
+
+    ``crash`` kills the worker process to exercise respawn handling.
+    """
+
+    async def enqueue(
+        self, channel_id: int, action: str, *args: Any, **_kwargs: Any
+    ) -> asyncio.Future[Any]:
+        if action == "crash":
+            os._exit(1)
+        if action == "full":
+            raise asyncio.QueueFull()
+        fut: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        fut.set_result((os.getpid(), channel_id, action, args))
+        return fut
+
+    async def close_channel(self, _channel_id: int, *, forget_state: bool = False) -> None:
+        return None
+
+    async def close_all(self) -> None:
+        return None
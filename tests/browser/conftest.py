@@ -0,0 +1,30 @@
+"""Shared fixtures for the browser tests: a fake Playwright driver and page lookup."""
+
+from __future__ import annotations
+
+import pytest
+
+from bot.browser.engine import BrowserEngine
+from bot.browser.runtime import BrowserRuntime
+from tests._mocks.mocks import FakePage, FakePlaywright, PageOf
+
+
+@pytest.fixture
+def fake_pw(monkeypatch: pytest.MonkeyPatch) -> FakePlaywright:
+    """Route every ``async_playwright()`` call – engine and shared pool – to one fake."""
+    pw = FakePlaywright()
+    monkeypatch.setattr("bot.browser.pool.async_playwright", pw.factory())
+    monkeypatch.setattr("bot.browser.engine.async_playwright", pw.factory())
+    return pw
+
+
+def _page_of(target: BrowserEngine | BrowserRuntime, channel: int = 1) -> FakePage:
+    engine = target._ch[channel].engine if isinstance(target, BrowserRuntime) else target
+    assert engine is not None and isinstance(engine._page, FakePage)
+    return engine._page
+
+
+@pytest.fixture
+def page_of() -> PageOf:
+    """``page_of(engine)`` / ``page_of(runtime, channel)`` → the engine's :class:`FakePage`."""
+    return _page_of
@@ -0,0 +1,57 @@
+"""Batched worker: one page check per burst, short-circuit after a failed goto."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from bot.browser.exceptions import BrowserError
+from bot.browser.runtime import BrowserRuntime
+from tests._mocks.mocks import FakePage, FakePlaywright, PageOf
+
+
+async def _warm_runtime(monkeypatch: pytest.MonkeyPatch, batch_max: int) -> BrowserRuntime:
+    monkeypatch.setattr("bot.core.settings.settings.browser.batch_max", batch_max)
+    rt = BrowserRuntime()
+    await (await rt.enqueue(1, "health_check"))
+    return rt
+
+
+@pytest.mark.asyncio()
+async def test_burst_shares_one_page_check(
+    fake_pw: FakePlaywright, monkeypatch: pytest.MonkeyPatch, page_of: PageOf
+) -> None:
+    rt = await _warm_runtime(monkeypatch, 16)
+    page = page_of(rt)
+    engine = rt._ch[1].engine
+    assert engine is not None
+    engine._page_alive = None  # liveness unknown → the batch must probe once
+    page.evaluations = 0
+
+    futs = [await rt.enqueue(1, "fill", f"#f{i}", "x") for i in range(5)]
+    await asyncio.gather(*futs)
+
+    assert page.evaluations == 1
+    assert [a[1] for a in page.actions] == [f"#f{i}" for i in range(5)]
+    await rt.close_all()
+
+
+@pytest.mark.asyncio()
+async def test_failed_goto_short_circuits_rest_of_batch(
+    fake_pw: FakePlaywright, monkeypatch: pytest.MonkeyPatch, page_of: PageOf
+) -> None:
+    rt = await _warm_runtime(monkeypatch, 16)
+    page = page_of(rt)
+    page.fail_urls.add("https://bad.invalid/")
+
+    ok = await rt.enqueue(1, "click", "#before")
+    bad = await rt.enqueue(1, "goto", "https://bad.invalid/")
+    skipped = await rt.enqueue(1, "click", "#after")
+    results = await asyncio.gather(ok, bad, skipped, return_exceptions=True)
+
+    assert results[0] is None
+    assert isinstance(results[1], RuntimeError)
+    assert isinstance(results[2], BrowserError)
+    assert page.actions == [("click", "#before")]
+    await rt.close_all()
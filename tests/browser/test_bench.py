@@ -0,0 +1,33 @@
+"""Benchmark harness smoke test against the fake Playwright stack."""
+
+from __future__ import annotations
+
+import pytest
+
+from bot.browser.bench import BenchConfig, parse_mix, run_bench
+from tests._mocks.mocks import FakePlaywright
+
+
+def test_parse_mix() -> None:
+    assert parse_mix("goto=2, click=3,screenshot") == {"goto": 2, "click": 3, "screenshot": 1}
+    with pytest.raises(ValueError):
+        parse_mix("evaluate=1")
+    with pytest.raises(ValueError):
+        parse_mix("goto=0")
+
+
+@pytest.mark.asyncio()
+async def test_run_bench_reports_latency_and_cold_start(monkeypatch: pytest.MonkeyPatch) -> None:
+    pw = FakePlaywright(launch_delay=0.01)
+    monkeypatch.setattr("bot.browser.engine.async_playwright", pw.factory())
+
+    report = await run_bench(BenchConfig(channels=3, commands=10, seed=1))
+
+    assert pw.launches == 3  # one cold start per channel
+    assert report["errors"] == {}
+    lat = report["latency_ms"]["all"]
+    assert 0 <= lat["p50"] <= lat["p95"] <= lat["p99"] <= lat["max"]
+    assert report["commands_per_s"] > 0
+    assert report["cold_start_ms"]["p50"] >= 10
+    assert set(report["latency_ms"]) <= {"all", "goto", "click", "fill", "screenshot"}
+    assert set(report["liveness_ms"]) == {"cached", "probe"}
@@ -0,0 +1,55 @@
+"""Shared-browser mode: many channels, one Chromium, LRU eviction of idle contexts."""
+
+from __future__ import annotations
+
+import pytest
+
+from bot.browser.pool import BrowserPool, PoolExhaustedError
+from bot.browser.runtime import BrowserRuntime
+from tests._mocks.mocks import FakePlaywright
+
+
+@pytest.mark.asyncio()
+async def test_channels_share_one_browser(
+    monkeypatch: pytest.MonkeyPatch, fake_pw: FakePlaywright
+) -> None:
+    monkeypatch.setattr("bot.core.settings.settings.browser.shared_browser", True)
+    monkeypatch.setattr("bot.core.settings.settings.browser.pool_max_contexts", 8)
+    rt = BrowserRuntime()
+
+    for cid in (1, 2, 3):
+        await (await rt.enqueue(cid, "health_check"))
+
+    assert fake_pw.launches == 1
+    assert len(fake_pw.browsers[0].contexts) == 3
+    await rt.close_all()
+    assert all(ctx.closed for ctx in fake_pw.browsers[0].contexts)
+
+
+@pytest.mark.asyncio()
+async def test_full_pool_evicts_least_recently_used(
+    monkeypatch: pytest.MonkeyPatch, fake_pw: FakePlaywright
+) -> None:
+    monkeypatch.setattr("bot.core.settings.settings.browser.shared_browser", True)
+    monkeypatch.setattr("bot.core.settings.settings.browser.pool_max_contexts", 2)
+    rt = BrowserRuntime()
+
+    await (await rt.enqueue(1, "health_check"))
+    await (await rt.enqueue(2, "health_check"))
+    await (await rt.enqueue(1, "health_check"))  # 2 is now least recently used
+    await (await rt.enqueue(3, "health_check"))
+
+    assert sorted(r["channel"] for r in rt.status()) == [1, 3]
+    assert fake_pw.launches == 1
+    await rt.close_all()
+
+
+@pytest.mark.asyncio()
+async def test_pool_refuses_when_nothing_is_idle(fake_pw: FakePlaywright) -> None:
+    pool = BrowserPool(headless=True, proxy=None, timeout_ms=100, max_contexts=1)
+    pool.can_evict = lambda _key: False
+
+    await pool.lease(1)
+    with pytest.raises(PoolExhaustedError):
+        await pool.lease(2)
+    await pool.stop()
@@ -0,0 +1,82 @@
+"""Command deadlines and cancellation: skip stale work, abort abandoned work."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from bot.browser.exceptions import CommandExpiredError
+from bot.browser.runtime import BrowserRuntime
+from bot.utils.discord_interactions import interaction_deadline
+from tests._mocks.mocks import FakePage, FakePlaywright, PageOf
+
+
+@pytest.fixture
+async def warm(fake_pw: FakePlaywright, page_of: PageOf) -> tuple[BrowserRuntime, FakePage]:
+    rt = BrowserRuntime()
+    await (await rt.enqueue(1, "health_check"))
+    return rt, page_of(rt)
+
+
+@pytest.mark.asyncio()
+async def test_command_expiring_in_queue_is_skipped(warm: tuple[BrowserRuntime, FakePage]) -> None:
+    rt, page = warm
+    page.goto_delay = 0.2
+
+    slow = await rt.enqueue(1, "goto", "https://slow.test/")
+    stale = await rt.enqueue(1, "click", "#late", deadline=time.monotonic() + 0.05)
+
+    with pytest.raises(CommandExpiredError):
+        await stale
+    await slow
+    assert ("click", "#late") not in page.actions
+    await rt.close_all()
+
+
+@pytest.mark.asyncio()
+async def test_deadline_caps_playwright_timeout_and_aborts(
+    warm: tuple[BrowserRuntime, FakePage],
+) -> None:
+    rt, page = warm
+    page.goto_delay = 5.0  # hung navigation
+
+    started = time.monotonic()
+    fut = await rt.enqueue(1, "goto", "https://hung.test/", deadline=started + 0.1)
+    with pytest.raises(CommandExpiredError):
+        await fut
+
+    assert time.monotonic() - started < 1.0
+    assert page.goto_timeouts[-1] is not None and page.goto_timeouts[-1] <= 100
+    await rt.close_all()
+
+
+@pytest.mark.asyncio()
+async def test_cancelling_future_aborts_in_flight_work(
+    warm: tuple[BrowserRuntime, FakePage],
+) -> None:
+    rt, page = warm
+    page.goto_delay = 5.0
+
+    hung = await rt.enqueue(1, "goto", "https://hung.test/")
+    after = await rt.enqueue(1, "click", "#next")
+    await asyncio.sleep(0.05)
+    hung.cancel()
+
+    await asyncio.wait_for(after, timeout=1.0)  # worker moved on immediately
+    assert page.url == "about:blank"  # the cancelled goto never completed
+    assert rt._ch[1].task is not None and not rt._ch[1].task.done()
+    await rt.close_all()
+
+
+def test_interaction_deadline_tracks_token_lifetime() -> None:
+    fresh: Any = SimpleNamespace(created_at=datetime.now(UTC))
+    old: Any = SimpleNamespace(created_at=datetime.now(UTC) - timedelta(minutes=14))
+
+    now = time.monotonic()
+    assert 14 * 60 < interaction_deadline(fresh) - now <= 15 * 60
+    assert 50 < interaction_deadline(old) - now <= 60
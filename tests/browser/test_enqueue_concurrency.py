@@ -0,0 +1,68 @@
+"""A cold engine start on one channel must not block enqueue on warm channels."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from bot.browser.exceptions import BrowserError
+from bot.browser.runtime import BrowserRuntime
+from tests._mocks.mocks import FakePlaywright
+
+COLD_START_S = 0.5
+
+
+@pytest.mark.asyncio()
+async def test_warm_channel_enqueue_not_blocked_by_cold_start(fake_pw: FakePlaywright) -> None:
+    rt = BrowserRuntime()
+    await (await rt.enqueue(1, "health_check"))  # channel 1 is warm
+
+    fake_pw.launch_delay = COLD_START_S
+    cold = asyncio.create_task(rt.enqueue(2, "health_check"))
+    await asyncio.sleep(0.05)  # cold start is now in flight
+    assert not cold.done()
+
+    latencies: list[float] = []
+    for _ in range(5):
+        t0 = time.perf_counter()
+        fut = await rt.enqueue(1, "health_check")
+        latencies.append(time.perf_counter() - t0)
+        await fut
+
+    assert not cold.done(), "warm enqueues should finish before the cold start"
+    assert max(latencies) < COLD_START_S / 5
+    await (await cold)
+    await rt.close_all()
+
+
+@pytest.mark.asyncio()
+async def test_concurrent_first_commands_launch_one_engine(fake_pw: FakePlaywright) -> None:
+    fake_pw.launch_delay = 0.05
+    rt = BrowserRuntime()
+
+    futs = await asyncio.gather(*(rt.enqueue(7, "health_check") for _ in range(5)))
+    assert await asyncio.gather(*futs) == [True] * 5
+    assert fake_pw.launches == 1
+    await rt.close_all()
+
+
+@pytest.mark.asyncio()
+async def test_command_waiting_on_start_lock_fails_if_channel_closed(
+    fake_pw: FakePlaywright,
+) -> None:
+    rt = BrowserRuntime()
+    await (await rt.enqueue(3, "health_check"))
+    ctx = rt._ch[3]
+
+    await ctx.start_lock.acquire()  # e.g. a concurrent first command still launching
+    waiting = asyncio.create_task(rt.enqueue(3, "health_check"))
+    await asyncio.sleep(0)
+    await rt.close_channel(3)
+    ctx.start_lock.release()
+
+    with pytest.raises(BrowserError):
+        await asyncio.wait_for(waiting, timeout=1.0)
+    assert 3 not in rt._ch
+    await rt.close_all()
@@ -0,0 +1,99 @@
+"""Fair scheduling: read-only lane first, weighted fairness, global engine cap."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from bot.browser.runtime import BrowserRuntime
+from bot.browser.scheduler import FairScheduler
+from bot.core.telemetry import REGISTRY
+from tests._mocks.mocks import FakePlaywright
+
+
+async def _contend(sched: FairScheduler, requests: list[tuple[int, str]]) -> list[int]:
+    """Queue *requests* behind a held slot; return the channels in grant order."""
+    order: list[int] = []
+
+    async def _run(cid: int, lane: str) -> None:
+        async with sched.slot(cid, lane):
+            order.append(cid)
+
+    async with sched.slot(0, "write"):
+        tasks = []
+        for cid, lane in requests:
+            tasks.append(asyncio.create_task(_run(cid, lane)))
+            await asyncio.sleep(0)  # enqueue in submission order
+    await asyncio.gather(*tasks)
+    return order
+
+
+@pytest.mark.asyncio()
+async def test_read_lane_jumps_ahead_of_mutations() -> None:
+    sched = FairScheduler(max_active=1)
+    order = await _contend(sched, [(1, "write"), (2, "write"), (3, "read")])
+    assert order == [3, 1, 2]
+
+
+@pytest.mark.asyncio()
+async def test_spamming_channel_yields_to_others() -> None:
+    sched = FairScheduler(max_active=1)
+    for _ in range(5):  # channel 1 already had its share
+        async with sched.slot(1, "write"):
+            pass
+    order = await _contend(sched, [(1, "write"), (2, "write")])
+    assert order == [2, 1]
+
+
+@pytest.mark.asyncio()
+async def test_weights_skew_the_share() -> None:
+    sched = FairScheduler(max_active=1, weights={1: 3.0})
+    for cid in (1, 2):
+        async with sched.slot(cid, "write"):
+            pass
+    # Channel 1 advanced by 1/3, channel 2 by 1 – channel 1 goes first.
+    order = await _contend(sched, [(2, "write"), (1, "write")])
+    assert order == [1, 2]
+
+
+@pytest.mark.asyncio()
+async def test_cancelled_waiter_does_not_leak_a_slot() -> None:
+    sched = FairScheduler(max_active=1)
+    async with sched.slot(0, "write"):
+        waiter = asyncio.create_task(sched._acquire(1, "write", 1.0))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+    assert sched.active == 0
+    assert sched.waiting() == {"read": 0, "write": 0}
+
+
+@pytest.mark.asyncio()
+async def test_runtime_caps_active_engines_and_records_wait(
+    monkeypatch: pytest.MonkeyPatch, fake_pw: FakePlaywright
+) -> None:
+    monkeypatch.setattr("bot.core.settings.settings.browser.max_active_engines", 1)
+    rt = BrowserRuntime()
+
+    peak = 0
+    real = BrowserRuntime._execute
+
+    async def _tracking(engine, cmd):  # type: ignore[no-untyped-def]
+        nonlocal peak
+        sched = rt._scheduler
+        assert sched is not None
+        peak = max(peak, sched.active)
+        await asyncio.sleep(0.01)
+        return await real(engine, cmd)
+
+    monkeypatch.setattr(BrowserRuntime, "_execute", staticmethod(_tracking))
+    before = REGISTRY.get_sample_value("browser_queue_wait_seconds_count", {"lane": "read"}) or 0
+
+    futs = [await rt.enqueue(cid, "health_check") for cid in (1, 2, 3)]
+    await asyncio.gather(*futs)
+
+    assert peak == 1
+    after = REGISTRY.get_sample_value("browser_queue_wait_seconds_count", {"lane": "read"})
+    assert after == before + 3
+    await rt.close_all()
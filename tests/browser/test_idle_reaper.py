@@ -0,0 +1,47 @@
+"""Idle reaper closes browser workers past ``worker_idle_timeout_sec``."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from bot.browser.runtime import BrowserRuntime
+from bot.core.telemetry import BROWSER_REAPED_TOTAL
+from tests._mocks.mocks import FakePlaywright
+
+
+@pytest.mark.asyncio()
+async def test_reaper_closes_only_idle_channels(
+    monkeypatch: pytest.MonkeyPatch, fake_pw: FakePlaywright
+) -> None:
+    monkeypatch.setattr("bot.core.settings.settings.browser.worker_idle_timeout_sec", 60.0)
+    rt = BrowserRuntime()
+    await (await rt.enqueue(1, "health_check"))
+    await (await rt.enqueue(2, "health_check"))
+
+    # Channel 1 went quiet long ago, channel 2 was just used.
+    rt._ch[1].last_used = time.monotonic() - 120
+    before = BROWSER_REAPED_TOTAL._value.get()
+
+    assert await rt.reap_idle() == 1
+    assert [r["channel"] for r in rt.status()] == [2]
+    assert fake_pw.browsers[0].closed and not fake_pw.browsers[1].closed
+    assert BROWSER_REAPED_TOTAL._value.get() == before + 1
+    await rt.close_all()
+
+
+@pytest.mark.asyncio()
+async def test_reaper_skips_busy_channel(
+    monkeypatch: pytest.MonkeyPatch, fake_pw: FakePlaywright
+) -> None:
+    monkeypatch.setattr("bot.core.settings.settings.browser.worker_idle_timeout_sec", 60.0)
+    rt = BrowserRuntime()
+    await (await rt.enqueue(1, "health_check"))
+    rt._ch[1].last_used = time.monotonic() - 120
+    rt._ch[1].busy = True
+
+    assert await rt.reap_idle() == 0
+    rt._ch[1].busy = False
+    await rt.close_all()
+    assert fake_pw.browsers[0].closed
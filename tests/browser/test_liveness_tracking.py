@@ -0,0 +1,80 @@
+"""Event-driven page liveness: no evaluate() probe per action.
+
+``python -m bot.browser.bench`` reports the latency difference against real
+Chromium (``liveness_ms``).
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from bot.browser.engine import BrowserEngine
+from tests._mocks.mocks import FakePage, FakePlaywright, PageOf
+
+ACTIONS = 5
+
+
+@pytest.mark.asyncio()
+async def test_actions_skip_probe_while_page_known_alive(
+    fake_pw: FakePlaywright, page_of: PageOf
+) -> None:
+    eng = BrowserEngine(headless=True, proxy=None, timeout_ms=100)
+    await eng.start()
+
+    await eng.click("#a")
+    await eng.fill("#b", "x")
+    await eng.health_check()
+
+    assert page_of(eng).evaluations == 0
+    await eng.close()
+
+
+@pytest.mark.asyncio()
+async def test_close_and_crash_events_trigger_reopen(
+    fake_pw: FakePlaywright, page_of: PageOf
+) -> None:
+    eng = BrowserEngine(headless=True, proxy=None, timeout_ms=100)
+    await eng.start()
+    await eng.goto("https://example.com/")
+
+    first = page_of(eng)
+    first.emit("crash", first)
+    await eng.click("#a")
+    second = page_of(eng)
+    assert second is not first and second.gotos == ["https://example.com/"]
+
+    await second.close()  # user closed the tab
+    await eng.click("#a")
+    assert page_of(eng) is not second
+    await eng.close()
+
+
+@pytest.mark.asyncio()
+async def test_disconnected_browser_is_relaunched(fake_pw: FakePlaywright) -> None:
+    eng = BrowserEngine(headless=True, proxy=None, timeout_ms=100)
+    await eng.start()
+    await fake_pw.browsers[0].close()  # Chromium died
+
+    assert await eng.health_check()
+    assert fake_pw.launches == 2
+    await eng.close()
+
+
+@pytest.mark.asyncio()
+async def test_unknown_liveness_probes_once_per_action(
+    fake_pw: FakePlaywright, page_of: PageOf
+) -> None:
+    eng = BrowserEngine(headless=True, proxy=None, timeout_ms=100)
+    await eng.start()
+    page = page_of(eng)
+
+    for _ in range(ACTIONS):
+        await eng.click("#a")
+    assert page.evaluations == 0  # cached state: no round-trip
+
+    for _ in range(ACTIONS):
+        eng._page_alive = None  # pre-change behaviour: state always unknown
+        await eng.click("#a")
+    assert page.evaluations == ACTIONS
+    assert page_of(eng) is page
+    await eng.close()
@@ -0,0 +1,94 @@
+"""Memory governor: recycle over-budget contexts, evict LRU channels at the ceiling."""
+
+from __future__ import annotations
+
+import pytest
+
+from bot.browser.engine import BrowserEngine
+from bot.browser.governor import MemoryGovernor
+from bot.browser.runtime import BrowserRuntime
+from bot.core.telemetry import REGISTRY
+from tests._mocks.mocks import FakeContext, FakePage, FakePlaywright, PageOf
+
+MIB = 1024 * 1024
+
+
+def _engine(rt: BrowserRuntime, cid: int) -> BrowserEngine:
+    engine = rt._ch[cid].engine
+    assert engine is not None
+    return engine
+
+
+def _actions(action: str) -> float:
+    return REGISTRY.get_sample_value("browser_governor_actions_total", {"action": action}) or 0
+
+
+@pytest.fixture
+async def runtime(monkeypatch: pytest.MonkeyPatch, fake_pw: FakePlaywright) -> BrowserRuntime:
+    rt = BrowserRuntime()
+    for cid in (1, 2, 3):
+        await (await rt.enqueue(cid, "goto", f"https://site{cid}.test/app"))
+    return rt
+
+
+@pytest.mark.asyncio()
+async def test_over_budget_context_is_recycled_with_state(
+    runtime: BrowserRuntime, page_of: PageOf
+) -> None:
+    bloated = page_of(runtime, 2)
+    bloated.js_heap = 300 * MIB
+    old_ctx = bloated.context
+    assert isinstance(old_ctx, FakeContext)
+    old_state = await old_ctx.storage_state()
+    untouched = page_of(runtime, 1)
+    before = _actions("recycle")
+
+    await MemoryGovernor(runtime, interval_s=60, budget_mb=256).run_once()
+
+    fresh = page_of(runtime, 2)
+    assert fresh is not bloated and old_ctx.closed
+    assert isinstance(fresh.context, FakeContext)
+    assert fresh.context.kwargs == {"storage_state": old_state}
+    assert fresh.gotos == ["https://site2.test/app"]  # last URL restored
+    assert page_of(runtime, 1) is untouched
+    assert _actions("recycle") == before + 1
+    await runtime.close_all()
+
+
+@pytest.mark.asyncio()
+async def test_memory_probe_runs_in_read_lane_without_saving_state(
+    runtime: BrowserRuntime, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    saved: list[int] = []
+
+    async def save_state(channel_id: int, engine: BrowserEngine) -> None:
+        saved.append(channel_id)
+
+    monkeypatch.setattr(runtime, "_save_state", save_state)
+    before = REGISTRY.get_sample_value("browser_queue_wait_seconds_count", {"lane": "read"}) or 0
+
+    await MemoryGovernor(runtime, interval_s=60, budget_mb=4096).run_once()
+
+    assert saved == []  # a probe is not a page change
+    after = REGISTRY.get_sample_value("browser_queue_wait_seconds_count", {"lane": "read"})
+    assert after == before + 3
+    await runtime.close_all()
+
+
+@pytest.mark.asyncio()
+async def test_ceiling_evicts_least_recently_used_idle_channels(
+    runtime: BrowserRuntime, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    await (await runtime.enqueue(1, "click", "#fresh"))  # channel 1 is now the MRU
+    # Each eviction frees 400 MiB from a 1.1 GiB total; the ceiling is 500 MiB.
+    monkeypatch.setattr(
+        "bot.browser.governor.metrics.get_children_rss",
+        lambda: (len(runtime._ch) * 400 - 100) * MIB,
+    )
+    before = _actions("evict")
+
+    await MemoryGovernor(runtime, interval_s=60, budget_mb=4096, ceiling_mb=500).run_once()
+
+    assert set(runtime._ch) == {1}
+    assert _actions("evict") == before + 2
+    await runtime.close_all()
@@ -0,0 +1,183 @@
+"""Navigation TTL cache, request blocking and the shared resource cache."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from bot.browser.engine import BrowserEngine
+from bot.browser.routing import RequestRouter
+from tests._mocks.mocks import FakePage, FakePlaywright, PageOf
+
+
+@pytest.mark.asyncio()
+async def test_repeat_open_within_ttl_skips_navigation(
+    fake_pw: FakePlaywright, monkeypatch: pytest.MonkeyPatch, page_of: PageOf
+) -> None:
+    now = [1000.0]
+    monkeypatch.setattr("bot.browser.engine.time.monotonic", lambda: now[0])
+    eng = BrowserEngine(headless=True, proxy=None, timeout_ms=100, nav_cache_ttl=30)
+    await eng.start()
+
+    await eng.goto("https://Example.com")
+    await eng.goto("https://example.com:443/")  # same page once normalised
+    assert page_of(eng).gotos == ["https://Example.com"]
+
+    await eng.click("#tab")  # mutation: page no longer a fresh load
+    await eng.goto("https://example.com/")
+    now[0] += 31  # TTL expired
+    await eng.goto("https://example.com/")
+    await eng.goto("https://example.com/other")
+    assert len(page_of(eng).gotos) == 4
+    await eng.close()
+
+
+@pytest.mark.asyncio()
+async def test_ttl_zero_always_navigates(fake_pw: FakePlaywright, page_of: PageOf) -> None:
+    eng = BrowserEngine(headless=True, proxy=None, timeout_ms=100)
+    await eng.start()
+    await eng.goto("https://example.com/")
+    await eng.goto("https://example.com/")
+    assert len(page_of(eng).gotos) == 2
+    await eng.close()
+
+
+# ---------------------------------------------------------------------------+
+#  RequestRouter                                                             +
+# ---------------------------------------------------------------------------+
+class _Request:
+    def __init__(self, url: str, resource_type: str, sent: dict[str, str] | None = None) -> None:
+        self.url = url
+        self.resource_type = resource_type
+        self.method = "GET"
+        self._sent = sent or {}
+
+    async def all_headers(self) -> dict[str, str]:
+        return self._sent
+
+
+class _Response:
+    def __init__(self, headers: dict[str, str]) -> None:
+        self.status = 200
+        self.headers = headers
+
+    async def body(self) -> bytes:
+        return b"x" * 100
+
+
+class _Route:
+    def __init__(self, request: _Request, headers: dict[str, str] | None = None) -> None:
+        self.request = request
+        self._headers = headers or {}
+        self.outcome: tuple[str, Any] | None = None
+
+    async def abort(self, error_code: str | None = None) -> None:
+        self.outcome = ("abort", error_code)
+
+    async def continue_(self) -> None:
+        self.outcome = ("continue", None)
+
+    async def fetch(self) -> _Response:
+        return _Response(self._headers)
+
+    async def fulfill(self, **kw: Any) -> None:
+        self.outcome = ("fulfill", "response" not in kw)  # True = served from cache
+
+
+async def _route(
+    router: RequestRouter,
+    url: str,
+    rtype: str,
+    sent: dict[str, str] | None = None,
+    **kw: Any,
+) -> tuple[str, Any]:
+    route = _Route(_Request(url, rtype, sent), **kw)
+    await router.handle(route)  # type: ignore[arg-type]
+    assert route.outcome is not None
+    return route.outcome
+
+
+@pytest.mark.asyncio()
+async def test_router_blocks_types_and_hosts() -> None:
+    router = RequestRouter(block_types=["font", "media"], block_hosts=["ads.example"])
+
+    assert await _route(router, "https://site.test/a.woff2", "font") == ("abort", "blockedbyclient")
+    assert (await _route(router, "https://cdn.ads.example/x.js", "script"))[0] == "abort"
+    assert await _route(router, "https://site.test/app.js", "script") == ("continue", None)
+
+
+@pytest.mark.asyncio()
+async def test_router_shares_static_resources_across_pages(
+    fake_pw: FakePlaywright, page_of: PageOf
+) -> None:
+    router = RequestRouter(cache_bytes=1024 * 1024)
+    a = BrowserEngine(headless=True, proxy=None, timeout_ms=100, router=router)
+    b = BrowserEngine(headless=True, proxy=None, timeout_ms=100, router=router)
+    await a.start()
+    await b.start()
+    assert [p for p, _ in page_of(a).routes] == ["**/*"]
+
+    url = "https://site.test/app.js"
+    fresh = {"cache-control": "public, max-age=600"}
+    assert await _route(router, url, "script", headers=fresh) == ("fulfill", False)  # fetched
+    assert await _route(router, url, "script") == ("fulfill", True)  # second context: cached
+    assert await _route(router, url, "document") == ("continue", None)
+    await a.close()
+    await b.close()
+
+
+@pytest.mark.asyncio()
+@pytest.mark.parametrize(
+    ("sent", "headers"),
+    [
+        ({}, {}),  # no explicit lifetime – no heuristic caching
+        ({}, {"cache-control": "no-store"}),
+        ({}, {"cache-control": "private, max-age=600"}),
+        ({}, {"cache-control": "public"}),  # public, but no Expires
+        ({}, {"cache-control": "max-age=600", "set-cookie": "sid=1"}),
+        ({}, {"cache-control": "max-age=600", "vary": "Accept-Encoding, Origin"}),
+        ({}, {"cache-control": "max-age=600", "vary": "*"}),
+        ({"cookie": "sid=1"}, {"cache-control": "public, max-age=600"}),
+        ({"authorization": "Bearer t"}, {"cache-control": "public, max-age=600"}),
+    ],
+)
+async def test_router_never_shares_personal_or_unlabelled_responses(
+    sent: dict[str, str], headers: dict[str, str]
+) -> None:
+    router = RequestRouter(cache_bytes=1024 * 1024)
+    url = "https://site.test/avatar.png"
+    await _route(router, url, "image", sent, headers=headers)
+
+    assert router.cache is not None and len(router.cache) == 0
+    assert (await _route(router, url, "image"))[1] is not True  # not served from cache
+
+
+@pytest.mark.asyncio()
+async def test_router_caches_public_response_until_expires() -> None:
+    router = RequestRouter(cache_bytes=1024 * 1024)
+    headers = {
+        "cache-control": "public",
+        "date": "Sun, 18 Oct 2026 10:00:00 GMT",
+        "expires": "Sun, 18 Oct 2026 10:05:00 GMT",
+    }
+    await _route(router, "https://site.test/logo.png", "image", headers=headers)
+    assert await _route(router, "https://site.test/logo.png", "image") == ("fulfill", True)
+
+
+@pytest.mark.asyncio()
+async def test_router_caches_assets_varying_only_on_encoding() -> None:
+    router = RequestRouter(cache_bytes=1024 * 1024)
+    url = "https://cdn.test/app.css"
+    headers = {
+        "cache-control": "public, max-age=600",
+        "vary": "Accept-Encoding",
+        "content-encoding": "br",
+        "content-length": "31",
+    }
+    await _route(router, url, "stylesheet", headers=headers)
+
+    assert await _route(router, url, "stylesheet") == ("fulfill", True)
+    assert router.cache is not None
+    hit = router.cache.get(url)
+    assert hit is not None and "content-encoding" not in hit.headers  # body is stored decoded
@@ -0,0 +1,64 @@
+"""In-memory screenshots: bytes end to end, re-encoded to fit the upload limit."""
+
+from __future__ import annotations
+
+import pytest
+
+from bot.browser.engine import BrowserEngine
+from bot.browser.exceptions import BrowserError
+from tests._mocks.mocks import FakePage, FakePlaywright, PageOf
+
+
+@pytest.fixture
+async def engine(fake_pw: FakePlaywright) -> BrowserEngine:
+    eng = BrowserEngine(headless=True, proxy=None, timeout_ms=100)
+    await eng.start()
+    return eng
+
+
+@pytest.mark.asyncio()
+async def test_png_returned_in_memory_without_path(engine: BrowserEngine, page_of: PageOf) -> None:
+    clip = {"x": 0.0, "y": 0.0, "width": 10.0, "height": 10.0}
+    data = await engine.screenshot(clip=clip, max_bytes=10_000)  # type: ignore[arg-type]
+
+    assert data.startswith(b"\x89PNG")
+    assert page_of(engine).shots == [
+        {"type": "png", "quality": None, "clip": clip, "full_page": False, "timeout": 100}
+    ]
+
+
+@pytest.mark.asyncio()
+async def test_oversized_capture_falls_back_to_smaller_jpeg(
+    engine: BrowserEngine, page_of: PageOf
+) -> None:
+    # JPEG sizes in the fake: q80 → 2000 B, q60 → 1500 B at CSS scale.
+    data = await engine.screenshot(max_bytes=1_600)
+
+    assert data.startswith(b"\xff\xd8") and len(data) <= 1_600
+    steps = [(s["type"], s["quality"], s.get("scale")) for s in page_of(engine).shots]
+    assert steps == [("png", None, None), ("jpeg", 80, "css"), ("jpeg", 60, "css")]
+
+
+@pytest.mark.asyncio()
+async def test_fallback_never_raises_requested_quality(
+    engine: BrowserEngine, page_of: PageOf
+) -> None:
+    with pytest.raises(BrowserError):
+        await engine.screenshot(type="jpeg", quality=50, max_bytes=50)
+
+    qualities = [s["quality"] for s in page_of(engine).shots + page_of(engine).cdp_shots]
+    assert qualities == [50, 40, 25, 25, 25]
+
+
+@pytest.mark.asyncio()
+async def test_downscales_pixels_when_quality_is_not_enough(
+    engine: BrowserEngine, page_of: PageOf
+) -> None:
+    # At 1x DPR scale="css" changes nothing, so the pixel downscale must kick in.
+    # Fake sizes: q25 at CSS scale → 625 B; ×0.5 → 312 B; ×0.25 → 78 B.
+    data = await engine.screenshot(max_bytes=100)
+
+    assert data.startswith(b"\xff\xd8") and len(data) <= 100
+    cdp = page_of(engine).cdp_shots
+    assert [s["clip"]["scale"] for s in cdp] == [0.5, 0.25]
+    assert cdp[0]["clip"] == {"x": 0, "y": 0, "width": 800, "height": 600, "scale": 0.5}
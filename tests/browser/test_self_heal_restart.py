@@ -18,6 +18,9 @@ class _DummyPage:  # noqa: D101 – internal test helper
     async def close(self) -> None:  # noqa: D401
         return None
 
+    def on(self, _event: str, _handler: Callable[..., None]) -> None:  # noqa: D401
+        return None
+
 
 class _DummyContext:  # noqa: D101 – mimics BrowserContext
     def __init__(self, browser: _DummyBrowser) -> None:
@@ -43,6 +46,9 @@ class _DummyBrowser:  # noqa: D101 – internal test helper
     async def close(self) -> None:  # noqa: D401
         self.closed = True
 
+    def on(self, _event: str, _handler: Callable[..., None]) -> None:  # noqa: D401
+        return None
+
 
 class _DummyPlaywright:  # noqa: D101
     def __init__(self, launch_cb: Callable[[], None]) -> None:
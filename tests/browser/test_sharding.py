@@ -0,0 +1,51 @@
+"""Out-of-process browser shards: routing, error forwarding and respawn."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+
+import pytest
+
+from bot.browser.exceptions import BrowserError
+from bot.browser.shard import HashRing, ShardedExecutor
+
+ECHO = "tests._mocks.shard_runtime:EchoRuntime"
+
+
+def test_hash_ring_is_stable_and_balanced() -> None:
+    ring = HashRing(4)
+    owners = [ring.node_for(cid) for cid in range(4000)]
+    assert owners == [HashRing(4).node_for(cid) for cid in range(4000)]
+    assert min(Counter(owners).values()) > 500
+
+    # Growing the ring only moves a fraction of the channels.
+    grown = HashRing(5)
+    moved = sum(grown.node_for(cid) != owner for cid, owner in enumerate(owners))
+    assert moved < 4000 * 0.35
+
+
+@pytest.mark.asyncio()
+async def test_commands_route_to_owning_worker_and_respawn() -> None:
+    ex = ShardedExecutor(2, runtime_factory=ECHO)
+    try:
+        pid, cid, action, args = await (await ex.enqueue(11, "goto", ("https://a/",), {}))
+        assert (cid, action, args) == (11, "goto", ("https://a/",))
+        again = await (await ex.enqueue(11, "click", ("#x",), {}))
+        assert again[0] == pid  # same channel → same process
+
+        with pytest.raises(asyncio.QueueFull):
+            await ex.enqueue(11, "full", (), {})
+
+        with pytest.raises(BrowserError):
+            await (await ex.enqueue(11, "crash", (), {}))
+
+        for _ in range(50):  # respawn is asynchronous
+            try:
+                revived = await (await ex.enqueue(11, "click", ("#x",), {}))
+                break
+            except BrowserError:
+                await asyncio.sleep(0.1)
+        assert revived[0] != pid
+    finally:
+        await ex.stop()
@@ -0,0 +1,133 @@
+"""Storage-state snapshots survive context recreation, channel close and restarts."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import stat
+from pathlib import Path
+
+import pytest
+
+from bot.browser.engine import BrowserEngine
+from bot.browser.runtime import BrowserRuntime
+from bot.browser.storage import StateStore
+from bot.core.settings import settings
+from tests._mocks.mocks import FakeContext, FakePage, FakePlaywright, PageOf
+
+STATE = {"cookies": [{"name": "sid", "value": "abc"}], "origins": []}
+
+
+@pytest.fixture
+def state_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, fake_pw: FakePlaywright) -> Path:
+    monkeypatch.setattr(settings.browser, "state_dir", str(tmp_path))
+    monkeypatch.setattr(settings.browser, "state_snapshot_sec", 0.0)
+    return tmp_path
+
+
+@pytest.mark.asyncio()
+async def test_store_round_trip_is_atomic_and_private(tmp_path: Path) -> None:
+    store = StateStore(tmp_path / "states")
+
+    assert await store.load(1) is None
+    assert await store.save(1, STATE) is True
+    assert await store.save(1, STATE) is False  # unchanged – no rewrite
+
+    path = store.path(1)
+    assert json.loads(gzip.decompress(path.read_bytes())) == STATE
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+    assert [p.name for p in path.parent.iterdir()] == [path.name]  # no temp file left
+    assert await store.load(1) == STATE
+
+    path.write_bytes(b"not gzip")
+    assert await store.load(1) is None  # corrupt snapshot is ignored
+
+
+@pytest.mark.asyncio()
+async def test_channel_state_is_saved_and_restored_across_runtimes(
+    state_dir: Path, page_of: PageOf
+) -> None:
+    rt = BrowserRuntime()
+    await (await rt.enqueue(5, "goto", "https://app.test/login"))
+    ctx = page_of(rt, 5).context
+    assert isinstance(ctx, FakeContext)
+    saved = await ctx.storage_state()
+    await rt.close_all()
+
+    store = StateStore(state_dir)
+    assert await store.load(5) == saved
+
+    restarted = BrowserRuntime()
+    await (await restarted.enqueue(5, "goto", "https://app.test/home"))
+    ctx = page_of(restarted, 5).context
+    assert isinstance(ctx, FakeContext)
+    assert ctx.kwargs == {"storage_state": saved}
+    await restarted.close_all()
+
+
+@pytest.mark.asyncio()
+async def test_closing_for_good_deletes_the_snapshot(state_dir: Path) -> None:
+    rt = BrowserRuntime()
+    await (await rt.enqueue(5, "goto", "https://app.test/login"))
+    await rt.close_channel(5)  # reclaimed – the session is kept
+    store = StateStore(state_dir)
+    assert await store.load(5) is not None
+
+    await (await rt.enqueue(5, "goto", "https://app.test/home"))
+    await rt.close_channel(5, forget_state=True)
+    assert await store.load(5) is None and not store.path(5).exists()
+    await rt.close_all()
+
+
+@pytest.mark.asyncio()
+async def test_concurrent_saves_of_one_channel_do_not_collide(tmp_path: Path) -> None:
+    store = StateStore(tmp_path)
+    states = [{"cookies": [{"name": "sid", "value": str(i)}], "origins": []} for i in range(8)]
+
+    await asyncio.gather(*(store.save(1, state) for state in states))
+
+    assert await store.load(1) == states[-1]
+    assert [p.name for p in tmp_path.iterdir()] == ["1.json.gz"]
+
+
+@pytest.mark.asyncio()
+async def test_pool_eviction_snapshots_the_evicted_channel(
+    state_dir: Path, monkeypatch: pytest.MonkeyPatch, page_of: PageOf
+) -> None:
+    monkeypatch.setattr(settings.browser, "shared_browser", True)
+    monkeypatch.setattr(settings.browser, "pool_max_contexts", 1)
+    rt = BrowserRuntime()
+    await (await rt.enqueue(1, "health_check"))  # read lane – nothing saved yet
+    ctx = page_of(rt, 1).context
+    assert isinstance(ctx, FakeContext)
+    saved = await ctx.storage_state()
+
+    await (await rt.enqueue(2, "health_check"))  # evicts channel 1
+
+    assert ctx.closed and 1 not in rt._ch
+    assert await StateStore(state_dir).load(1) == saved
+    await rt.close_all()
+
+
+@pytest.mark.asyncio()
+async def test_recreated_context_keeps_logins_of_crashed_page(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr("bot.browser.engine.async_playwright", FakePlaywright().factory())
+    engine = BrowserEngine(headless=True, proxy=None, timeout_ms=1000)
+    await engine.apply_state(STATE)
+    await engine.start()
+    await engine.goto("https://app.test/")
+    crashed = engine._page
+    assert isinstance(crashed, FakePage)
+    old_state = await crashed.context.storage_state()
+
+    crashed._close()  # renderer crash; the context survives
+    await engine.goto("https://app.test/next")
+
+    page = engine._page
+    assert isinstance(page, FakePage) and page is not crashed
+    assert isinstance(page.context, FakeContext)
+    assert page.context.kwargs == {"storage_state": old_state}
+    await engine.close()
@@ -0,0 +1,65 @@
+"""Per-stage tracing of browser commands."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from bot.browser import tracing
+from bot.browser.runtime import BrowserRuntime
+from bot.core.telemetry import REGISTRY
+from tests._mocks.mocks import FakePlaywright
+
+
+def _observed(stage: str, action: str) -> float:
+    labels = {"stage": stage, "action": action}
+    return REGISTRY.get_sample_value("browser_stage_seconds_count", labels) or 0
+
+
+@pytest.mark.asyncio()
+async def test_command_stages_are_traced_across_the_queue(
+    fake_pw: FakePlaywright,
+) -> None:
+    rt = BrowserRuntime()
+    before = _observed("playwright", "goto")
+
+    async def interaction() -> tracing.Trace:
+        trace = tracing.start_trace("open", 9)
+        with tracing.span("wrapper"):
+            fut = await rt.enqueue(9, "goto", "https://example.com")
+        await fut
+        with tracing.span("reply"):
+            pass
+        return trace
+
+    trace = await asyncio.create_task(interaction())
+    await rt.close_all()
+
+    assert trace.action == "goto"  # relabelled with the browser action
+    assert set(trace.stages) >= {"wrapper", "lock", "launch", "queue", "ensure_page", "playwright"}
+    assert trace.stages["ensure_page"] <= trace.stages["playwright"]
+    assert _observed("playwright", "goto") == before + 1
+    assert tracing.recent_traces(1) == [trace]
+
+
+@pytest.mark.asyncio()
+async def test_untraced_commands_still_feed_histograms(fake_pw: FakePlaywright) -> None:
+    rt = BrowserRuntime()
+    before = _observed("queue", "health_check")
+    recent = tracing.recent_traces()
+
+    await (await rt.enqueue(4, "health_check"))
+    await rt.close_all()
+
+    assert _observed("queue", "health_check") == before + 1
+    assert tracing.recent_traces() == recent  # only interactions are kept
+
+
+def test_summary_lists_stages_in_pipeline_order() -> None:
+    trace = tracing.Trace("click", 1)
+    trace.add("playwright", 0.25)
+    trace.add("queue", 0.5)
+    trace.add("queue", 0.25)
+
+    assert trace.summary().endswith("– queue 750ms, playwright 250ms")
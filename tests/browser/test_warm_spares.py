@@ -0,0 +1,74 @@
+"""Standby engines are handed to new channels and refilled in the background."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import cast
+
+import pytest
+from playwright.async_api import Browser
+
+from bot.browser.runtime import BrowserRuntime
+from tests._mocks.mocks import FakePlaywright
+
+
+@pytest.fixture(autouse=True)
+def _one_spare(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("bot.core.settings.settings.browser.warm_spares", 1)
+
+
+async def _settle() -> None:
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio()
+async def test_new_channel_takes_prestarted_engine(fake_pw: FakePlaywright) -> None:
+    rt = BrowserRuntime()
+    rt.warm_up()
+    await _settle()
+    assert fake_pw.launches == 1  # spare launched at boot
+
+    fake_pw.launch_delay = 10.0  # a cold launch now would blow the test timeout
+    fut = await asyncio.wait_for(rt.enqueue(1, "health_check"), timeout=0.5)
+    assert await fut is True
+    assert rt._ch[1].engine is not None
+    assert rt._ch[1].engine._browser is cast(Browser, fake_pw.browsers[0])
+    await rt.shutdown()
+
+
+@pytest.mark.asyncio()
+async def test_refill_respects_memory_ceiling(
+    monkeypatch: pytest.MonkeyPatch, fake_pw: FakePlaywright
+) -> None:
+    monkeypatch.setattr("bot.core.settings.settings.browser.warm_max_rss_mb", 100)
+    monkeypatch.setattr("bot.core.metrics.get_children_rss", lambda: 200 * 1024 * 1024)
+    rt = BrowserRuntime()
+    rt.warm_up()
+    await _settle()
+
+    assert fake_pw.launches == 0
+    await rt.shutdown()
+
+
+@pytest.mark.asyncio()
+async def test_empty_pool_refills_once_memory_is_freed(
+    monkeypatch: pytest.MonkeyPatch, fake_pw: FakePlaywright
+) -> None:
+    rss = [200 * 1024 * 1024]
+    monkeypatch.setattr("bot.core.settings.settings.browser.warm_max_rss_mb", 100)
+    monkeypatch.setattr("bot.core.metrics.get_children_rss", lambda: rss[0])
+    rt = BrowserRuntime()
+    rt.warm_up()
+    await _settle()
+    assert fake_pw.launches == 0  # ceiling hit at boot
+
+    rss[0] = 0
+    await (await rt.enqueue(1, "health_check"))  # cold start, but kicks the refill
+    await _settle()
+    assert fake_pw.launches == 2
+
+    fake_pw.launch_delay = 10.0
+    fut = await asyncio.wait_for(rt.enqueue(2, "health_check"), timeout=0.5)
+    assert await fut is True
+    await rt.shutdown()
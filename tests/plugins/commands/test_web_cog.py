@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Generator
 from typing import Any, cast
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 import discord
 import pytest
@@ -13,6 +15,13 @@ from bot.core.containers import Container
 pytestmark = pytest.mark.asyncio
 
 
+@pytest.fixture(autouse=True)
+def _stop_patches() -> Generator[None, None, None]:
+    """Undo the module-level ``BrowserRuntime.enqueue`` patches after each test."""
+    yield
+    patch.stopall()
+
+
 @pytest.fixture
 def mock_bot() -> MagicMock:
     """Fixture to create a mock Bot instance."""
@@ -50,7 +59,9 @@ async def test_web_cog_start_command_success(
 
     # Assert
     mock_interaction.response.defer.assert_awaited_once_with(thinking=True)
-    mock_enqueue.assert_awaited_once_with(mock_interaction.channel_id, "goto", test_url)
+    mock_enqueue.assert_awaited_once_with(
+        mock_interaction.channel_id, "goto", test_url, deadline=ANY
+    )
     mock_interaction.followup.send.assert_awaited_once_with(
         f"🟢 Started browser and navigated to **{test_url}**"
     )
@@ -83,4 +94,40 @@ async def test_web_cog_start_command_invalid_url(
     mock_interaction.followup.send.assert_not_called()
 
 
-# TODO: Add more tests for other existing Web commands (open, screenshot, etc.)
+async def test_web_cog_screenshot_uploads_from_memory(
+    mock_bot: MagicMock, mock_interaction: MagicMock
+) -> None:
+    """The /web screenshot command uploads the returned bytes without touching disk."""
+    done: asyncio.Future[bytes] = asyncio.get_running_loop().create_future()
+    done.set_result(b"\x89PNG-bytes")
+    enqueue_patch = patch("bot.plugins.commands.web.BrowserRuntime.enqueue", new_callable=AsyncMock)
+    mock_enqueue = enqueue_patch.start()
+    mock_enqueue.return_value = done
+    mock_interaction.guild = None
+    mock_interaction.response.is_done = MagicMock(return_value=True)
+
+    from bot.plugins.commands.web import Web as WebCog
+
+    cog = WebCog(mock_bot)
+    await cast(Any, cog.screenshot.callback)(cog, mock_interaction, None, None, "0,0,80,60")
+    for _ in range(5):  # let the background upload task run
+        await asyncio.sleep(0)
+
+    mock_enqueue.assert_awaited_once_with(
+        mock_interaction.channel_id,
+        "screenshot",
+        type="png",
+        quality=None,
+        clip={"x": 0.0, "y": 0.0, "width": 80.0, "height": 60.0},
+        full_page=False,
+        max_bytes=10 * 1024 * 1024,
+        deadline=ANY,
+    )
+    sent = mock_interaction.followup.send.await_args
+    assert sent is not None
+    upload = sent.kwargs["file"]
+    assert upload.filename == "screenshot.png"
+    assert upload.fp.read() == b"\x89PNG-bytes"
+
+
+# TODO: Add more tests for other existing Web commands (open, click, etc.)
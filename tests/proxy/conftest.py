@@ -0,0 +1,22 @@
+"""Shared helpers for the proxy tests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+
+import pytest
+
+from tests._mocks.mocks import Until
+
+
+async def _until(predicate: Callable[[], bool], timeout: float = 2.0) -> None:
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.005)
+
+
+@pytest.fixture
+def until() -> Until:
+    """``await until(predicate)`` polls the loop until *predicate* holds or times out."""
+    return _until
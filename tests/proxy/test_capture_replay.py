@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from bot.netproxy.capture import CaptureAddon, CaptureReader, CaptureWriter, main, replay
+from bot.netproxy.frames import RX, TX, FrameRing
+
+
+def _flow(from_client: bool, content: bytes, ts: float) -> SimpleNamespace:
+    msg = SimpleNamespace(from_client=from_client, content=content, timestamp=ts)
+    return SimpleNamespace(websocket=SimpleNamespace(messages=[msg]))
+
+
+def _write(path: Path, count: int, *, gap: float = 0.1, index_every: int = 3) -> None:
+    writer = CaptureWriter(path, index_every=index_every)
+    for i in range(count):
+        writer.write(RX if i % 2 else TX, bytes([i]) * (i + 1), 1000.0 + i * gap)
+    writer.close()
+
+
+@pytest.mark.asyncio
+async def test_addon_records_frames_that_read_back_with_index(tmp_path: Path) -> None:
+    path = tmp_path / "cap" / "session.fcap"
+    addon = CaptureAddon(path, index_every=3)
+    for i in range(7):
+        await addon.websocket_message(_flow(i % 2 == 0, b"x" * i, 50.0 + i))  # type: ignore[arg-type]
+    addon.done()
+
+    with CaptureReader(path) as reader:
+        frames = [(d, ts, bytes(p)) for d, ts, p in reader.frames()]
+        assert frames == [(TX if i % 2 == 0 else RX, 50.0 + i, b"x" * i) for i in range(7)]
+        assert [ts for _off, ts in reader.index()] == [50.0, 53.0, 56.0]
+        assert [ts for _d, ts, _p in reader.frames(start_ts=54.0)] == [54.0, 55.0, 56.0]
+
+
+def test_reader_stops_at_torn_tail_and_rejects_foreign_files(tmp_path: Path) -> None:
+    path = tmp_path / "torn.fcap"
+    _write(path, 4)
+    with path.open("ab") as fh:
+        fh.write(b"\x00\x01\x00\x00\x10\x00")  # header of a record that never finished
+
+    with CaptureReader(path) as reader:
+        assert sum(1 for _ in reader.frames()) == 4
+
+    other = tmp_path / "other.bin"
+    other.write_bytes(b"not a capture file at all")
+    with pytest.raises(ValueError):
+        CaptureReader(other)
+    with pytest.raises(ValueError):
+        CaptureWriter(other)  # never appends to a foreign file
+
+
+def test_seek_follows_the_index_chain_without_scanning(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "chain.fcap"
+    _write(path, 7)  # blocks at ts 1000.0, 1000.3, 1000.6
+    writer = CaptureWriter(path, index_every=3)  # reopened: continues the chain
+    writer.write(RX, b"late", 1001.0)
+    writer.close()
+
+    with CaptureReader(path) as reader:
+        scanned = reader.index()
+        assert [ts for _off, ts in scanned] == [1000.0, 1000.3, 1000.6, 1001.0]
+
+        def no_scan(_pos: int) -> Any:
+            raise AssertionError("read every record header")
+
+        monkeypatch.setattr(reader, "_records", no_scan)
+        assert reader.index() == scanned
+        assert reader._seek(1000.45) == reader._seek(1000.3) > reader._seek(1000.1)
+        monkeypatch.undo()
+        assert [round(ts, 1) for _d, ts, _p in reader.frames(start_ts=1000.45)] == [
+            1000.5,
+            1000.6,
+            1001.0,
+        ]
+
+    # A writer that died leaves no footer: readers fall back to scanning.
+    path.write_bytes(path.read_bytes()[: -(14 + 8)])  # record header + u64
+    with CaptureReader(path) as reader:
+        assert reader.last_index() is None
+        assert reader.index() == scanned
+        assert sum(1 for _ in reader.frames(start_ts=1000.45)) == 3
+
+
+def test_reopening_a_crashed_capture_truncates_the_torn_record(tmp_path: Path) -> None:
+    path = tmp_path / "crashed.fcap"
+    _write(path, 3)  # one index block, then the footer
+    with path.open("ab") as fh:
+        fh.write(b"\x00\x01\x00\x00\x01\x00")  # torn header claiming a 256-byte frame
+
+    writer = CaptureWriter(path, index_every=3)
+    for i in range(10):
+        writer.write(RX, b"new", 2000.0 + i)
+    writer.close()
+
+    with CaptureReader(path) as reader:
+        frames = [(ts, bytes(p)) for _d, ts, p in reader.frames()]
+        assert len(frames) == 13 and frames[3:] == [(2000.0 + i, b"new") for i in range(10)]
+        # The chain runs through the old block too.
+        assert [ts for _off, ts in reader.index()] == [1000.0, 2000.0, 2003.0, 2006.0, 2009.0]
+        assert [ts for _d, ts, _p in reader.frames(start_ts=1000.15)][:2] == [1000.2, 2000.0]
+
+
+def test_replay_cli_waits_for_the_engine_to_finish(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    path = tmp_path / "session.fcap"
+    _write(path, 50, gap=0.0)
+
+    main(["replay", str(path), "--speed", "0", "--ring", "8"])
+
+    report = json.loads(capsys.readouterr().out)
+    assert (report["frames"], report["dropped"]) == (50, 0)
+
+
+def test_info_lists_opcodes_per_direction(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    path = tmp_path / "session.fcap"
+    _write(path, 5)
+
+    main(["info", str(path)])
+
+    report = json.loads(capsys.readouterr().out)
+    assert report["frames"] == 5
+    assert report["opcodes"] == {
+        "TX": {"0x00": 1, "0x02": 1, "0x04": 1},
+        "RX": {"0x01": 1, "0x03": 1},
+    }
+
+
+@pytest.mark.asyncio
+async def test_replay_paces_and_applies_backpressure(tmp_path: Path) -> None:
+    path = tmp_path / "paced.fcap"
+    _write(path, 5, gap=0.1)
+
+    ring = FrameRing(8)
+    stats = await replay(path, ring, speed=10.0)  # 0.4s recorded → ~0.04s
+    assert stats.frames == 5 and stats.dropped == 0
+    assert stats.elapsed_s >= 0.035
+    assert [bytes(p) for _d, _ts, p in await ring.get_batch(8)][-1] == b"\x04" * 5
+
+    small = FrameRing(2)
+    dropped = await replay(path, small, speed=0, drop_when_full=True)
+    assert (dropped.frames, dropped.dropped) == (2, 3)
+
+    drained: list[bytes] = []
+
+    async def consume() -> None:
+        while len(drained) < 5:
+            drained.extend(bytes(p) for _d, _ts, p in await small.get_batch(2))
+
+    small = FrameRing(2)
+    consumer = asyncio.create_task(consume())
+    waited = await replay(path, small, speed=0)
+    await consumer
+    assert (waited.frames, waited.dropped) == (5, 0)
+    assert drained == [bytes([i]) * (i + 1) for i in range(5)]
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+
+import pytest
+
+from bot.core.containers import Container
+from bot.core.settings import settings
+from bot.core.telemetry import REGISTRY
+from bot.netproxy.fanout import FanOut
+from bot.netproxy.frames import RX, TX, FrameRing, Outbound
+from bot.netproxy.service import ProxyService, load_engines
+from tests._mocks.mocks import DummyDump, Until
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_drops_without_stalling_the_others() -> None:
+    source = FrameRing(8)
+    fanout = FanOut(source, sample_interval_s=60)
+    fast = fanout.subscribe("fast", maxsize=64)
+    slow = fanout.subscribe("slow", maxsize=2, policy="drop_oldest")
+    with pytest.raises(ValueError):
+        fanout.subscribe("stuck", policy="flow_control")
+    await fanout.start()
+
+    received: list[bytes] = []
+    for i in range(20):
+        await source.put(RX if i % 2 else TX, bytes([i]))
+        received.extend(bytes(p) for _d, _ts, p in await fast.get_batch(64))
+
+    assert received == [bytes([i]) for i in range(20)]
+    assert [bytes(slow.get_nowait()[2]) for _ in range(2)] == [b"\x12", b"\x13"]
+
+    before = REGISTRY.get_sample_value("proxy_subscriber_dropped_total", {"subscriber": "slow"})
+    fanout.sample()
+    lag = {sub.name: sub for sub in fanout.lag()}
+    assert lag["slow"].dropped == 18 and lag["fast"].dropped == 0
+    after = REGISTRY.get_sample_value("proxy_subscriber_dropped_total", {"subscriber": "slow"})
+    assert after == (before or 0) + 18
+    await fanout.stop()
+
+
+@pytest.mark.asyncio
+async def test_lag_reports_backlog_age(until: Until) -> None:
+    source = FrameRing(4)
+    fanout = FanOut(source)
+    ring = fanout.subscribe("idle", maxsize=4)
+    await fanout.start()
+    source.put_nowait(RX, b"a", ts=0.0)  # ancient monotonic timestamp
+    await until(lambda: ring.qsize() == 1)
+
+    (lag,) = fanout.lag()
+    assert (lag.queued, lag.maxsize) == (1, 4) and lag.lag_s > 0
+    fanout.sample()
+    labels = {"subscriber": "idle"}
+    assert REGISTRY.get_sample_value("proxy_subscriber_lag_frames", labels) == 1
+    await fanout.stop()
+
+
+class _Recorder:
+    def __init__(self, ring: FrameRing, _out: asyncio.Queue[Outbound]) -> None:
+        self.ring = ring
+        self.started = self.stopped = False
+
+    async def start(self) -> None:
+        self.started = True
+
+    async def stop(self, *, graceful: bool = True) -> None:
+        self.stopped = True
+
+
+@pytest.mark.asyncio
+async def test_service_fans_out_to_every_engine(
+    monkeypatch: pytest.MonkeyPatch, until: Until
+) -> None:
+    monkeypatch.setattr("bot.netproxy.service.DumpMaster", DummyDump)
+    made: dict[str, _Recorder] = {}
+
+    def factory(name: str) -> Callable[[FrameRing, asyncio.Queue[Outbound]], _Recorder]:
+        def build(ring: FrameRing, out: asyncio.Queue[Outbound]) -> _Recorder:
+            made[name] = _Recorder(ring, out)
+            return made[name]
+
+        return build
+
+    svc = ProxyService(engine_factory=factory("engine"), engines={"logger": factory("logger")})
+    assert made["engine"].ring is not svc.in_q and made["logger"].ring is not made["engine"].ring
+
+    await svc.start()
+    svc.in_q.put_nowait(RX, b"frame")
+    await until(lambda: all(r.ring.qsize() == 1 for r in made.values()))
+    assert [s.name for s in svc.subscribers()] == ["engine", "logger"]
+    await svc.stop()
+    assert all(r.started and r.stopped for r in made.values())
+
+    single = ProxyService(engine_factory=factory("solo"))
+    assert made["solo"].ring is single.in_q and single.subscribers() == []
+
+
+def test_container_wires_engines_from_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("DISCORD_TOKEN", "t")
+    monkeypatch.setenv("PROXY_ENGINES", '{"logger": "bot.infra.tankpit:engine_factory"}')
+    monkeypatch.setattr(settings, "proxy_subscriber_policies", {"logger": "coalesce"})
+
+    svc = Container().proxy_service()
+
+    assert [sub.name for sub in svc.subscribers()] == ["engine", "logger"]
+    logger = svc._route("logger")
+    assert logger is not None and logger.policy == "coalesce"
+    with pytest.raises(ValueError):
+        load_engines({"engine": "bot.infra.tankpit:engine_factory"})  # name is taken
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from bot.netproxy.flows import FlowIndex
+from bot.netproxy.frames import FrameRing, Outbound
+from bot.netproxy.ws_addon import GenericWSAddon
+
+
+def _flow(flow_id: str, host: str) -> Any:
+    sent: list[bytes] = []
+    ws = SimpleNamespace(
+        messages=[], closed=False, sent=sent, send_message=lambda m: sent.append(m.content)
+    )
+    return SimpleNamespace(id=flow_id, request=SimpleNamespace(pretty_host=host), websocket=ws)
+
+
+def test_index_tracks_open_flows_by_id_and_host() -> None:
+    index = FlowIndex()
+    a, b, c = _flow("a", "game.example"), _flow("b", "game.example"), _flow("c", "chat.example")
+
+    ids = [index.open(f) for f in (a, b, c)]
+    assert ids == [1, 2, 3] and index.open(a) == 1  # idempotent
+    assert index.for_host("game.example") == [1, 2]
+    assert [index.get(i) for i in ids] == [a, b, c] and index.conn_id(b) == 2
+
+    assert index.close(a) == 1 and index.close(a) is None
+    assert index.close(c) == 3
+    assert index.for_host("game.example") == [2] and index.hosts() == ["game.example"]
+    assert len(index) == 1 and [conn for conn, _f in index] == [2]
+
+
+@pytest.mark.asyncio
+async def test_outbound_frames_go_to_their_target_connection() -> None:
+    out_q: asyncio.Queue[Outbound] = asyncio.Queue()
+    addon = GenericWSAddon(FrameRing(4), out_q, flows=FlowIndex())
+    a, b, gone = _flow("a", "game.example"), _flow("b", "game.example"), _flow("g", "x")
+    for f in (a, b, gone):
+        addon.websocket_start(f)
+    addon.websocket_end(gone)
+
+    runner = asyncio.create_task(addon.running())
+    for item in ((2, b"to-b"), (None, b"all"), (3, b"to-closed")):
+        out_q.put_nowait(item)
+    await asyncio.wait_for(out_q.join(), 1)
+    runner.cancel()
+
+    assert a.websocket.sent == [b"all"]
+    assert b.websocket.sent == [b"to-b", b"all"]
+    assert gone.websocket.sent == []
+    addon.done()
+    assert len(addon.flows) == 0
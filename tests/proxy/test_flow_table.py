@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from bot.core.telemetry import REGISTRY
+from bot.netproxy.flows import FlowIndex, FlowTable
+from bot.netproxy.frames import RX, TX, FrameRing
+from bot.netproxy.ws_addon import GenericWSAddon
+
+
+def test_stats_count_sizes_and_jitter() -> None:
+    table = FlowTable()
+    steady = table.open(1, "game.example")
+    bursty = table.open(2, "chat.example")
+    for i in range(20):
+        table.frame(1, RX, 40, ts=i * 0.05)
+        table.frame(2, TX, 1500 if i % 2 else 3, ts=i * 0.05 + (0.04 if i % 2 else 0))
+    table.frame(99, RX, 10)  # unknown connection is ignored
+
+    assert steady.frames == [0, 20] and steady.bytes == [0, 800]
+    assert steady.jitter == pytest.approx(0.0, abs=1e-9)
+    assert bursty.jitter > 0.01
+    assert steady.size_quantile(0.5) == 63  # 40 B lands in the 32–63 B bucket
+    assert (bursty.size_quantile(0.5), bursty.size_quantile(0.99)) == (3, 2047)
+    assert [s.conn_id for s in table.top(1)] == [2]
+    assert "#2 chat.example" in bursty.summary() and "TX 20 / 14.7KB" in bursty.summary()
+
+
+def test_sample_exports_open_connections_and_forgets_closed_ones() -> None:
+    table = FlowTable()
+    table.open(7, "game.example")
+    table.frame(7, TX, 100)
+    labels = {"conn": "7", "host": "game.example", "direction": "TX"}
+
+    table.sample()
+    assert REGISTRY.get_sample_value("proxy_flow_bytes", labels) == 100
+    table.close(7)
+    table.sample()
+    assert REGISTRY.get_sample_value("proxy_flow_bytes", labels) is None
+    assert len(table) == 0
+
+
+@pytest.mark.asyncio
+async def test_addon_hooks_maintain_the_table() -> None:
+    index = FlowIndex()
+    addon = GenericWSAddon(FrameRing(8), asyncio.Queue(), flows=index)
+    flow = SimpleNamespace(
+        id="f", request=SimpleNamespace(pretty_host="game.example"), websocket=None
+    )
+    flow.websocket = SimpleNamespace(messages=[])
+
+    addon.websocket_start(flow)  # type: ignore[arg-type]
+    for from_client, content in ((True, b"ab"), (False, b"cdef"), (False, b"g")):
+        flow.websocket.messages.append(SimpleNamespace(from_client=from_client, content=content))
+        await addon.websocket_message(flow)  # type: ignore[arg-type]
+
+    stats = index.table.get(1)
+    assert stats is not None and stats.frames == [1, 2] and stats.bytes == [2, 5]
+    addon.websocket_end(flow)  # type: ignore[arg-type]
+    assert index.table.get(1) is None
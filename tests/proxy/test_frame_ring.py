@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from bot.core.telemetry import REGISTRY
+from bot.infra.tankpit.engine import TankPitEngine
+from bot.netproxy.frames import RX, TX, FrameRing
+from bot.utils.queue_helpers import sample_gauges
+
+
+def _frames_total(direction: str) -> float:
+    return REGISTRY.get_sample_value("tankpit_frame_total", {"direction": direction}) or 0
+
+
+@pytest.mark.asyncio
+async def test_ring_is_fifo_across_wraparound_and_zero_copy() -> None:
+    ring = FrameRing(3)
+    payloads = [b"a", b"bb", b"ccc", b"dddd"]
+
+    ring.put_nowait(TX, payloads[0], ts=1.0)
+    ring.put_nowait(RX, payloads[1], ts=2.0)
+    assert ring.get_nowait()[0] == TX
+    ring.put_nowait(RX, payloads[2], ts=3.0)
+    ring.put_nowait(TX, payloads[3], ts=4.0)  # wraps into slot 0
+    assert ring.full() and ring.qsize() == ring.maxsize == 3
+    with pytest.raises(asyncio.QueueFull):
+        ring.put_nowait(RX, b"overflow")
+
+    batch = await ring.get_batch(10)
+    assert [(d, ts, bytes(p)) for d, ts, p in batch] == [
+        (RX, 2.0, b"bb"),
+        (RX, 3.0, b"ccc"),
+        (TX, 4.0, b"dddd"),
+    ]
+    assert batch[2][2].obj is payloads[3]  # a view, not a copy
+    assert ring.empty()
+    with pytest.raises(asyncio.QueueEmpty):
+        ring.get_nowait()
+
+
+@pytest.mark.asyncio
+async def test_get_batch_waits_for_the_first_frame() -> None:
+    ring = FrameRing(8)
+    waiter = asyncio.create_task(ring.get_batch(8))
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    ring.put_nowait(RX, b"x")
+    ring.put_nowait(RX, b"y")
+    assert [bytes(p) for _d, _ts, p in await waiter] == [b"x", b"y"]
+
+
+@pytest.mark.asyncio
+async def test_engine_drains_ring_and_gauges_are_sampled() -> None:
+    ring = FrameRing(16)
+    engine = TankPitEngine(ring, asyncio.Queue())
+    before = _frames_total("RX"), _frames_total("TX")
+    sampler = asyncio.create_task(sample_gauges({"test_ring": ring}, 0.01))
+
+    for i in range(5):
+        ring.put_nowait(RX if i % 2 else TX, bytes([i]))
+    await asyncio.sleep(0.02)
+    assert REGISTRY.get_sample_value("bot_queue_fill", {"queue": "test_ring"}) == 5
+
+    await engine.start()
+    for _ in range(50):
+        if ring.empty():
+            break
+        await asyncio.sleep(0)
+    await engine.stop()
+    sampler.cancel()
+
+    assert ring.empty()
+    assert (_frames_total("RX"), _frames_total("TX")) == (before[0] + 2, before[1] + 3)
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from bot.core import alerts
+from bot.core.telemetry import REGISTRY
+from bot.netproxy.frames import RX, TX, FrameRing
+from bot.netproxy.overflow import OverflowPolicy
+from bot.netproxy.ws_addon import GenericWSAddon
+
+
+def _dropped(policy: str, direction: str) -> float:
+    labels = {"policy": policy, "direction": direction}
+    return REGISTRY.get_sample_value("proxy_frames_dropped_total", labels) or 0
+
+
+def _drain(ring: FrameRing) -> list[bytes]:
+    return [bytes(ring.get_nowait()[2]) for _ in range(ring.qsize())]
+
+
+@pytest.mark.asyncio
+async def test_drop_newest_and_drop_oldest() -> None:
+    newest = OverflowPolicy(FrameRing(2), "drop_newest")
+    before = _dropped("drop_newest", "RX")
+    assert [await newest.offer(RX, p) for p in (b"a", b"b", b"c")] == [True, True, False]
+    assert _drain(newest.ring) == [b"a", b"b"]
+    assert _dropped("drop_newest", "RX") == before + 1
+
+    oldest = OverflowPolicy(FrameRing(2), "drop_oldest")
+    before = _dropped("drop_oldest", "TX")
+    for direction, payload in ((TX, b"a"), (RX, b"b"), (RX, b"c")):
+        assert await oldest.offer(direction, payload)
+    assert _drain(oldest.ring) == [b"b", b"c"]
+    assert _dropped("drop_oldest", "TX") == before + 1  # the evicted frame's direction
+    newest.close()
+    oldest.close()
+
+
+@pytest.mark.asyncio
+async def test_coalesce_replaces_same_type_and_falls_back_to_drop() -> None:
+    policy = OverflowPolicy(FrameRing(3), "coalesce")
+    for payload in (b"\x03old-move", b"\x06ping", b"\x03newer-move"):
+        await policy.offer(RX, payload)
+
+    assert await policy.offer(RX, b"\x03latest")  # overwrites the newest 0x03 frame
+    assert not await policy.offer(RX, b"\x05tiles")  # no queued 0x05 → dropped
+    assert not await policy.offer(TX, b"\x03input")  # same opcode, other direction
+    assert _drain(policy.ring) == [b"\x03old-move", b"\x06ping", b"\x03latest"]
+    assert policy.dropped == 3
+    policy.close()
+
+
+@pytest.mark.asyncio
+async def test_flow_control_waits_for_room_then_times_out() -> None:
+    ring = FrameRing(1)
+    policy = OverflowPolicy(ring, "flow_control", wait_s=0.05)
+    await policy.offer(TX, b"first")
+
+    waiting = asyncio.create_task(policy.offer(TX, b"second"))
+    await asyncio.sleep(0)
+    assert not waiting.done()  # the client is paused, not dropped
+    ring.get_nowait()
+    assert await waiting and _drain(ring) == [b"second"]
+
+    await policy.offer(TX, b"third")
+    assert not await policy.offer(TX, b"late")  # consumer never came back
+    assert policy.dropped == 1
+    policy.close()
+
+
+@pytest.mark.asyncio
+async def test_overflow_alerts_are_summarised(monkeypatch: pytest.MonkeyPatch) -> None:
+    sent: list[str] = []
+    monkeypatch.setattr(alerts, "alert", sent.append)
+    policy = OverflowPolicy(FrameRing(1), "drop_newest", alert_interval_s=0.02)
+
+    for _ in range(50):
+        await policy.offer(RX, b"x")
+    await policy.offer(TX, b"y")
+    assert sent == []  # nothing per frame
+    await asyncio.sleep(0.05)
+
+    assert len(sent) == 1
+    assert "dropped 50 frames" in sent[0] and "TX 1, RX 49" in sent[0]
+
+
+@pytest.mark.asyncio
+async def test_addon_routes_frames_through_policy() -> None:
+    ring = FrameRing(1)
+    addon = GenericWSAddon(ring, asyncio.Queue())
+    for content in (b"kept", b"lost"):
+        msg = SimpleNamespace(from_client=False, content=content)
+        flow = SimpleNamespace(id="f", websocket=SimpleNamespace(messages=[msg]))
+        await addon.websocket_message(flow)  # type: ignore[arg-type]
+    addon.done()
+
+    assert _drain(ring) == [b"kept"]
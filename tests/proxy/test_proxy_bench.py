@@ -0,0 +1,26 @@
+"""Proxy benchmark smoke test: one small stage through a real mitmproxy."""
+
+from __future__ import annotations
+
+import pytest
+
+from bot.core.settings import settings
+from bot.netproxy.bench import BenchConfig, run_bench
+
+
+@pytest.mark.asyncio
+async def test_run_bench_reports_a_stage() -> None:
+    before = settings.queues.inbound, settings.proxy_mode, settings.proxy_overflow_policy
+
+    report = await run_bench(
+        BenchConfig(clients=1, rates=[50], sizes=[64], duration=0.3, ring=64, policy="coalesce")
+    )
+
+    (stage,) = report["stages"]
+    assert stage["size"] == 64 and stage["sent"] > 0
+    assert stage["sustained_fps"] > 0 and stage["drop_rate"] == 0.0
+    assert {"client_to_proxy", "queue", "round_trip"} <= set(stage["latency_ms"])
+    assert report["config"]["mode"] == "inline"
+    assert report["config"]["overflow_policy"] == "coalesce"
+    # The run's overrides are gone again.
+    assert (settings.queues.inbound, settings.proxy_mode, settings.proxy_overflow_policy) == before
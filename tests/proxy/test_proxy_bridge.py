@@ -0,0 +1,91 @@
+"""``proxy_mode = "thread"``: mitmproxy on its own loop, frames over the bridge."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Callable
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from bot.core.settings import settings
+from bot.netproxy.bridge import BridgeAddon
+from bot.netproxy.frames import RX, TX
+from bot.netproxy.service import ProxyService
+from tests._mocks.mocks import Until
+
+
+class _LoopMaster:
+    """DumpMaster stand-in that runs until shutdown(), like the real one."""
+
+    instances: list[_LoopMaster] = []
+
+    def __init__(self, *_a: object, **_k: object) -> None:
+        self.loop = asyncio.get_running_loop()
+        self.thread = threading.current_thread()
+        self.added: list[Any] = []
+        self.addons = SimpleNamespace(add=self.added.append)
+        self._exit = asyncio.Event()
+        _LoopMaster.instances.append(self)
+
+    async def run(self) -> None:
+        await self._exit.wait()
+
+    def shutdown(self) -> None:
+        self.loop.call_soon_threadsafe(self._exit.set)
+
+    def call(self, fn: Callable[..., Any], *args: Any) -> None:
+        self.loop.call_soon_threadsafe(fn, *args)
+
+
+class _IdleEngine:
+    async def start(self) -> None: ...
+
+    async def stop(self, *, graceful: bool = True) -> None: ...
+
+
+def _flow(flow_id: str, host: str) -> Any:
+    sent: list[bytes] = []
+    ws = SimpleNamespace(
+        messages=[], closed=False, sent=sent, send_message=lambda m: sent.append(m.content)
+    )
+    return SimpleNamespace(id=flow_id, request=SimpleNamespace(pretty_host=host), websocket=ws)
+
+
+@pytest.mark.asyncio
+async def test_thread_mode_bridges_frames_both_ways(
+    monkeypatch: pytest.MonkeyPatch, until: Until
+) -> None:
+    monkeypatch.setattr("bot.netproxy.service.DumpMaster", _LoopMaster)
+    monkeypatch.setattr(settings, "proxy_mode", "thread")
+    _LoopMaster.instances.clear()
+    svc = ProxyService(port=9000, engine_factory=lambda _q_in, _q_out: _IdleEngine())
+
+    await svc.start()
+    assert svc.is_running()
+    (master,) = _LoopMaster.instances
+    assert master.thread is not threading.current_thread()
+    await until(lambda: any(isinstance(a, BridgeAddon) for a in master.added))
+    (addon,) = [a for a in master.added if isinstance(a, BridgeAddon)]
+
+    flow = _flow("f1", "game.example")
+    master.call(addon.websocket_start, flow)
+    for from_client, content in ((True, b"hello"), (False, b"world")):
+        flow.websocket.messages.append(SimpleNamespace(from_client=from_client, content=content))
+        asyncio.run_coroutine_threadsafe(addon.websocket_message(flow), master.loop).result(2)
+
+    await until(lambda: svc.in_q.qsize() == 2)
+    frames = [(d, bytes(p)) for d, _ts, p in await svc.in_q.get_batch(2)]
+    assert frames == [(TX, b"hello"), (RX, b"world")]
+    assert "1 open WebSocket(s)" in svc.describe()
+
+    svc.out_q.put_nowait((1, b"crafted"))
+    await until(lambda: flow.websocket.sent == [b"crafted"])
+
+    master.call(addon.websocket_end, flow)
+    await until(lambda: "0 open WebSocket(s)" in svc.describe())
+
+    await svc.stop()
+    assert not svc.is_running() and not master.thread.is_alive()
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from bot.core.settings import ProxyRule, settings
+from bot.core.telemetry import REGISTRY
+from bot.netproxy.frames import RX, TX, FrameRing, Outbound
+from bot.netproxy.rules import RuleSet
+from bot.netproxy.service import ProxyService
+from bot.netproxy.ws_addon import GenericWSAddon
+
+
+def _rules(monkeypatch: pytest.MonkeyPatch, *specs: dict[str, Any]) -> RuleSet:
+    monkeypatch.setattr(settings, "proxy_rules", [ProxyRule(**spec) for spec in specs])
+    return RuleSet()
+
+
+def test_first_matching_rule_decides(monkeypatch: pytest.MonkeyPatch) -> None:
+    rules = _rules(
+        monkeypatch,
+        {"name": "keep-login", "prefix": "0601", "action": "sample"},  # every=1 keeps all
+        {"name": "heartbeat", "opcode": 6, "direction": "RX"},
+        {"host": "*.chat.example", "action": "route", "subscriber": "logger"},
+        {"name": "tx-rest", "direction": "TX"},
+    )
+
+    assert rules.verdict(RX, b"\x06\x01user", "game.example") == ""
+    assert rules.verdict(RX, b"\x06ping", "game.example") is None
+    assert rules.verdict(TX, b"\x01move", "game.example") is None  # TX catch-all
+    assert rules.verdict(RX, b"\x02msg", "eu.chat.example") == "logger"
+    assert rules.verdict(RX, b"\x02msg", "chat.example") == ""
+    assert rules.verdict(TX, b"", "game.example") is None
+    assert rules.hits() == {"keep-login": 1, "heartbeat": 1, "rule2": 1, "tx-rest": 2}
+
+
+def test_sample_keeps_one_in_n_and_publishes_hits(monkeypatch: pytest.MonkeyPatch) -> None:
+    rules = _rules(monkeypatch, {"name": "moves", "opcode": 3, "action": "sample", "every": 4})
+    labels = {"rule": "moves", "action": "sample"}
+    before = REGISTRY.get_sample_value("proxy_rule_frames_total", labels) or 0
+
+    kept = [rules.verdict(RX, b"\x03xy", "game.example") for _ in range(10)]
+    assert kept.count("") == 3 and kept[0] == ""
+    rules.sample()
+    rules.sample()  # nothing new
+    assert REGISTRY.get_sample_value("proxy_rule_frames_total", labels) == before + 10
+
+
+def test_reassigning_settings_recompiles(monkeypatch: pytest.MonkeyPatch) -> None:
+    rules = _rules(monkeypatch)
+    assert len(rules) == 0 and rules.verdict(RX, b"\x06", "h") == ""
+
+    monkeypatch.setattr(settings, "proxy_rules", [{"opcode": 6}])  # plain dicts are validated
+    assert rules.verdict(RX, b"\x06", "h") is None and len(rules) == 1
+
+    monkeypatch.setattr(settings, "proxy_rules", [{"action": "route"}])  # no subscriber
+    assert rules.verdict(RX, b"\x06", "h") is None  # previous rules stay in force
+
+
+def test_reload_from_env_rereads_proxy_rules(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.chdir(tmp_path)  # no stray .env
+    rules = _rules(monkeypatch)
+    monkeypatch.setenv("PROXY_RULES", json.dumps([{"opcode": 6}, {"prefix": "0301"}]))
+
+    assert rules.reload_from_env() == 2
+    assert rules.verdict(RX, b"\x06", "h") is None
+    assert [r.opcode for r in settings.proxy_rules] == [6, None]
+
+    monkeypatch.setenv("PROXY_RULES", json.dumps([{"action": "route"}]))  # no subscriber
+    with pytest.raises(ValueError):
+        rules.reload_from_env()
+    assert len(rules) == 2 and len(settings.proxy_rules) == 2  # current rules kept
+
+    monkeypatch.delenv("PROXY_RULES")
+    (tmp_path / ".env").write_text('PROXY_RULES=[{"opcode": 9}]\n')
+    assert rules.reload_from_env() == 1
+
+
+class _Idle:
+    def __init__(self, ring: FrameRing, _out: asyncio.Queue[Outbound]) -> None:
+        self.ring = ring
+
+    async def start(self) -> None: ...
+
+    async def stop(self, *, graceful: bool = True) -> None: ...
+
+
+@pytest.mark.asyncio
+async def test_addon_routes_to_a_single_subscriber(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        settings,
+        "proxy_rules",
+        [
+            ProxyRule(opcode=6, action="drop"),
+            ProxyRule(opcode=9, action="route", subscriber="logger"),
+            ProxyRule(opcode=7, action="route", subscriber="nobody"),
+        ],
+    )
+    engines: dict[str, _Idle] = {}
+
+    def build(name: str) -> Any:
+        return lambda ring, out: engines.setdefault(name, _Idle(ring, out))
+
+    svc = ProxyService(engine_factory=build("engine"), engines={"logger": build("logger")})
+    addon = GenericWSAddon(svc.in_q, svc.out_q, flows=svc.flows, rules=svc.rules)
+    ws = SimpleNamespace(messages=[])
+    flow = SimpleNamespace(
+        id="f", request=SimpleNamespace(pretty_host="game.example"), websocket=ws
+    )
+    addon.websocket_start(flow)  # type: ignore[arg-type]
+    for content in (b"\x06ping", b"\x09chat", b"\x07odd", b"\x02move"):
+        ws.messages.append(SimpleNamespace(from_client=False, content=content))
+        await addon.websocket_message(flow)  # type: ignore[arg-type]
+    addon.done()
+
+    shared = [bytes(p) for _d, _ts, p in await svc.in_q.get_batch(8)]
+    assert shared == [b"\x07odd", b"\x02move"]  # unknown subscriber → queued normally
+    assert [bytes(p) for _d, _ts, p in await engines["logger"].ring.get_batch(8)] == [b"\x09chat"]
+    assert engines["engine"].ring.empty()
+    assert svc.flow_table.top(1) == []  # done() cleared the flow index
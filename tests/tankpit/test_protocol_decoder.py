@@ -0,0 +1,115 @@
+"""TankPit decoder, game-state model and engine wiring."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from bot.core.telemetry import REGISTRY
+from bot.infra.tankpit.bench import bench_decoder
+from bot.infra.tankpit.corpus import synthetic_session
+from bot.infra.tankpit.engine import TankPitEngine
+from bot.infra.tankpit.protocol import Message, ProtocolError, encode, iter_messages
+from bot.infra.tankpit.state import GameState
+from bot.netproxy.frames import RX, TX, FrameRing
+
+
+def _replay(frames: list[tuple[int, bytes]]) -> GameState:
+    state = GameState()
+    for direction, payload in frames:
+        for spec, values, tail in iter_messages(direction, memoryview(payload)):
+            state.apply(spec, values, tail)
+    return state
+
+
+def _first(frame: bytes) -> Message:
+    return next(iter_messages(RX, memoryview(frame)))
+
+
+def test_synthetic_session_builds_consistent_state() -> None:
+    state = _replay(synthetic_session(entities=16, ticks=120, map_size=32))
+
+    assert (state.player_id, state.map_w, state.map_h) == (1, 32, 32)
+    assert len(state.entities) == 16  # churn removes and spawns one at a time
+    assert state.unknown_moves == 0
+    assert any(state.tiles)
+    assert state.input_seq == 119
+    assert state.last_ping == 100
+
+
+def test_messages_decode_from_one_frame_without_copying() -> None:
+    frame = encode(RX, "spawn", 7, 1, 0, -5, 12, 90) + encode(RX, "tiles", 1, 0, tail=b"\x02\x03")
+    view = memoryview(frame)
+
+    (spawn, values, _), (tiles, _pos, tail) = list(iter_messages(RX, view))
+    assert spawn.name == "spawn" and values == (7, 1, 0, -5, 12, 90)
+    assert tiles.name == "tiles" and tail is not None
+    assert tail.obj is frame and bytes(tail) == b"\x02\x03"
+
+    state = GameState()
+    state.apply(*_first(encode(RX, "welcome", 3, 4, 2)))
+    state.apply(spawn, values, None)
+    state.apply(tiles, _pos, tail)
+    assert state.entities.position(7) == (-5, 12)
+    assert (state.tile(1, 0), state.tile(2, 0)) == (2, 3)
+
+    state.apply(*_first(encode(RX, "remove", 7)))
+    assert 7 not in state.entities
+
+
+@pytest.mark.parametrize(
+    ("direction", "frame"),
+    [
+        (RX, b"\x7f"),  # unknown opcode
+        (TX, encode(RX, "ping", 1)),  # RX opcode on the TX side
+        (RX, encode(RX, "move", 1, 2, 3, 4)[:-1]),  # truncated body
+        (TX, encode(TX, "chat", tail=b"hello")[:-2]),  # truncated tail
+    ],
+)
+def test_malformed_frames_raise(direction: int, frame: bytes) -> None:
+    with pytest.raises(ProtocolError):
+        list(iter_messages(direction, memoryview(frame)))
+
+
+@pytest.mark.asyncio
+async def test_engine_applies_frames_and_counts_decode_errors() -> None:
+    ring = FrameRing(64)
+    engine = TankPitEngine(ring, asyncio.Queue(), decode=True)
+    labels = {"direction": "RX"}
+    errors = REGISTRY.get_sample_value("tankpit_decode_errors_total", labels) or 0
+
+    ring.put_nowait(RX, encode(RX, "welcome", 9, 8, 8))
+    ring.put_nowait(RX, encode(RX, "spawn", 1, 1, 0, 10, 20, 0) + b"\xff")
+    ring.put_nowait(TX, encode(TX, "input", 42, 1, 0))
+    await engine.start()
+    await asyncio.wait_for(engine.wait_handled(3), timeout=1)
+    await engine.stop()
+
+    assert engine.state.player_id == 9
+    assert engine.state.entities.position(1) == (10, 20)  # applied before the bad byte
+    assert engine.state.input_seq == 42
+    assert REGISTRY.get_sample_value("tankpit_decode_errors_total", labels) == errors + 1
+
+
+@pytest.mark.asyncio
+async def test_live_engine_does_not_decode_with_the_placeholder_table() -> None:
+    ring = FrameRing(8)
+    engine = TankPitEngine(ring, asyncio.Queue())  # settings.tankpit_decoder is off
+    ring.put_nowait(RX, encode(RX, "welcome", 9, 8, 8))
+    await engine.start()
+    for _ in range(50):
+        if ring.empty():
+            break
+        await asyncio.sleep(0)
+    await engine.stop()
+
+    assert not engine.decode and engine.state.player_id == 0
+
+
+def test_bench_decoder_reports_throughput() -> None:
+    frames = synthetic_session(entities=4, ticks=20)
+    report = bench_decoder(frames, repeat=2)
+
+    assert report["frames"] == 2 * len(frames)
+    assert report["frames_per_s"] > 0 and report["messages"] > report["frames"]
@@ -37,6 +37,13 @@ openai_api_key = test-openai
         assert s.openai_api_key == "test-openai"
 
 
+def test_subscriber_policies_are_validated() -> None:
+    s = Settings(discord_token="t", proxy_subscriber_policies={"logger": "coalesce"})
+    assert s.proxy_subscriber_policies == {"logger": "coalesce"}
+    with pytest.raises(ValidationError):
+        Settings(discord_token="t", proxy_subscriber_policies={"logger": "flow_control"})
+
+
 def test_settings_missing_mandatory() -> None:
     # Only an empty/placeholder token should raise now
     with pytest.raises(ValidationError):